@@ -0,0 +1,317 @@
+"""
+Uji beban dashboard dengan banyak session sekaligus, headless lewat Streamlit AppTest.
+
+Tiap session simulasi menjalankan `src/streamlit_app.py` dari awal: "upload"
+workbook sintetis, menunggu parsing background selesai (rerun berkala seperti
+fragment progress), lalu mengubah widget Analytics secara acak (Y-Bar, Top N,
+X-Bar, Key, Type). Semua session berjalan sebagai thread di satu proses,
+seperti di server Streamlit, jadi cache workbook dan dataset bersama ikut teruji.
+
+Dilaporkan: latensi rerun p50/p95/p99 per aksi, throughput (rerun/detik),
+waktu sampai dashboard siap per session, jumlah error dan RSS puncak.
+Tidak butuh jaringan; workbook disimpan di --workdir dan dipakai ulang.
+
+Contoh:
+    python benchmarks/load_test.py --sessions 8 --steps 10
+    python benchmarks/load_test.py --sessions 32 --concurrency 16 --rows 50000 --upload-sets 4 --json load.json
+    python benchmarks/load_test.py --sessions 8 --chart-backend matplotlib --ingest-workers 1
+"""
+import argparse
+import io
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, HERE)
+
+from synthetic import write_workbooks
+
+APP_PATH = os.path.join(ROOT, 'src', 'streamlit_app.py')
+# Kunci session_state yang memberi tahu uploader palsu set upload mana milik session ini
+UPLOAD_STATE_KEY = '_load_test_upload_set'
+ACTIONS = ('y_bar', 'top_n', 'x_bar', 'key', 'type')
+
+_upload_sets = {}
+
+
+def _uploads(paths):
+    files = []
+    for path in paths:
+        with open(path, 'rb') as fh:
+            f = io.BytesIO(fh.read())
+        f.name = os.path.basename(path)
+        f.size = len(f.getvalue())
+        files.append(f)
+    return files
+
+
+def fake_file_uploader(label, *args, **kwargs):
+    # Pengganti st.file_uploader: AppTest belum bisa mengunggah file
+    import streamlit as st
+    return _upload_sets.get(st.session_state.get(UPLOAD_STATE_KEY))
+
+
+@contextmanager
+def shared_runtime():
+    """
+    AppTest memasang lalu melepas Runtime global di setiap run, sehingga run
+    paralel saling menimpa. Selama uji beban, Runtime.instance()/exists()
+    diarahkan ke satu runtime tiruan bersama (media file + cache di memori).
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage('/mock/media'))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    with mock.patch.object(Runtime, 'instance', classmethod(lambda cls: runtime)), \
+            mock.patch.object(Runtime, 'exists', classmethod(lambda cls: True)), \
+            mock.patch('streamlit.file_uploader', new=fake_file_uploader):
+        yield runtime
+
+
+def _widget(elements, label):
+    for element in elements:
+        if element.label == label or element.label.startswith(label):
+            return element
+    return None
+
+
+def apply_action(at, action, rng):
+    """
+    Ubah satu widget Analytics di sidebar. Return False bila widget tidak ada.
+    """
+    sidebar = at.sidebar
+    if action == 'y_bar':
+        widget = _widget(sidebar.selectbox, 'Select Y-Bar')
+        value = widget and rng.choice(widget.options)
+    elif action == 'type':
+        widget = _widget(sidebar.selectbox, 'Select Type:')
+        value = widget and rng.choice(widget.options)
+    elif action == 'top_n':
+        widget = _widget(sidebar.slider, 'Top N')
+        value = rng.randint(1, 100)
+    elif action == 'x_bar':
+        widget = _widget(sidebar.multiselect, 'Pilih X-Bar')
+        value = widget and rng.sample(widget.options, rng.randint(1, len(widget.options)))
+    else:
+        widget = _widget(sidebar.multiselect, 'Select Key:')
+        if widget:
+            keys = [o for o in widget.options if o != 'All']
+            value = ['All'] if rng.random() < 0.3 or not keys else rng.sample(keys, min(len(keys), rng.randint(1, 5)))
+    if widget is None:
+        return False
+    widget.set_value(value)
+    return True
+
+
+class LoadTest:
+    """
+    Jalankan `sessions` session AppTest dengan maksimal `concurrency` berjalan bersamaan.
+    Tiap rerun dicatat sebagai dict {session, action, seconds, error}.
+    """
+
+    def __init__(self, sessions, concurrency, steps, upload_sets, poll_s=0.5, timeout=300, seed=0):
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.steps = steps
+        self.upload_sets = upload_sets
+        self.poll_s = poll_s
+        self.timeout = timeout
+        self.seed = seed
+        self.records = []
+        self.ready = []
+        self._lock = threading.Lock()
+
+    def _rerun(self, at, session, action):
+        from utils.profiler import rss_bytes
+
+        start = time.perf_counter()
+        error = None
+        try:
+            at.run()
+            if at.exception:
+                error = str(at.exception[0].value)
+        except Exception as e:  # timeout AppTest, dsb.
+            error = f"{type(e).__name__}: {e}"
+        record = {
+            'session': session, 'action': action,
+            'seconds': time.perf_counter() - start, 'error': error, 'rss_mb': rss_bytes() / 1e6,
+        }
+        with self._lock:
+            self.records.append(record)
+        return error is None
+
+    def run_session(self, session):
+        from streamlit.testing.v1 import AppTest
+
+        rng = random.Random(self.seed + session)
+        started = time.perf_counter()
+        at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        at.session_state[UPLOAD_STATE_KEY] = session % self.upload_sets
+        self._rerun(at, session, 'upload')
+
+        # Parsing berjalan di background: rerun berkala sampai job selesai, lalu sekali lagi
+        deadline = started + self.timeout
+        while time.perf_counter() < deadline:
+            job = at.session_state['ingest_job'] if 'ingest_job' in at.session_state else None
+            done = job is None or job.done
+            if not self._rerun(at, session, 'poll') or done:
+                break
+            time.sleep(self.poll_s)
+        ready_s = time.perf_counter() - started
+        loaded = _widget(at.sidebar.selectbox, 'Select Y-Bar') is not None
+        with self._lock:
+            self.ready.append({'session': session, 'seconds': ready_s, 'loaded': loaded})
+        if not loaded:
+            return
+
+        for _ in range(self.steps):
+            action = rng.choice(ACTIONS)
+            if apply_action(at, action, rng):
+                self._rerun(at, session, action)
+
+    def run(self):
+        started = time.perf_counter()
+        with shared_runtime():
+            with ThreadPoolExecutor(max_workers=self.concurrency) as ex:
+                for future in [ex.submit(self.run_session, i) for i in range(self.sessions)]:
+                    future.result()
+        return time.perf_counter() - started
+
+
+def percentiles(values):
+    """
+    p50/p95/p99 (interpolasi linear) dalam milidetik.
+    """
+    if not values:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    if len(values) == 1:
+        cuts = [values[0]] * 99
+    else:
+        cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return {f'p{p}_ms': round(cuts[p - 1] * 1000, 1) for p in (50, 95, 99)}
+
+
+def summarize(test, wall_s):
+    records = test.records
+    by_action = {}
+    for action in ('all', 'upload', 'poll', 'interact') + ACTIONS:
+        if action == 'all':
+            rows = records
+        elif action == 'interact':
+            rows = [r for r in records if r['action'] in ACTIONS]
+        else:
+            rows = [r for r in records if r['action'] == action]
+        if not rows:
+            continue
+        by_action[action] = {
+            'reruns': len(rows),
+            'errors': sum(r['error'] is not None for r in rows),
+            **percentiles([r['seconds'] for r in rows]),
+            'max_ms': round(max(r['seconds'] for r in rows) * 1000, 1),
+        }
+    ready = [r['seconds'] for r in test.ready if r['loaded']]
+    errors = [r for r in records if r['error'] is not None]
+    return {
+        'sessions': test.sessions,
+        'concurrency': test.concurrency,
+        'wall_s': round(wall_s, 2),
+        'reruns': len(records),
+        'throughput_reruns_per_s': round(len(records) / wall_s, 2) if wall_s else None,
+        'sessions_loaded': len(ready),
+        'time_to_ready': percentiles(ready),
+        'latency': by_action,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'peak_rss_children_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        'sampled_rss_max_mb': round(max((r['rss_mb'] for r in records), default=0), 1),
+        'first_errors': sorted({r['error'] for r in errors})[:5],
+    }
+
+
+def print_summary(summary):
+    print(f"\n== {summary['sessions']} session (paralel {summary['concurrency']}), "
+          f"{summary['reruns']} rerun dalam {summary['wall_s']} s "
+          f"-> {summary['throughput_reruns_per_s']} rerun/s")
+    ready = summary['time_to_ready']
+    print(f"  siap: {summary['sessions_loaded']}/{summary['sessions']} session, "
+          f"p50 {ready['p50_ms']} ms  p95 {ready['p95_ms']} ms  p99 {ready['p99_ms']} ms")
+    for action, stats in summary['latency'].items():
+        print(f"  {action:<10} n={stats['reruns']:<5} err={stats['errors']:<3} "
+              f"p50 {stats['p50_ms']:>9} ms  p95 {stats['p95_ms']:>9} ms  "
+              f"p99 {stats['p99_ms']:>9} ms  max {stats['max_ms']:>9} ms")
+    print(f"  RSS puncak {summary['peak_rss_mb']} MB (worker ingest {summary['peak_rss_children_mb']} MB)")
+    for error in summary['first_errors']:
+        print(f"  error: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, help="Session yang berjalan bersamaan (default: --sessions)")
+    parser.add_argument('--steps', type=int, default=10, help="Jumlah perubahan widget per session")
+    parser.add_argument('--rows', type=int, default=20_000, help="Baris per set upload")
+    parser.add_argument('--files', type=int, default=2, help="Workbook per set upload")
+    parser.add_argument('--upload-sets', type=int, default=2,
+                        help="Jumlah set upload berbeda; session dibagi rata (sisanya berbagi dataset)")
+    parser.add_argument('--chart-backend', choices=('altair', 'matplotlib'))
+    parser.add_argument('--ingest-workers', type=int, help="EVAL_INGEST_WORKERS untuk session")
+    parser.add_argument('--poll', type=float, default=0.5, help="Jeda rerun saat menunggu parsing (detik)")
+    parser.add_argument('--timeout', type=float, default=300, help="Batas waktu per rerun/tunggu ingest (detik)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'eval-genai-bench'),
+                        help="Tempat workbook sintetis (dipakai ulang antar run)")
+    parser.add_argument('--json', help="Simpan ringkasan (dan semua rerun) ke file JSON")
+    args = parser.parse_args(argv)
+
+    # Diset sebelum modul app di-import oleh run pertama
+    if args.chart_backend:
+        os.environ['EVAL_CHART_BACKEND'] = args.chart_backend
+    if args.ingest_workers:
+        os.environ['EVAL_INGEST_WORKERS'] = str(args.ingest_workers)
+    # Path aset di app relatif terhadap root repo
+    os.chdir(ROOT)
+    # .streamlit/config.toml memasang logger.level = "debug" dan Streamlit menerapkannya
+    # saat config pertama kali di-parse (run AppTest pertama), menimpa set_log_level yang
+    # dipanggil lebih awal. Config di-parse dulu di sini, baru log script runner (isi
+    # widget per rerun) dibungkam
+    from streamlit import config as st_config
+    from streamlit.logger import set_log_level
+    st_config.get_config_options()
+    set_log_level('error')
+
+    for i in range(args.upload_sets):
+        paths = write_workbooks(os.path.join(args.workdir, 'xlsx'), args.rows, args.files, seed=1000 * i)
+        _upload_sets[i] = _uploads(paths)
+
+    test = LoadTest(
+        args.sessions, args.concurrency or args.sessions, args.steps, args.upload_sets,
+        poll_s=args.poll, timeout=args.timeout, seed=args.seed,
+    )
+    wall_s = test.run()
+    summary = summarize(test, wall_s)
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'args': vars(args), 'summary': summary, 'reruns': test.records, 'ready': test.ready},
+                      fh, indent=2)
+    return 1 if summary['sessions_loaded'] < args.sessions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Benchmark tahap-tahap utama ExcelAnalyzer pada data sintetis.
+
+Tahap:
+  ingest  - load_and_concat_sheets dari .xlsx (cold: parsing openpyxl, warm: cache)
+  filter  - filter_and_group untuk beberapa kombinasi widget (tanpa dan dengan memo)
+  group   - pembangunan count cube per kolom kategori
+  metrics - calculate_confusion_stats (tanpa agregat inkremental)
+  chart   - pembuatan spec/PNG bar chart (tanpa memo)
+
+Untuk tiap tahap dicatat waktu (min/median dari --repeat) dan puncak alokasi
+memori (tracemalloc), plus ukuran DataFrame dan RSS puncak proses.
+
+Contoh:
+    python benchmarks/run_benchmarks.py --rows 10000 100000 1000000 --json bench.json
+    python benchmarks/run_benchmarks.py --rows 5000000 --stages filter group metrics
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'src'))
+sys.path.insert(0, HERE)
+
+from synthetic import MAX_SHEET_ROWS, VERIF_OUTCOMES, make_evaluation_frame, write_workbooks
+from utils.charts import ChartRenderer
+from utils.myFunc import ExcelAnalyzer, compact_dtypes
+from utils.workbookCache import WorkbookCache
+
+STAGES = ('ingest', 'filter', 'group', 'metrics', 'chart')
+
+
+def measure(fn, repeat):
+    """
+    Return dict waktu (detik) dan puncak alokasi (byte) untuk `fn`.
+    Memori diukur di run terpisah karena tracemalloc memperlambat eksekusi.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'min_s': round(min(times), 6),
+        'median_s': round(statistics.median(times), 6),
+        'peak_alloc_mb': round(peak / 1e6, 2),
+    }
+
+
+def _uploads(paths):
+    files = []
+    for path in paths:
+        with open(path, 'rb') as fh:
+            f = io.BytesIO(fh.read())
+        f.name = os.path.basename(path)
+        files.append(f)
+    return files
+
+
+def bench_ingest(rows, files, repeat, workdir):
+    per_file = -(-rows // files)
+    if per_file > MAX_SHEET_ROWS:
+        return {'skipped': f"{per_file} baris/file melebihi batas sheet .xlsx; tambah --files"}
+    paths = write_workbooks(os.path.join(workdir, 'xlsx'), rows, files)
+    uploads = _uploads(paths)
+
+    def load(cache):
+        analyzer = ExcelAnalyzer(cache=cache, workers=1)
+        analyzer.load_and_concat_sheets(uploads, 'Sheet1', columns=analyzer.analysis_columns())
+        # Lepas dataset bersama: tanpa ini run berikutnya dapat entri registry yang
+        # sama dan concat + compact_dtypes tidak pernah terukur
+        analyzer.reset_loaded()
+
+    def cold():
+        load(WorkbookCache(store=None))
+
+    warm_cache = WorkbookCache(store=None)
+    load(warm_cache)
+
+    def warm():
+        # Analyzer baru, cache sama: yang diukur hanya concat + compact, tanpa parsing
+        load(warm_cache)
+
+    return {'cold': measure(cold, max(1, repeat // 2)), 'warm': measure(warm, repeat)}
+
+
+def filter_combinations(df):
+    keys = df['Key'].cat.categories.tolist()
+    types = df['Type'].cat.categories.tolist()
+    return list(itertools.product(
+        ['Key', 'Bab', 'Emiten'],
+        [VERIF_OUTCOMES[:1], VERIF_OUTCOMES],
+        [[], keys[:25]],
+        [[], types[:1]],
+    ))
+
+
+def run_size(rows, args, workdir):
+    result = {'rows': rows}
+    stages = set(args.stages)
+
+    if 'ingest' in stages:
+        result['ingest'] = bench_ingest(rows, args.files, args.repeat, workdir)
+
+    raw = make_evaluation_frame(rows, n_emiten=args.emiten, n_params=args.params)
+    raw['filename'] = [f"file_{i % args.files:03d}.xlsx" for i in range(rows)]
+    df, report = compact_dtypes(raw, category_cols=ExcelAnalyzer(workers=1).compact_cols())
+    del raw
+    result['dataframe_mb'] = round(report['bytes_after'] / 1e6, 2)
+    result['dataframe_mb_object'] = round(report['bytes_before'] / 1e6, 2)
+
+    if 'group' in stages:
+        def build_cubes():
+            analyzer = ExcelAnalyzer(workers=1)
+            analyzer.df = df
+            for col in ('Key', 'Bab', 'Emiten'):
+                analyzer.count_cube(col)
+        result['group'] = measure(build_cubes, args.repeat)
+
+    analyzer = ExcelAnalyzer(workers=1)
+    analyzer.df = df
+
+    if 'filter' in stages:
+        combos = filter_combinations(df)
+        for col in ('Key', 'Bab', 'Emiten'):
+            analyzer.count_cube(col)
+
+        def run_filters(target):
+            def run():
+                for category_col, verif, keys, types in combos:
+                    target.category_col = category_col
+                    target.selected_verif = verif
+                    target.selected_key = keys
+                    target.selected_type = types
+                    target.filter_and_group()
+            return run
+
+        # filter: tanpa memo (view_cache_size=0); filter_memo: kombinasi yang sama diulang
+        cold = ExcelAnalyzer(workers=1)
+        cold.view_cache_size = 0
+        cold.df = df
+        for col in ('Key', 'Bab', 'Emiten'):
+            cold.count_cube(col)
+        for name, target in (('filter', cold), ('filter_memo', analyzer)):
+            stats = measure(run_filters(target), args.repeat)
+            stats['per_call_ms'] = round(stats['median_s'] / len(combos) * 1000, 3)
+            result[name] = stats
+
+    if 'metrics' in stages:
+        result['metrics'] = measure(analyzer.calculate_confusion_stats, args.repeat)
+
+    if 'chart' in stages:
+        analyzer.category_col = 'Key'
+        analyzer.selected_verif = VERIF_OUTCOMES[:1]
+        analyzer.selected_key, analyzer.selected_type = [], []
+        grouped = analyzer.filter_and_group()[0]
+
+        for backend in ('altair', 'matplotlib'):
+            def build_chart():
+                # max_entries=0 -> tanpa memo, yang diukur biaya render sebenarnya
+                ChartRenderer(backend, max_entries=0).build(grouped, 'Key', 'bench', analyzer.top_n)
+            result[f'chart_{backend}'] = measure(build_chart, args.repeat)
+
+    result['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def print_result(result):
+    print(f"\n== {result['rows']:,} baris (DataFrame {result['dataframe_mb']} MB, "
+          f"object dtype {result['dataframe_mb_object']} MB, RSS puncak {result['peak_rss_mb']} MB)")
+    for stage, stats in result.items():
+        if not isinstance(stats, dict):
+            continue
+        nested = stats if all(isinstance(v, dict) for v in stats.values()) else {'': stats}
+        for label, values in nested.items():
+            name = f"{stage}.{label}" if label else stage
+            if 'skipped' in values:
+                print(f"  {name:<20} skipped: {values['skipped']}")
+                continue
+            extra = f"  {values['per_call_ms']} ms/call" if 'per_call_ms' in values else ''
+            print(f"  {name:<20} median {values['median_s'] * 1000:>10.1f} ms  "
+                  f"min {values['min_s'] * 1000:>10.1f} ms  peak {values['peak_alloc_mb']:>8.1f} MB{extra}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--files', type=int, default=4, help="Jumlah workbook untuk tahap ingest")
+    parser.add_argument('--emiten', type=int, default=200)
+    parser.add_argument('--params', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'eval-genai-bench'),
+                        help="Tempat workbook sintetis (dipakai ulang antar run)")
+    parser.add_argument('--json', help="Simpan hasil ke file JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        result = run_size(rows, args, args.workdir)
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump({'args': vars(args), 'results': results}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Laporan waktu import saat cold start, per package, untuk dipantau di CI.
+
+Dua tahap diukur di subprocess Python baru (pakai `python -X importtime`):
+  - landing : `import streamlit_app` (yang dimuat sebelum ada dataset)
+  - dataset : `import utils.myFunc` (stack analitik yang dimuat setelah upload)
+
+Contoh:
+    python scripts/startup_report.py
+    python scripts/startup_report.py --json startup.json --landing-budget-ms 1500 \
+        --forbid pandas,numpy,pyarrow,openpyxl,matplotlib,seaborn,altair,requests
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+STAGES = {
+    'landing': 'import streamlit_app',
+    'dataset': 'import streamlit_app, utils.myFunc',
+}
+
+
+def measure(statement):
+    """
+    Jalankan `statement` dengan -X importtime; return (total_us, {package: self_us}).
+    """
+    env = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+
+    per_package = defaultdict(int)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = _parse(line)
+        per_package[name.strip().split('.')[0]] += self_us
+        if not name.startswith(' '):
+            total += cumulative_us
+    return total, dict(per_package)
+
+
+def _parse(line):
+    # Format: "import time:  self | cumulative | <indent>nama.modul"
+    head, cumulative, name = line.split('|', 2)
+    self_us = int(head.split(':', 1)[1])
+    return self_us, int(cumulative), name[1:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--json', help="Tulis laporan lengkap ke file JSON")
+    parser.add_argument('--top', type=int, default=15, help="Jumlah package teratas per tahap")
+    parser.add_argument('--landing-budget-ms', type=float, help="Gagal bila import landing melebihi batas ini")
+    parser.add_argument('--forbid', default='', help="Package (dipisah koma) yang tidak boleh di-import tahap landing")
+    args = parser.parse_args(argv)
+
+    report = {}
+    for stage, statement in STAGES.items():
+        total_us, per_package = measure(statement)
+        report[stage] = {
+            'statement': statement,
+            'total_ms': round(total_us / 1000, 1),
+            'packages_ms': {
+                name: round(us / 1000, 1)
+                for name, us in sorted(per_package.items(), key=lambda kv: -kv[1])
+            },
+        }
+        print(f"[{stage}] {statement}: {total_us / 1000:,.1f} ms")
+        for name, ms in list(report[stage]['packages_ms'].items())[:args.top]:
+            print(f"    {name:<30} {ms:>10,.1f} ms")
+
+    errors = []
+    landing = report['landing']
+    forbidden = [p for p in args.forbid.split(',') if p]
+    leaked = [p for p in forbidden if p in landing['packages_ms']]
+    if leaked:
+        errors.append(f"landing meng-import package berat: {', '.join(leaked)}")
+    if args.landing_budget_ms is not None and landing['total_ms'] > args.landing_budget_ms:
+        errors.append(f"landing {landing['total_ms']} ms > budget {args.landing_budget_ms} ms")
+    report['errors'] = errors
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+    for msg in errors:
+        print(f"ERROR: {msg}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Evaluasi batch tanpa browser: hitung tabel TP/TN/FP/FN dan
+Accuracy/Specificity/Recall/Precision/F1 yang sama dengan tab "AI Model Eval"
+untuk banyak workbook sekaligus.
+
+Contoh:
+    python src/batch_eval.py data/2025-05/ --out out/2025-05 --format csv parquet
+    python src/batch_eval.py "exports/*.xlsx" --workers 8 --stream
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.confidence import INTERVAL_METHODS
+from utils.myFunc import ExcelAnalyzer, confusion_tables, merge_counts
+from utils.workbookCache import WorkbookCache, default_store
+
+logger = logging.getLogger('batch_eval')
+
+OUTPUT_FORMATS = ('csv', 'parquet', 'json')
+TABLES = ('key_counts', 'key_metrics', 'file_counts', 'file_metrics')
+
+
+def resolve_inputs(patterns):
+    """
+    Direktori -> semua *.xlsx di dalamnya (rekursif); selain itu diperlakukan sebagai glob.
+    Urutan hasil selalu terurut agar output deterministik.
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '**', '*.xlsx')
+        paths.update(p for p in glob.glob(pattern, recursive=True) if p.endswith('.xlsx'))
+    return sorted(paths)
+
+
+def file_labels(paths):
+    """
+    Label kolom `filename` per path: path relatif terhadap direktori induk bersama
+    semua input, supaya file bernama sama di subfolder berbeda tidak tergabung.
+    """
+    if not paths:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    return {p: os.path.relpath(os.path.abspath(p), root).replace(os.sep, '/') for p in paths}
+
+
+def _open_upload(path, label=None):
+    # Bentuk file-like bernama, sama seperti UploadedFile dari Streamlit
+    with open(path, 'rb') as fh:
+        f = BytesIO(fh.read())
+    f.name = label or os.path.basename(path)
+    return f
+
+
+def evaluate_file(path, sheet_name, stream=False, label=None):
+    """
+    Dijalankan di worker: return (path, agregat confusion per (Key, filename), peringatan).
+    `label` mengisi kolom filename (default: nama file).
+    Cache memori dimatikan (max_bytes=0) supaya worker tidak menumpuk DataFrame;
+    spill Parquet tetap dipakai sehingga run berikutnya tidak parsing ulang.
+    """
+    warnings = []
+    analyzer = ExcelAnalyzer(
+        cache=WorkbookCache(max_bytes=0, store=default_store()),
+        workers=1, warn=warnings.append
+    )
+    files = [_open_upload(path, label)]
+    if stream:
+        analyzer.df = analyzer.load_streaming(files, sheet_name)
+    else:
+        analyzer.df = analyzer.load_and_concat_sheets(
+            files, sheet_name, columns=analyzer.analysis_columns(), workers=1
+        )
+    if analyzer.df is None:
+        return path, None, warnings
+    if analyzer.verif_col not in analyzer.df.columns or analyzer.key_col not in analyzer.df.columns:
+        warnings.append(f"File {files[0].name} tidak punya kolom '{analyzer.verif_col}'/'{analyzer.key_col}', dilewati.")
+        return path, None, warnings
+    return path, analyzer.confusion_counts(), warnings
+
+
+def run(paths, sheet_name='Sheet1', workers=1, stream=False):
+    """
+    Proses semua file (paralel bila workers > 1), gabungkan agregat parsialnya.
+    Return (counts, warnings).
+    """
+    counts = None
+    all_warnings = []
+    labels = file_labels(paths)
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = ex.map(
+                evaluate_file, paths, [sheet_name] * len(paths), [stream] * len(paths),
+                [labels[p] for p in paths]
+            )
+            results = list(results)
+    else:
+        results = [evaluate_file(p, sheet_name, stream, labels[p]) for p in paths]
+
+    for path, partial, warnings in results:
+        for msg in warnings:
+            logger.warning(msg)
+        all_warnings.extend(warnings)
+        if partial is not None:
+            counts = merge_counts(counts, partial)
+    return counts, all_warnings
+
+
+def write_outputs(tables, out_dir, formats):
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name, df in tables.items():
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{name}.{fmt}")
+            if fmt == 'csv':
+                df.to_csv(path, index=False)
+            elif fmt == 'parquet':
+                df.to_parquet(path, index=False)
+            else:
+                df.to_json(path, orient='records', indent=2)
+            written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help="Direktori atau glob file .xlsx")
+    parser.add_argument('--sheet', default='Sheet1', help="Nama sheet yang dibaca (default: Sheet1)")
+    parser.add_argument('--out', default='batch_eval_output', help="Direktori output")
+    parser.add_argument('--format', nargs='+', choices=OUTPUT_FORMATS, default=['csv'], dest='formats')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--stream', action='store_true', help="Baca sheet per chunk (untuk workbook sangat besar)")
+    parser.add_argument('--ci', choices=INTERVAL_METHODS, help="Tambah kolom interval kepercayaan di tabel metrik")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--bootstrap', type=int, default=0, metavar='N',
+                        help="Jumlah resample bootstrap untuk interval F1; hanya bersama --ci")
+    args = parser.parse_args(argv)
+    if args.bootstrap and not args.ci:
+        parser.error("--bootstrap butuh --ci (mis. --ci wilson --bootstrap 1000)")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    paths = resolve_inputs(args.inputs)
+    if not paths:
+        logger.error("Tidak ada file .xlsx yang cocok dengan input.")
+        return 2
+
+    logger.info("Memproses %d file dengan %d worker", len(paths), args.workers)
+    counts, warnings = run(paths, args.sheet, workers=args.workers, stream=args.stream)
+    if counts is None:
+        logger.error("Tidak ada data yang bisa dihitung.")
+        return 1
+
+    intervals = None
+    if args.ci:
+        intervals = {'method': args.ci, 'confidence': args.confidence, 'n_boot': args.bootstrap}
+    tables = dict(zip(TABLES, confusion_tables(counts, file_label=True, intervals=intervals)))
+    written = write_outputs(tables, args.out, args.formats)
+    summary = {
+        'files': len(paths),
+        'sheet': args.sheet,
+        'rows_evaluated': int(tables['file_counts']['Total'].sum()),
+        'warnings': warnings,
+        'outputs': written,
+    }
+    with open(os.path.join(args.out, 'summary.json'), 'w', encoding='utf-8') as fh:
+        json.dump(summary, fh, indent=2)
+    logger.info("Selesai: %d tabel ditulis ke %s", len(written), args.out)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,61 @@
 import streamlit as st
-from io import BytesIO
-import requests
-from utils.myFunc import ExcelAnalyzer, UIComponents
+from utils.uiComponents import UIComponents
+from utils.profiler import RunProfiler, configure_json_logging, profiled, profiling_enabled
 
 uc = UIComponents()
-analyzer = ExcelAnalyzer()
+
+
+def get_analyzer():
+    # Satu ExcelAnalyzer per session (filter & pilihan widget tidak bercampur antar user);
+    # dataset hasil parsing tetap dibagi lintas session lewat utils.datasetRegistry.
+    # Stack analitik (pandas, numpy, pyarrow, ...) baru di-import saat ada dataset,
+    # jadi halaman awal (video) tetap ringan saat cold start
+    if 'analyzer' not in st.session_state:
+        from utils.myFunc import ExcelAnalyzer
+        st.session_state['analyzer'] = ExcelAnalyzer()
+    return st.session_state['analyzer']
+
+def get_profiler(analyzer):
+    # Instrumentasi per rerun, aktif via EVAL_PROFILE=1 atau ?profile=1
+    if not profiling_enabled(st.query_params):
+        analyzer.profiler = None
+        return None
+    configure_json_logging()
+    if 'profile_session' not in st.session_state:
+        import uuid
+        st.session_state['profile_session'] = uuid.uuid4().hex[:12]
+    analyzer.profiler = RunProfiler(st.session_state['profile_session'], cache=analyzer.cache)
+    return analyzer.profiler
+
+def get_ingest_job(analyzer, files, sheet_name, columns, digests):
+    # Parsing upload berjalan di background; job lama dibatalkan bila set upload berubah
+    from utils.backgroundIngest import IngestJob, job_token
+    token = job_token(files, sheet_name, columns, digests)
+    job = st.session_state.get('ingest_job')
+    if job is None or job.token != token:
+        if job is not None and not job.done:
+            job.cancel()
+        job = IngestJob(
+            files, sheet_name, columns, cache=analyzer.cache,
+            workers=analyzer.workers, use_processes=analyzer.use_processes, digests=digests
+        ).start()
+        st.session_state['ingest_job'] = job
+    return job
+
+@st.fragment(run_every=1.0)
+def render_ingest_progress(job, loaded, rows):
+    # Rerun penuh setiap ada file baru yang siap, supaya tab Statistik ikut terisi
+    if job.done or len(job.ready_files()) != loaded:
+        st.rerun()
+    finished, total = job.progress()
+    st.progress(finished / max(total, 1), text=f"Parsing workbooks in the background: {finished}/{total} done")
+    with st.expander("Files:"):
+        for name, status, error in job.statuses():
+            n_rows = f", {rows[name]:,} rows" if rows.get(name) is not None else ""
+            st.caption(f"{name}: {status}{n_rows}" + (f" ({error})" if error else ""))
+    if st.button("Cancel loading"):
+        job.cancel()
+        st.rerun()
 
 def main():
     st.set_page_config(layout="wide")
@@ -18,11 +69,12 @@ def main():
             # Pilih sumber data
             data_source = st.radio(
                 "Select data source:",
-                options=["Upload File", "Use Demo Dummy Data"],
+                options=["Upload File", "Use Demo Dummy Data", "Open Snapshot Bundle"],
                 index=0
             )
 
             input_files = None  # Gunakan ini sebagai pengganti uploaded_files
+            snapshot_file = None
 
             if data_source == "Upload File":
                 uploaded_files = st.file_uploader(
@@ -35,14 +87,20 @@ def main():
                 else: 
                     st.info("Please upload at least one Excel (.xlsx) file.")
 
+            elif data_source == "Open Snapshot Bundle":
+                # Bundle hasil "Snapshot Bundle" di sidebar: tanpa parsing Excel
+                snapshot_file = st.file_uploader("Upload snapshot bundle", type=['zip'])
+                if snapshot_file:
+                    input_files = [snapshot_file]
+                else:
+                    st.info("Please upload a snapshot bundle (.zip) exported from this app.")
+
             else:  # Gunakan demo dummy dari huggingface
-                demo_url = "https://huggingface.co/datasets/naufalnashif/assets-rfojk/resolve/main/RFOJK20250524_df_joined_demo.xlsx"
                 try:
-                    response = requests.get(demo_url)
-                    demo_file = BytesIO(response.content)
-                    demo_file.name = "RFOJK20250524_df_joined_demo.xlsx"
+                    from utils.demoAssets import demo_assets
+                    demo_file, demo_source = demo_assets.fetch()
                     input_files = [demo_file]  # agar serupa dengan uploaded_files
-                    st.success("Demo Dummy Data loaded successfully.")
+                    st.success(f"Demo Dummy Data loaded successfully ({demo_source}).")
                 except Exception as e:
                     st.error(f"Failed to load demo data: {e}")
 
@@ -60,20 +118,92 @@ def main():
         # st.title("📊 AI Model Evaluation Dashboard")
     
     # ------------------- DATASET PROCESSING -------------------------
-    sheets = analyzer.get_all_sheet_names(input_files)
-    if not sheets:
-        st.warning("No sheets found in the uploaded file.")
-        return
-
-    default_sheet = "Sheet1"
-    sheet_choice = default_sheet if default_sheet in sheets else sheets[0]
-
-    combined_df = analyzer.load_and_concat_sheets(input_files, sheet_choice)
+    analyzer = get_analyzer()
+    profiler = get_profiler(analyzer)
+    # Hash isi upload sekali per rerun, lalu diteruskan ke semua pemakai
+    digests = analyzer.file_digests(input_files)
+    if snapshot_file is not None:
+        try:
+            combined_df = analyzer.load_snapshot(snapshot_file, digest=digests[0])
+        except ValueError as e:
+            st.error(f"Failed to open snapshot bundle: {e}")
+            return
+        sheet_choice = analyzer.snapshot_meta.get('sheet')
+        source_cols = combined_df.columns.tolist() if combined_df is not None else []
+        st.sidebar.caption(
+            f"Snapshot of {len(analyzer.snapshot_meta.get('files', []))} file(s), "
+            f"sheet '{sheet_choice}', exported {analyzer.snapshot_meta.get('created', '?')}"
+        )
+    else:
+        sheets = analyzer.get_all_sheet_names(input_files, digests)
+        if not sheets:
+            st.warning("No sheets found in the uploaded file.")
+            return
+
+        default_sheet = "Sheet1"
+        sheet_choice = default_sheet if default_sheet in sheets else sheets[0]
+        # Kolom header workbook (bukan hanya kolom yang diproyeksikan), untuk pilihan kolom run
+        source_cols = analyzer.sheet_columns(input_files, sheet_choice, digests)
+
+        if analyzer.should_stream(input_files):
+            # Workbook sangat besar: hanya agregat yang disimpan di memori
+            combined_df = analyzer.load_streaming(input_files, sheet_choice, digests=digests)
+        else:
+            # Kolom run pilihan "Run Comparison" ikut diproyeksikan; berubah -> load ulang
+            run_compare = st.session_state.get('run_compare', {})
+            columns = analyzer.analysis_columns(extra=[run_compare['col']] if run_compare.get('col') else None)
+            job = get_ingest_job(analyzer, input_files, sheet_choice, columns, digests)
+            load_files = job.ready_files()
+            # File dari job bisa objek upload rerun sebelumnya: digest diambil dari job
+            digest_of = {id(f): digest for f, digest in zip(job.files, job.digests)}
+            if not job.done:
+                render_ingest_progress(job, len(load_files), analyzer.sheet_rows(input_files, sheet_choice, digests))
+                if not load_files:
+                    uc.render_footer()
+                    st.stop()
+                st.info(f"Showing results for {len(load_files)} of {len(input_files)} files; the rest are still loading.")
+            elif job.cancelled and len(load_files) < len(input_files):
+                st.info(f"Loading was cancelled: showing {len(load_files)} of {len(input_files)} files.")
+                if st.button("Resume loading"):
+                    del st.session_state['ingest_job']
+                    st.rerun()
+            combined_df = analyzer.load_and_concat_sheets(
+                load_files, sheet_choice, columns=columns,
+                digests=[digest_of[id(f)] for f in load_files]
+            )
     if combined_df is None or combined_df.empty:
         st.warning("Combined data is empty or failed to load.")
         return
 
     analyzer.df = combined_df
+    if profiler is not None:
+        report = analyzer.memory_report
+        profiler.note(
+            'dataset', rows=len(combined_df), columns=combined_df.shape[1],
+            mb=round((report['bytes_after'] if report else combined_df.memory_usage().sum()) / 1e6, 2)
+        )
+    if analyzer.memory_report:
+        report = analyzer.memory_report
+        st.sidebar.caption(
+            f"Data memory: {report['bytes_before'] / 1e6:,.1f} MB → "
+            f"{report['bytes_after'] / 1e6:,.1f} MB "
+            f"(saved {report['bytes_saved'] / 1e6:,.1f} MB)"
+        )
+
+    if snapshot_file is None:
+        with st.sidebar:
+            with st.expander("Snapshot Bundle:"):
+                st.caption("Save the loaded data with its precomputed tables as one file. "
+                           "Open it later via 'Open Snapshot Bundle' to skip Excel parsing.")
+                if st.checkbox("Prepare snapshot bundle", value=False):
+                    # Dibuat sekali per dataset, lalu dipakai ulang di rerun berikutnya
+                    bundle = analyzer.export_snapshot(
+                        {'sheet': sheet_choice, 'files': [f.name for f in input_files]}
+                    )
+                    st.download_button(
+                        f"Download snapshot ({len(bundle) / 1e6:,.1f} MB)", data=bundle,
+                        file_name=f"eval_snapshot_{sheet_choice}.zip", mime="application/zip"
+                    )
 
     num_cols, cat_cols = analyzer.get_columns()
 
@@ -85,57 +215,147 @@ def main():
         st.warning(f"Column '{analyzer.verif_col}' not found in the combined data.")
         return
 
-    verif_options = analyzer.df[analyzer.verif_col].dropna().unique().tolist()
-    key_options = analyzer.df[analyzer.key_col].dropna().unique().tolist()
-    type_options = analyzer.df[analyzer.type_col].dropna().unique().tolist()
+    with profiled(profiler, 'widget_options'):
+        # Dihitung sekali per dataset, bukan di setiap rerun
+        options = analyzer.filter_options()
+        verif_options = options[analyzer.verif_col]
+        key_options = options[analyzer.key_col]
+        type_options = options[analyzer.type_col]
+
+    with st.sidebar:
+        with st.expander("Statistics Settings:"):
+            # Interval kepercayaan metrik: Wilson/Clopper-Pearson, F1 lewat bootstrap
+            ci_method = st.selectbox("Confidence interval:", ["Wilson", "Clopper-Pearson", "Off"])
+            ci_level = st.select_slider("Confidence level:", options=[0.90, 0.95, 0.99], value=0.95,
+                                        format_func=lambda v: f"{v:.0%}")
+            ci_bootstrap = st.checkbox(
+                "Bootstrap F1 interval (500 resamples)", value=False,
+                help="500 resamples keep the interval under about a second for a few thousand Keys. "
+                     "Use the batch CLI with --bootstrap 1000 or more for final reports. "
+                     "F1 is undefined (empty) when TP = 0, in the table and in the resamples."
+            )
+    intervals = None
+    if ci_method != "Off":
+        intervals = {'method': ci_method.lower(), 'confidence': ci_level,
+                     'n_boot': 500 if ci_bootstrap else 0}
 
     tab1, tab2, tab3 = st.tabs(["📈 AI Model Eval", "📊 Analytics", "📚 Doc"])
 
     with tab1:
         st.header("Table Detail :")
-        df_counts, df_metrics, df_counts_total, df_metrics_total = analyzer.calculate_confusion_stats()
+        df_counts, df_metrics, df_counts_total, df_metrics_total = analyzer.calculate_confusion_stats(intervals)
         if df_counts is None or df_metrics is None:
             st.warning("Insufficient data to compute statistics (make sure the column contains 'True Positive', 'True Negative', 'False Positive', 'False Negative').")
         else:
-            with st.expander ("Coef Matrix:"):
-                # st.subheader("Coef Matrix Per Key")
-                st.dataframe(
-                    df_counts.style
-                        .format({"Count": "{:,.0f}"})
-                        .highlight_max(
-                            subset=["TP", "FP", "FN", "TN", "Total"],
-                            axis=0,
-                            props='background-color: #ffdd57; color: black;'
-                        ))
-
-                st.dataframe(df_counts_total.style.format({"Count": "{:,.0f}"}))
-            with st.expander ("Metrics:"):
-                # st.subheader("Metrics Evaluasi Per Key")
-                import pandas as pd
-                # Format ke persen dan warnai berdasarkan threshold
-                def highlight_metric(val):
-                    if pd.isna(val):
-                        return ''
-                    elif val >= 0.8:
-                        # return 'background-color: #bfff00; color: black;'  # hijau muda
-                        return ''
-                    else:
-                        return 'background-color: #e97451; color: white;'  # merah kecoklatan
-
-                # Format ke persen
-                def fmt(val):
-                    return f"{val:.2%}" if pd.notna(val) else "-"
-
-                # Kolom yang ingin diformat & highlight
-                highlight_cols = ["Accuracy", "Specificity", "Recall", "Precision", "F1 Score"]
-
-                # Terapkan di Streamlit
-                st.dataframe(
-                    df_metrics.style
-                        .format({col: fmt for col in highlight_cols})
-                        .applymap(highlight_metric, subset=highlight_cols)
+            with profiled(profiler, 'styled_tables'):
+                # Highlight dihitung sebagai mask vektor; hanya halaman aktif yang di-style
+                from utils.tableView import TableView, max_mask, below_mask, HIGHLIGHT_MAX_CSS, LOW_METRIC_CSS
+                with st.expander ("Coef Matrix:"):
+                    # st.subheader("Coef Matrix Per Key")
+                    count_cols = ["TP", "FP", "FN", "TN", "Total"]
+                    TableView(
+                        df_counts, highlights=[(max_mask(df_counts, count_cols), HIGHLIGHT_MAX_CSS)]
+                    ).render("counts")
+
+                    st.dataframe(df_counts_total)
+                with st.expander ("Metrics:"):
+                    # st.subheader("Metrics Evaluasi Per Key")
+                    import pandas as pd
+
+                    # Format ke persen
+                    def fmt(val):
+                        return f"{val:.2%}" if pd.notna(val) else "-"
+
+                    # Kolom yang ingin diformat & highlight
+                    highlight_cols = ["Accuracy", "Specificity", "Recall", "Precision", "F1 Score"]
+                    # Batas interval (kolom '<Metrik> Low/High') ikut diformat persen
+                    formats = {col: fmt for col in df_metrics.columns
+                               if col in highlight_cols or col.endswith((" Low", " High"))}
+
+                    # Metrik < 80% diwarnai merah kecoklatan
+                    TableView(
+                        df_metrics, formats=formats,
+                        highlights=[(below_mask(df_metrics, highlight_cols, 0.8), LOW_METRIC_CSS)]
+                    ).render("metrics")
+                    st.dataframe(df_metrics_total.style.format(formats))
+
+        # Perbandingan run hanya dihitung bila diminta; run = set file (mis. satu set per
+        # versi model) atau nilai sebuah kolom. Baris dicocokkan per Key + Refinement Parameter
+        with st.expander("Run Comparison:"):
+            st.caption("Compare evaluation runs of the same items, e.g. two model versions.")
+            # Pilihan disimpan juga di luar key widget: widget yang tidak dirender
+            # (mis. saat file masih di-parse) kehilangan state-nya
+            run_compare = st.session_state.setdefault('run_compare', {'mode': "Off", 'col': None})
+            st.session_state.setdefault('run_compare_mode', run_compare['mode'])
+            compare_mode = st.radio(
+                "Define runs by:", ["Off", "Groups of files", "A column"], horizontal=True,
+                key='run_compare_mode'
+            )
+            run_col, run_groups, run_options = 'filename', None, []
+            if compare_mode == "A column":
+                run_cols = [c for c in source_cols
+                            if c not in (analyzer.verif_col, analyzer.key_col, 'Refinement Parameter')]
+                if st.session_state.get('run_compare_col') not in run_cols:
+                    st.session_state['run_compare_col'] = run_compare['col'] if run_compare['col'] in run_cols else (
+                        run_cols[0] if run_cols else None)
+                run_col = st.selectbox("Run column:", run_cols, key='run_compare_col')
+                run_options = analyzer.run_options(run_col) if run_col else []
+            run_compare['mode'] = compare_mode
+            projected = run_col if compare_mode == "A column" else None
+            if snapshot_file is None and projected != run_compare['col']:
+                # Kolom run belum ada di dataset yang dimuat: proyeksikan ulang
+                run_compare['col'] = projected
+                st.rerun()
+            elif compare_mode == "Groups of files":
+                file_options = analyzer.run_options('filename')
+                n_sets = st.number_input("Number of evaluation sets:", min_value=2,
+                                         max_value=max(2, len(file_options)), value=2)
+                run_groups = {}
+                for i in range(int(n_sets)):
+                    name_col, files_col = st.columns([1, 3])
+                    set_name = name_col.text_input(f"Set {i + 1} name:", value=f"Set {i + 1}", key=f"run_set_name_{i}")
+                    members = files_col.multiselect(f"Files in set {i + 1}:", file_options, key=f"run_set_files_{i}")
+                    if set_name and members:
+                        run_groups[set_name] = run_groups.get(set_name, []) + members
+                assigned = [f for members in run_groups.values() for f in members]
+                if len(assigned) != len(set(assigned)):
+                    st.warning("Each file can belong to one evaluation set only.")
+                    run_groups = {}
+                run_options = list(run_groups)
+            if compare_mode != "Off" and len(run_options) < 2:
+                st.info("Define at least two runs to compare.")
+            elif compare_mode != "Off":
+                base_run = st.selectbox("Baseline run:", run_options)
+                compare_to = st.multiselect(
+                    "Compare with:", [r for r in run_options if r != base_run],
+                    default=[r for r in run_options if r != base_run]
                 )
-                st.dataframe(df_metrics_total.style.format({col: fmt for col in highlight_cols}))
+                with profiled(profiler, 'run_comparison', runs=len(compare_to)):
+                    df_summary, df_delta, df_flips = analyzer.compare_runs(
+                        base_run, compare_to, run_col=run_col, groups=run_groups
+                    )
+                if df_summary is None:
+                    st.info("Select at least one run to compare (not available for streamed datasets).")
+                else:
+                    import pandas as pd
+                    from utils.tableView import TableView, below_mask, HIGHLIGHT_MAX_CSS
+
+                    def fmt_delta(val):
+                        return f"{val:+.2%}" if pd.notna(val) else "-"
+
+                    delta_cols = [c for c in df_delta.columns if c.endswith(" Δ")]
+                    delta_formats = {c: fmt_delta for c in delta_cols}
+                    delta_formats.update({"McNemar χ²": "{:.2f}", "p-value": "{:.4f}"})
+                    st.caption("Rows are paired by Key, Refinement Parameter and their order within each run. "
+                               "Δ = run − baseline on paired rows; McNemar tests correct→wrong vs wrong→correct flips.")
+                    st.dataframe(df_summary.style.format(delta_formats))
+                    # Key dengan perubahan signifikan (p < 0.05) ditandai
+                    TableView(
+                        df_delta, formats=delta_formats,
+                        highlights=[(below_mask(df_delta, ["p-value"], 0.05), HIGHLIGHT_MAX_CSS)]
+                    ).render("run_delta")
+                    st.markdown("**Outcome flips per Key (baseline → run):**")
+                    TableView(df_flips).render("run_flips")
 
     with tab2:
         st.header("Bar Chart")
@@ -159,8 +379,7 @@ def main():
                 )
 
                 # Batasi pilihan hanya ke kolom yang kamu mau
-                allowed_cat_cols = ['Key', 'Type', 'Bab', 'Emiten']
-                cat_cols_filtered = [col for col in cat_cols if col in allowed_cat_cols]
+                cat_cols_filtered = [col for col in cat_cols if col in analyzer.allowed_cat_cols]
 
                 analyzer.category_col = st.selectbox("Select Y-Bar", cat_cols_filtered)
 
@@ -183,27 +402,33 @@ def main():
             st.info("No data found for the selected filter.")
         else:
             analyzer.plot_bar(grouped)
-            with st.expander(f"### 📋 Tabel Detail {analyzer.category_col}:"):
-                st.dataframe(grouped_detail)
+            from utils.tableView import TableView
+            with profiled(profiler, 'detail_tables'):
+                with st.expander(f"### 📋 Tabel Detail {analyzer.category_col}:"):
+                    TableView(grouped_detail).render("grouped_detail")
 
-            with st.expander(f"### 📋 Tabel Detail {analyzer.category_col} and Refinement Parameter:"):
-                df = grouped_with_criteria.copy()
+                with st.expander(f"### 📋 Tabel Detail {analyzer.category_col} and Refinement Parameter:"):
+                    df = grouped_with_criteria
 
-                # Filter berdasarkan analyzer.category_col (selectbox dengan opsi 'All')
-                category_col = analyzer.category_col
-                if category_col in df.columns:
-                    category_values = sorted(df[category_col].dropna().unique().tolist())
-                    category_options = ['All'] + category_values
-                    selected_value = st.selectbox(f"Filter {category_col}:", category_options)
+                    # Filter berdasarkan analyzer.category_col (selectbox dengan opsi 'All')
+                    category_col = analyzer.category_col
+                    if category_col in df.columns:
+                        category_values = sorted(df[category_col].dropna().unique().tolist())
+                        category_options = ['All'] + category_values
+                        selected_value = st.selectbox(f"Filter {category_col}:", category_options)
 
-                    if selected_value != 'All':
-                        df = df[df[category_col] == selected_value]
+                        if selected_value != 'All':
+                            df = df[df[category_col] == selected_value]
 
-                # Tampilkan dataframe yang telah difilter
-                st.dataframe(df, use_container_width=True)
+                    # Tampilkan dataframe yang telah difilter, per halaman
+                    TableView(df).render("grouped_with_criteria", use_container_width=True)
 
     with tab3:
         uc.render_doc()
+
+    if profiler is not None:
+        profiler.finish()
+        uc.render_diagnostics(profiler)
     
     uc.render_footer()
 
@@ -0,0 +1,194 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.workbookCache import (
+    _parse_workbook_sheet, default_workers, file_hash, process_pool, read_file_bytes, workbook_cache
+)
+
+# Status per file
+QUEUED, PARSING, DONE, SKIPPED, ERROR, CANCELLED = 'queued', 'parsing', 'done', 'skipped', 'error', 'cancelled'
+FINISHED = (DONE, SKIPPED, ERROR, CANCELLED)
+
+
+def job_token(files, sheet_name, columns=None, digests=None):
+    """
+    Identitas satu set upload (isi + nama file) untuk sheet/kolom tertentu.
+    `digests`: hash isi tiap file bila sudah dihitung pemanggil.
+    """
+    if digests is None:
+        digests = [file_hash(f) for f in files]
+    return (
+        tuple((digest, f.name) for f, digest in zip(files, digests)),
+        sheet_name,
+        tuple(columns) if columns is not None else None,
+    )
+
+
+class IngestJob:
+    """
+    Parse sheet `sheet_name` dari beberapa upload di background. Hasil tiap file
+    masuk ke WorkbookCache begitu selesai, sehingga ExcelAnalyzer bisa memuat file
+    yang sudah siap (load inkremental) sementara sisanya masih diproses.
+
+    Tidak menyentuh Streamlit: UI cukup membaca `progress()` / `statuses()` dan
+    memanggil `cancel()` bila set upload berubah.
+    """
+
+    def __init__(self, files, sheet_name, columns=None, cache=None, workers=None, use_processes=True, digests=None):
+        self.files = list(files)
+        self.sheet_name = sheet_name
+        self.columns = columns
+        self.cache = cache if cache is not None else workbook_cache
+        self.workers = workers if workers is not None else default_workers()
+        self.use_processes = use_processes
+        self.token = job_token(self.files, sheet_name, columns, digests)
+        self.digests = [digest for digest, _ in self.token[0]]
+        self.started_at = None
+        self.finished_at = None
+        self._status = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+        # Cek flag cancel + submit atomik terhadap cancel(); terpisah dari _lock karena
+        # callback future yang dibatalkan shutdown() memanggil _set di thread yang sama
+        self._submit_lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._executor = None
+        self._thread = None
+
+    def start(self):
+        cols_key = tuple(self.columns) if self.columns is not None else None
+        pending = {}
+        for f, digest in zip(self.files, self.digests):
+            if digest in pending:
+                continue
+            if self.cache.is_ready(digest, self.sheet_name, cols_key):
+                self._status[digest] = DONE
+            else:
+                self._status[digest] = QUEUED
+                pending[digest] = f
+        self.started_at = time.time()
+        if not pending:
+            self._finish()
+            return self
+        self._thread = threading.Thread(target=self._run, args=(pending,), daemon=True, name='ingest-job')
+        self._thread.start()
+        return self
+
+    def _run(self, pending):
+        workers = max(1, min(self.workers, len(pending)))
+        use_processes = self.use_processes and workers > 1
+        executor_cls = process_pool if use_processes else ThreadPoolExecutor
+        try:
+            with executor_cls(max_workers=workers) as ex:
+                self._executor = ex
+                futures = []
+                for digest, f in pending.items():
+                    data = read_file_bytes(f)
+                    with self._submit_lock:
+                        if self._cancel.is_set():
+                            break
+                        fut = ex.submit(_parse_workbook_sheet, data, self.sheet_name)
+                    fut.add_done_callback(lambda fut, digest=digest: self._collect(digest, fut))
+                    futures.append(fut)
+                    self._set(digest, PARSING)
+                for fut in futures:
+                    if self._cancel.is_set():
+                        break
+                    try:
+                        fut.result()
+                    except Exception:
+                        pass
+        except Exception as e:
+            # Setelah cancel, error pool (mis. submit setelah shutdown) bukan kegagalan:
+            # _finish menandai sisa file CANCELLED
+            if self._cancel.is_set():
+                return
+            # Pool gagal: file yang belum selesai dibaca serial oleh load biasa
+            for digest in pending:
+                if self._status.get(digest) not in FINISHED:
+                    self._set(digest, ERROR, str(e))
+        finally:
+            self._executor = None
+            self._finish()
+
+    def _collect(self, digest, fut):
+        if fut.cancelled():
+            self._set(digest, CANCELLED)
+            return
+        try:
+            names, df = fut.result()
+        except Exception as e:
+            self._set(digest, ERROR, str(e))
+            return
+        # File yang sempat selesai tetap disimpan ke cache meski job dibatalkan
+        found = self.cache.store_parsed(digest, self.sheet_name, names, df, self.columns)
+        self._set(digest, DONE if found else SKIPPED)
+
+    def _set(self, digest, status, error=None):
+        with self._lock:
+            if self._status.get(digest) in FINISHED and status == PARSING:
+                return
+            self._status[digest] = status
+            if error:
+                self._errors[digest] = error
+
+    def _finish(self):
+        with self._lock:
+            for digest, status in self._status.items():
+                if status not in FINISHED:
+                    self._status[digest] = CANCELLED if self._cancel.is_set() else ERROR
+        self.finished_at = time.time()
+        self._done.set()
+
+    def cancel(self):
+        """
+        Hentikan job: file yang belum mulai dibatalkan; yang sedang di-parse dibiarkan selesai.
+        """
+        with self._submit_lock:
+            self._cancel.set()
+            ex = self._executor
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def statuses(self):
+        """
+        [(nama file, status, pesan error)] sesuai urutan upload.
+        """
+        with self._lock:
+            return [
+                (f.name, self._status.get(digest, QUEUED), self._errors.get(digest))
+                for f, digest in zip(self.files, self.digests)
+            ]
+
+    def progress(self):
+        """
+        (jumlah file selesai, total file unik).
+        """
+        with self._lock:
+            finished = sum(status in FINISHED for status in self._status.values())
+            return finished, len(self._status)
+
+    def ready_files(self):
+        """
+        Upload yang sheet-nya sudah bisa dimuat tanpa parsing (urutan upload tetap).
+        Setelah job selesai semua file dikembalikan, supaya file tanpa sheet / error
+        tetap dilaporkan lewat ExcelAnalyzer; setelah cancel hanya yang sempat selesai.
+        """
+        if self.done and not self.cancelled:
+            return list(self.files)
+        keep = (DONE, SKIPPED, ERROR) if self.done else (DONE,)
+        with self._lock:
+            return [f for f, digest in zip(self.files, self.digests) if self._status.get(digest) in keep]
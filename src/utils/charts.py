@@ -0,0 +1,115 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+
+CHART_BACKENDS = ('altair', 'matplotlib')
+
+
+def default_backend():
+    backend = os.environ.get('EVAL_CHART_BACKEND', 'altair').lower()
+    return backend if backend in CHART_BACKENDS else 'altair'
+
+
+def frame_digest(df):
+    """
+    Hash isi DataFrame kecil (mis. hasil grouping) untuk kunci memo chart.
+    """
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+    columns = '\x1f'.join(map(str, df.columns)).encode('utf-8')
+    return hashlib.blake2b(columns + hashed, digest_size=16).hexdigest()
+
+
+def _altair_spec(grouped, category_col, title):
+    import altair as alt
+
+    data = grouped[[category_col, 'Jumlah']].copy()
+    data[category_col] = data[category_col].astype(str)
+    base = alt.Chart(data).encode(
+        x=alt.X('Jumlah:Q', title='Jumlah', axis=alt.Axis(format='d')),
+        y=alt.Y(f'{category_col}:N', title=category_col, sort='-x'),
+    )
+    bars = base.mark_bar().encode(
+        color=alt.Color('Jumlah:Q', scale=alt.Scale(scheme='tealblues'), legend=None),
+        tooltip=[alt.Tooltip(f'{category_col}:N'), alt.Tooltip('Jumlah:Q', format=',d')],
+    )
+    labels = base.mark_text(align='left', dx=3, color='black').encode(text='Jumlah:Q')
+    chart = (bars + labels).properties(title=title, height=max(300, 24 * len(data)))
+    return chart.to_dict()
+
+
+def _matplotlib_png(grouped, category_col, title):
+    # Backend lama: matplotlib/seaborn baru di-import bila memang dipilih
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig = plt.figure(figsize=(10, 6))
+    barplot = sns.barplot(data=grouped, x='Jumlah', y=category_col, palette='mako')
+    plt.title(title)
+    plt.xlabel("Jumlah")
+    plt.ylabel(category_col)
+
+    plt.gca().xaxis.get_major_formatter().set_scientific(False)
+    plt.gca().xaxis.get_major_formatter().set_useOffset(False)
+    plt.gca().xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}'))
+
+    for i, value in enumerate(grouped['Jumlah']):
+        barplot.text(value + 0.5, i, str(value), color='black', va='center')
+
+    plt.tight_layout()
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """
+    Render bar chart Top-N dengan backend yang bisa dipilih ('altair' = spec
+    Vega-Lite, 'matplotlib' = PNG lama). Hasil render dimemo per
+    (backend, hash data, judul, top_n) sehingga rerun dengan data sama tidak
+    menggambar ulang.
+    """
+
+    def __init__(self, backend=None, max_entries=64):
+        self.backend = backend or default_backend()
+        self.max_entries = max_entries
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, grouped, category_col, title, top_n):
+        """
+        Return hasil render (dict spec Vega-Lite atau bytes PNG) tanpa menampilkannya.
+        """
+        key = (self.backend, frame_digest(grouped), category_col, title, top_n)
+        with self._lock:
+            rendered = self._memo.get(key)
+            if rendered is not None:
+                self._memo.move_to_end(key)
+        if rendered is None:
+            if self.backend == 'matplotlib':
+                rendered = _matplotlib_png(grouped, category_col, title)
+            else:
+                rendered = _altair_spec(grouped, category_col, title)
+            with self._lock:
+                self._memo[key] = rendered
+                while len(self._memo) > self.max_entries:
+                    self._memo.popitem(last=False)
+        return rendered
+
+    def render(self, grouped, category_col, title, top_n):
+        import streamlit as st
+
+        rendered = self.build(grouped, category_col, title, top_n)
+        if self.backend == 'matplotlib':
+            st.image(rendered, use_container_width=True)
+        else:
+            st.vega_lite_chart(rendered, use_container_width=True)
+
+
+chart_renderer = ChartRenderer()
@@ -0,0 +1,210 @@
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+INTERVAL_METHODS = ('wilson', 'clopper-pearson')
+
+# Metrik proporsi: nama -> (kolom pembilang, kolom penyebut)
+PROPORTIONS = {
+    'Accuracy': (('TP', 'TN'), ('TP', 'TN', 'FP', 'FN')),
+    'Specificity': (('TN',), ('TN', 'FP')),
+    'Recall': (('TP',), ('TP', 'FN')),
+    'Precision': (('TP',), ('TP', 'FP')),
+}
+
+_lgamma = np.vectorize(math.lgamma, otypes=[float])
+
+
+def wilson_interval(k, n, confidence=0.95):
+    """
+    Interval skor Wilson untuk proporsi k/n (vektor). n = 0 -> NaN.
+    """
+    k = np.asarray(k, dtype='float64')
+    n = np.asarray(n, dtype='float64')
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = k / n
+        denom = 1 + z ** 2 / n
+        center = (p + z ** 2 / (2 * n)) / denom
+        half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+    low = np.where(n > 0, np.clip(center - half, 0, 1), np.nan)
+    high = np.where(n > 0, np.clip(center + half, 0, 1), np.nan)
+    return low, high
+
+
+def _betacf(a, b, x, iterations=200, eps=1e-14):
+    # Continued fraction incomplete beta (Lentz), vektor; lihat Numerical Recipes 6.4
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = np.ones_like(x)
+    d = 1 - qab * x / qap
+    d = np.where(np.abs(d) < tiny, tiny, d)
+    d = 1 / d
+    h = d.copy()
+    for m in range(1, iterations + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = np.where(np.abs(d) < tiny, tiny, d)
+        c = 1 + aa / c
+        c = np.where(np.abs(c) < tiny, tiny, c)
+        d = 1 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = np.where(np.abs(d) < tiny, tiny, d)
+        c = 1 + aa / c
+        c = np.where(np.abs(c) < tiny, tiny, c)
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if np.all(np.abs(delta - 1) < eps):
+            break
+    return h
+
+
+def _betainc(a, b, x, log_beta):
+    """
+    Regularized incomplete beta I_x(a, b), vektor untuk a, b > 0 dan 0 < x < 1.
+    """
+    front = np.exp(a * np.log(x) + b * np.log1p(-x) - log_beta)
+    swap = x > (a + 1) / (a + b + 2)
+    xs = np.where(swap, 1 - x, x)
+    aa = np.where(swap, b, a)
+    bb = np.where(swap, a, b)
+    cf = _betacf(aa, bb, xs)
+    return np.where(swap, 1 - front * cf / b, front * cf / a)
+
+
+def _beta_ppf(q, a, b, iterations=45):
+    # Kuantil Beta lewat bisection (I_x monoton naik di x); 45 iterasi ~ presisi 3e-14
+    log_beta = _lgamma(a) + _lgamma(b) - _lgamma(a + b)
+    lo = np.zeros_like(a)
+    hi = np.ones_like(a)
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        below = _betainc(a, b, mid, log_beta) < q
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return (lo + hi) / 2
+
+
+def clopper_pearson_interval(k, n, confidence=0.95):
+    """
+    Interval eksak Clopper-Pearson (kuantil Beta) untuk proporsi k/n (vektor).
+    k = 0 -> batas bawah 0, k = n -> batas atas 1, n = 0 -> NaN.
+    """
+    k = np.asarray(k, dtype='float64')
+    n = np.asarray(n, dtype='float64')
+    alpha = 1 - confidence
+    low = np.full(k.shape, np.nan)
+    high = np.full(k.shape, np.nan)
+    valid = n > 0
+    low[valid & (k == 0)] = 0.0
+    high[valid & (k == n)] = 1.0
+
+    need_low = valid & (k > 0)
+    if need_low.any():
+        kk, nn = k[need_low], n[need_low]
+        low[need_low] = _beta_ppf(np.full(kk.shape, alpha / 2), kk, nn - kk + 1)
+    need_high = valid & (k < n)
+    if need_high.any():
+        kk, nn = k[need_high], n[need_high]
+        high[need_high] = _beta_ppf(np.full(kk.shape, 1 - alpha / 2), kk + 1, nn - kk)
+    return low, high
+
+
+def bootstrap_f1_interval(tp, fp, fn, tn, n_boot=1000, confidence=0.95, seed=0, max_block_bytes=64 * 1024 * 1024):
+    """
+    Interval persentil bootstrap F1 per baris: counts tiap Key di-resample sebagai
+    draw multinomial (n = total, p = proporsi TP/FP/FN/TN), semua Key dan resample
+    sekaligus dalam blok array NumPy. F1 hanya bergantung pada TP dan FP + FN, jadi
+    multinomial cukup diurai jadi dua binomial berurutan: TP, lalu FP + FN dari sisanya.
+    Konvensinya sama dengan F1 di tabel metrik: F1 tidak terdefinisi (NaN) bila
+    TP = 0, baik untuk Key itu sendiri maupun untuk resample-nya.
+    """
+    counts = np.column_stack([tp, fp, fn, tn]).astype('int64')
+    n = counts.sum(axis=1)
+    low = np.full(len(counts), np.nan)
+    high = np.full(len(counts), np.nan)
+    valid = np.flatnonzero(counts[:, 0] > 0)
+    if not len(valid) or n_boot <= 0:
+        return low, high
+
+    rng = np.random.default_rng(seed)
+    q = ((1 - confidence) / 2 * 100, (1 + confidence) / 2 * 100)
+    # Batasi memori per blok: beberapa array n_boot x blok int64/float64
+    block = max(1, max_block_bytes // (n_boot * 4 * 8))
+    for start in range(0, len(valid), block):
+        rows = valid[start:start + block]
+        total = n[rows]
+        p = counts[rows] / total[:, None]
+        shape = (n_boot, len(rows))
+        b_tp = rng.binomial(total, p[:, 0], size=shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_err = np.nan_to_num((p[:, 1] + p[:, 2]) / (1 - p[:, 0])).clip(0, 1)
+            b_err = rng.binomial(total - b_tp, p_err, size=shape)
+            f1 = np.where(b_tp > 0, 2 * b_tp / (2 * b_tp + b_err), np.nan)
+        low[rows], high[rows] = _nan_quantiles(f1, q)
+    return low, high
+
+
+def _nan_quantiles(values, q):
+    # np.nanpercentile per kolom, tapi cukup satu sort (NaN di akhir) + interpolasi linear
+    ordered = np.sort(values, axis=0)
+    n_valid = (~np.isnan(ordered)).sum(axis=0)
+    out = []
+    for pct in q:
+        pos = (n_valid - 1).clip(0) * pct / 100
+        lo = np.floor(pos).astype('int64')
+        hi = np.minimum(lo + 1, (n_valid - 1).clip(0))
+        a = np.take_along_axis(ordered, lo[None], axis=0)[0]
+        b = np.take_along_axis(ordered, hi[None], axis=0)[0]
+        out.append(np.where(n_valid > 0, a + (b - a) * (pos - lo), np.nan))
+    return out
+
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def confusion_intervals(counts, method='wilson', confidence=0.95, n_boot=0, seed=0, max_entries=32):
+    """
+    Kolom `<Metrik> Low` / `<Metrik> High` untuk DataFrame berkolom TP/TN/FP/FN:
+    Accuracy, Specificity, Recall dan Precision dengan `method` ('wilson' atau
+    'clopper-pearson'), plus F1 Score dari bootstrap bila `n_boot` > 0.
+    Hasil dimemo per isi counts + parameter (bootstrap deterministik per `seed`).
+    """
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"Metode interval tidak dikenal: {method!r} (pilih {', '.join(INTERVAL_METHODS)})")
+    values = counts[['TP', 'TN', 'FP', 'FN']].to_numpy(dtype='int64')
+    digest = hashlib.blake2b(np.ascontiguousarray(values).tobytes(), digest_size=16).hexdigest()
+    key = (digest, values.shape, method, confidence, n_boot, seed)
+    with _memo_lock:
+        cached = _memo.get(key)
+        if cached is not None:
+            _memo.move_to_end(key)
+            return cached.set_axis(counts.index)
+
+    cols = dict(zip(['TP', 'TN', 'FP', 'FN'], values.T))
+    interval = wilson_interval if method == 'wilson' else clopper_pearson_interval
+    out = {}
+    for name, (num, den) in PROPORTIONS.items():
+        k = sum(cols[c] for c in num)
+        n = sum(cols[c] for c in den)
+        out[f'{name} Low'], out[f'{name} High'] = interval(k, n, confidence)
+    if n_boot > 0:
+        out['F1 Score Low'], out['F1 Score High'] = bootstrap_f1_interval(
+            cols['TP'], cols['FP'], cols['FN'], cols['TN'], n_boot=n_boot, confidence=confidence, seed=seed
+        )
+    result = pd.DataFrame(out, index=counts.index)
+    with _memo_lock:
+        _memo[key] = result
+        while len(_memo) > max_entries:
+            _memo.popitem(last=False)
+    return result.copy()
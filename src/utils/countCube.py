@@ -0,0 +1,54 @@
+from utils.filterIndex import FilterIndex
+
+
+class CountCube:
+    """
+    Cube jumlah baris (sparse) per kombinasi dimensi, mis.
+    verifikasi x Key x Type x kategori x Refinement Parameter.
+    Setiap kombinasi filter dijawab dengan menjumlah sel cube, sehingga biayanya
+    bergantung pada jumlah sel, bukan jumlah baris mentah.
+    Bila `weight` diberikan, tiap baris `df` mewakili sejumlah baris mentah
+    (mis. tabel sel hasil streaming) dan yang dijumlah adalah kolom tsb.
+    """
+
+    def __init__(self, df, dims, measure='Jumlah', weight=None):
+        self.df = df
+        self.dims = list(dict.fromkeys(d for d in dims if d in df.columns))
+        self.measure = measure
+        # dropna=False: sel NaN tetap disimpan agar semantik isin/value_counts sama persis
+        grouped = df.groupby(self.dims, observed=True, dropna=False)
+        sizes = grouped[weight].sum() if weight else grouped.size()
+        self.cells = sizes.reset_index(name=measure)
+        self.index = FilterIndex(self.cells, self.dims)
+
+    @classmethod
+    def from_cells(cls, cells, dims, measure='Jumlah'):
+        """
+        Cube dari tabel sel yang sudah jadi (mis. dari snapshot), tanpa groupby ulang.
+        """
+        cube = cls.__new__(cls)
+        cube.df = None
+        cube.dims = list(dims)
+        cube.measure = measure
+        cube.cells = cells
+        cube.index = FilterIndex(cells, cube.dims)
+        return cube
+
+    def slice(self, filters):
+        """
+        Sel cube yang lolos `filters` ({dimensi: daftar nilai}).
+        """
+        positions = self.index.select(filters)
+        if positions is None:
+            return self.cells
+        return self.cells.take(positions)
+
+    def rollup(self, by, filters=None, cells=None):
+        """
+        Jumlah per `by` (kolom atau list kolom) setelah filter, terurut menurun.
+        Grup dengan nilai NaN dibuang seperti groupby/value_counts default.
+        """
+        cells = self.slice(filters or {}) if cells is None else cells
+        totals = cells.groupby(by, observed=True)[self.measure].sum()
+        totals = totals[totals > 0].sort_values(ascending=False, kind='stable')
+        return totals.reset_index()
@@ -0,0 +1,101 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class SharedDataset:
+    """
+    Dataset gabungan yang dipakai bersama oleh banyak session (read-only).
+    Session tidak boleh mengubah `df` in-place; bila perlu modifikasi, salin dulu
+    (copy-on-write). Turunan mahal seperti count cube ikut disimpan di sini.
+    """
+
+    def __init__(self, key, df, memory_report=None):
+        self.key = key
+        self.df = df
+        self.memory_report = memory_report
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def derived(self, name, build_fn):
+        """
+        Ambil/buat objek turunan (mis. cube per kolom kategori) sekali per dataset.
+        """
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build_fn()
+            return self._derived[name]
+
+
+class ViewCache:
+    """
+    LRU terbatas untuk hasil turunan yang bergantung pada state filter
+    (mis. ranking filter_and_group). Disimpan per dataset sehingga kunci cukup
+    berisi filter yang sudah dinormalisasi.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, key, build_fn):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = build_fn()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DatasetRegistry:
+    """
+    Registry dataset per kunci isi (hash file + opsi load). Entri disimpan sebagai
+    weak reference: dataset otomatis dilepas setelah tidak ada session yang memakai,
+    sehingga memori mengikuti jumlah dataset unik, bukan jumlah session.
+    """
+
+    def __init__(self):
+        self._datasets = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._building = {}
+
+    def get_or_create(self, key, build_fn):
+        """
+        `build_fn()` -> (df, memory_report). Session lain yang meminta kunci yang
+        sama saat dataset sedang dibangun akan menunggu, bukan membangun ulang.
+        """
+        with self._lock:
+            dataset = self._datasets.get(key)
+            if dataset is not None:
+                return dataset
+            key_lock = self._building.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                dataset = self._datasets.get(key)
+            if dataset is None:
+                df, memory_report = build_fn()
+                dataset = SharedDataset(key, df, memory_report)
+                with self._lock:
+                    self._datasets[key] = dataset
+        with self._lock:
+            self._building.pop(key, None)
+        return dataset
+
+    def __len__(self):
+        return len(self._datasets)
+
+
+dataset_registry = DatasetRegistry()
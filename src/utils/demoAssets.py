@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEMO_URL = "https://huggingface.co/datasets/naufalnashif/assets-rfojk/resolve/main/RFOJK20250524_df_joined_demo.xlsx"
+DEMO_FILENAME = "RFOJK20250524_df_joined_demo.xlsx"
+
+logger = logging.getLogger('eval_genai.demo')
+
+
+def _default_cache_dir():
+    return os.environ.get(
+        'EVAL_DEMO_CACHE_DIR',
+        os.path.join(tempfile.gettempdir(), 'eval-genai-demo')
+    )
+
+
+class DemoAssetManager:
+    """
+    Ambil file demo sekali, simpan di disk, dan revalidasi ke server hanya bila
+    salinan lokal lebih tua dari `max_age` detik (pakai ETag / Last-Modified).
+    Bila jaringan gagal, salinan lokal tetap dipakai.
+
+    `source` bisa berupa URL http(s) (mis. server lokal untuk testing) atau path
+    file lokal; default dari env `EVAL_DEMO_SOURCE`, lalu DEMO_URL.
+    """
+
+    def __init__(self, source=None, filename=DEMO_FILENAME, cache_dir=None,
+                 timeout=(5, 30), max_age=3600, session=None):
+        self.source = source or os.environ.get('EVAL_DEMO_SOURCE') or DEMO_URL
+        self.filename = filename
+        self.cache_dir = cache_dir or _default_cache_dir()
+        self.timeout = timeout
+        self.max_age = max_age
+        self.session = session or self._make_session()
+        self._lock = threading.Lock()
+        self._data = None
+        self._checked_at = 0.0
+
+    @staticmethod
+    def _make_session():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @property
+    def _data_path(self):
+        return os.path.join(self.cache_dir, self.filename)
+
+    @property
+    def _meta_path(self):
+        return self._data_path + '.meta.json'
+
+    def _is_remote(self):
+        return self.source.startswith(('http://', 'https://'))
+
+    def _read_cached(self):
+        try:
+            with open(self._data_path, 'rb') as fh:
+                data = fh.read()
+            with open(self._meta_path, encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None, {}
+        return data, meta
+
+    def _write_cached(self, data, meta):
+        """
+        Tulis salinan + metadata lewat file sementara unik lalu os.replace, jadi proses
+        lain yang menulis bersamaan tidak berbagi file .tmp. Gagal tulis (disk penuh,
+        folder read-only) hanya dicatat: data yang sudah diunduh tetap dipakai.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for path, payload in (
+                (self._data_path, data),
+                (self._meta_path, json.dumps(meta).encode('utf-8')),
+            ):
+                tmp_path = None
+                try:
+                    with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix='.tmp', delete=False) as fh:
+                        tmp_path = fh.name
+                        fh.write(payload)
+                    os.replace(tmp_path, path)
+                finally:
+                    if tmp_path is not None and os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+        except OSError as e:
+            logger.warning("Gagal menyimpan cache demo di %s: %s", self.cache_dir, e)
+
+    def _revalidate(self, cached, meta):
+        headers = {}
+        if cached is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        response = self.session.get(self.source, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached is not None:
+            meta['checked_at'] = time.time()
+            self._write_cached(cached, meta)
+            return cached, 'cache (not modified)'
+        response.raise_for_status()
+        meta = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'checked_at': time.time(),
+        }
+        self._write_cached(response.content, meta)
+        return response.content, 'network'
+
+    def fetch_bytes(self):
+        """
+        Return (bytes, sumber) dengan sumber salah satu dari 'memory', 'local',
+        'cache', 'cache (not modified)', 'cache (offline)' atau 'network'.
+        """
+        with self._lock:
+            now = time.time()
+            if self._data is not None and now - self._checked_at < self.max_age:
+                return self._data, 'memory'
+
+            if not self._is_remote():
+                with open(self.source, 'rb') as fh:
+                    data, label = fh.read(), 'local'
+            else:
+                cached, meta = self._read_cached()
+                if cached is not None and now - meta.get('checked_at', 0) < self.max_age:
+                    data, label = cached, 'cache'
+                else:
+                    try:
+                        data, label = self._revalidate(cached, meta)
+                    except requests.RequestException:
+                        if cached is None:
+                            raise
+                        data, label = cached, 'cache (offline)'
+
+            self._data = data
+            self._checked_at = now
+            return data, label
+
+    def fetch(self):
+        """
+        Return (file-like BytesIO bernama seperti upload, sumber data).
+        """
+        data, label = self.fetch_bytes()
+        demo_file = BytesIO(data)
+        demo_file.name = self.filename
+        return demo_file, label
+
+
+# Dipakai bersama oleh semua session supaya koneksi & salinan demo tidak diunduh ulang
+demo_assets = DemoAssetManager()
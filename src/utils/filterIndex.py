@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """
+    Inverted index per kolom filter: nilai -> posisi baris (array int terurut).
+    Dibangun sekali per dataset; filter multiselect lalu cukup union/intersect
+    array posisi, tanpa membuat boolean mask sepanjang seluruh DataFrame.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.n_rows = len(df)
+        self._postings = {}  # kolom -> {nilai: posisi}
+        self._has_na = {}    # kolom -> ada baris NaN (tidak pernah lolos isin)
+        for col in columns:
+            if col in df.columns:
+                self._postings[col], self._has_na[col] = self._build(df[col])
+
+    @staticmethod
+    def _build(series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        pos_dtype = np.int32 if len(codes) < 2 ** 31 else np.int64
+        # argsort stabil -> posisi di dalam tiap nilai tetap terurut naik
+        order = np.argsort(codes, kind='stable').astype(pos_dtype)
+        n_na = int((codes < 0).sum())
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        bounds = n_na + np.concatenate([[0], np.cumsum(counts)])
+        postings = {
+            uniques[i]: order[bounds[i]:bounds[i + 1]]
+            for i in range(len(uniques)) if counts[i]
+        }
+        return postings, n_na > 0
+
+    def positions(self, col, values):
+        postings = self._postings[col]
+        arrays = [postings[v] for v in set(values) if v in postings]
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        if len(arrays) == 1:
+            return arrays[0]
+        # Posting antar nilai tidak pernah beririsan, cukup digabung lalu diurutkan
+        return np.sort(np.concatenate(arrays))
+
+    def select(self, filters):
+        """
+        `filters`: {kolom: daftar nilai}. Semantik sama dengan rangkaian `isin`.
+        Return array posisi baris, atau None bila tidak ada filter yang membatasi.
+        """
+        selected = []
+        for col, values in filters.items():
+            if col not in self._postings:
+                continue
+            postings = self._postings[col]
+            if not self._has_na[col] and set(postings).issubset(values):
+                continue  # semua nilai dipilih -> tidak membatasi
+            selected.append(self.positions(col, values))
+        if not selected:
+            return None
+        selected.sort(key=len)
+        result = selected[0]
+        for pos in selected[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, pos, assume_unique=True)
+        return result
@@ -1,11 +1,42 @@
+import json
+import os
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import streamlit as st
-from datetime import datetime
+from utils.workbookCache import workbook_cache, file_hash, default_workers
+from utils.countCube import CountCube
+from utils.datasetRegistry import ViewCache, dataset_registry
+from utils.streamingReader import WEIGHT_COL, aggregate_sheet_stream
+from utils.charts import ChartRenderer, chart_renderer
+from utils.profiler import profiled, timed
+from utils.confidence import confusion_intervals
+from utils.snapshotBundle import SnapshotBundle
+from utils.runComparison import FLIP_COLUMNS, OUTCOMES, RunRows, correctness_flips, flip_counts, mcnemar
+
+# Label hasil verifikasi pengawas -> singkatan kolom confusion matrix
+CONFUSION_LABELS = {
+    'TP': 'True Positive',
+    'TN': 'True Negative',
+    'FP': 'False Positive',
+    'FN': 'False Negative',
+}
+
+def streamlit_warning(message):
+    # Streamlit di-import di sini supaya modul analitik bisa dipakai tanpa UI (mis. CLI)
+    import streamlit as st
+    st.warning(message)
+
+
+def __getattr__(name):
+    # Re-export lama `from utils.myFunc import UIComponents` tetap jalan, tapi
+    # Streamlit baru di-import saat atribut itu benar-benar diminta
+    if name == 'UIComponents':
+        from utils.uiComponents import UIComponents
+        return UIComponents
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class ExcelAnalyzer:
-    def __init__(self):
+    def __init__(self, cache=None, workers=None, use_processes=True, chart_backend=None, warn=None):
         # Ubah jika kolom di file Excel Anda adalah 'Verifikasi Pengawas'
         self.verif_col = 'Verivikasi Pengawas'  
         self.key_col = 'Key'  
@@ -18,382 +49,729 @@ class ExcelAnalyzer:
         # self.selected_year = None
         self.selected_type = []
         self.top_n = 10
+        # Callback peringatan per file; default st.warning, CLI/batch bisa pakai logging
+        self.warn = warn or streamlit_warning
+        # Kolom yang boleh dipakai sebagai Y-Bar di tab Analytics
+        self.allowed_cat_cols = ['Key', 'Type', 'Bab', 'Emiten']
+        # Cache parsing workbook dipakai bersama lintas rerun/session (lihat workbookCache)
+        self.cache = cache if cache is not None else workbook_cache
+        # Jumlah worker untuk parsing paralel beberapa file sekaligus (1 = serial)
+        self.workers = workers if workers is not None else default_workers()
+        self.use_processes = use_processes
+        # Backend chart: 'altair' (default) atau 'matplotlib' (lama); lihat utils.charts
+        self.charts = ChartRenderer(chart_backend) if chart_backend else chart_renderer
+        # Ringkasan memori sebelum/sesudah compact_dtypes pada load terakhir
+        self.memory_report = None
+        # Upload dengan total ukuran di atas ambang ini dibaca secara streaming
+        self.stream_threshold_bytes = int(os.environ.get('EVAL_STREAM_THRESHOLD_MB', '100')) * 1024 * 1024
+        self._stream_key = None
+        self._stream_load = None
+        # State load inkremental: bagian per file + agregat confusion per file
+        self._load_state = None
+        self.reset_loaded()
+        # Turunan dataset (cube, opsi filter, hasil filter_and_group) bila df tidak dari registry
+        self._local_df = None
+        self._local_derived = {}
+        # Jumlah kombinasi filter yang hasil filter_and_group-nya disimpan per dataset
+        self.view_cache_size = int(os.environ.get('EVAL_VIEW_CACHE_SIZE', '32'))
+        # RunProfiler rerun aktif (utils.profiler); None = instrumentasi mati
+        self.profiler = None
+
+    def file_digests(self, files):
+        """
+        Hash isi tiap file, cukup sekali per rerun; hasilnya diteruskan lewat
+        `digests=` ke get_all_sheet_names, sheet_rows, load_* dan IngestJob.
+        """
+        return [file_hash(f) for f in files]
 
-    def get_all_sheet_names(self, files):
+    @timed('get_all_sheet_names')
+    def get_all_sheet_names(self, files, digests=None):
         sheets = set()
-        for f in files:
+        for f, digest in zip(files, digests or [None] * len(files)):
             try:
-                xls = pd.ExcelFile(f)
-                sheets.update(xls.sheet_names)
+                sheets.update(self.cache.sheet_names(f, digest=digest))
             except Exception as e:
-                st.warning(f"Gagal baca file {f.name}: {e}")
+                self.warn(f"Gagal baca file {f.name}: {e}")
         return sorted(list(sheets))
 
-    def load_and_concat_sheets(self, files, sheet_name):
-        dfs = []
-        for f in files:
+    def sheet_rows(self, files, sheet_name, digests=None):
+        """
+        Jumlah baris data `sheet_name` per nama file, dibaca dari metadata workbook
+        (tanpa parsing). None bila sheet tidak ada / jumlahnya tidak diketahui.
+        """
+        rows = {}
+        for f, digest in zip(files, digests or [None] * len(files)):
+            try:
+                info = {i['name']: i for i in self.cache.sheet_info(f, digest=digest)}.get(sheet_name)
+            except Exception:
+                info = None
+            rows[f.name] = info['rows'] - 1 if info and info['rows'] else None
+        return rows
+
+    def sheet_columns(self, files, sheet_name, digests=None):
+        """
+        Gabungan nama kolom header `sheet_name` di semua file (urutan kemunculan),
+        dari metadata workbook tanpa parsing isi.
+        """
+        cols = {}
+        for f, digest in zip(files, digests or [None] * len(files)):
+            try:
+                info = {i['name']: i for i in self.cache.sheet_info(f, digest=digest)}.get(sheet_name)
+            except Exception:
+                info = None
+            for c in (info or {}).get('header') or []:
+                if isinstance(c, str) and c:
+                    cols.setdefault(c, None)
+        return list(cols)
+
+    def analysis_columns(self, extra=None):
+        """
+        Kolom minimum yang dipakai dashboard; cukup ini yang dibaca dari store Parquet.
+        `extra`: kolom tambahan yang diminta UI (mis. kolom run untuk Run Comparison).
+        """
+        cols = [self.verif_col, self.key_col, self.type_col, 'Refinement Parameter']
+        cols += [c for c in self.allowed_cat_cols if c not in cols]
+        return cols + [c for c in extra or [] if c not in cols]
+
+    @timed('load_and_concat_sheets')
+    def load_and_concat_sheets(self, files, sheet_name, columns=None, workers=None, compact=True, digests=None):
+        """
+        Gabungkan sheet `sheet_name` dari semua file secara inkremental: file yang sudah
+        pernah dimuat (berdasarkan hash isi) tidak dibaca ulang, file baru saja yang
+        di-parse, dan file yang hilang dari upload dikeluarkan. Agregat TP/TN/FP/FN
+        ikut ditambah/dikurangi per file sehingga tidak perlu dihitung ulang penuh.
+        `digests` (opsional): hash isi tiap file dari file_digests.
+        """
+        workers = self.workers if workers is None else workers
+        load_state = (sheet_name, tuple(columns) if columns is not None else None, compact)
+        if load_state != self._load_state:
+            self.reset_loaded()
+            self._load_state = load_state
+        # Hasil streaming sebelumnya tidak lagi aktif
+        self._stream_key = None
+
+        # part_id = (hash isi, nama file, urutan duplikat) -> urutan concat mengikuti `files`
+        part_ids = []
+        seen = {}
+        for i, f in enumerate(files):
             try:
-                xls = pd.ExcelFile(f)
-                if sheet_name in xls.sheet_names:
-                    df = pd.read_excel(xls, sheet_name=sheet_name)
-                    df['filename'] = f.name  # Tambahkan kolom nama file
-                    dfs.append(df)
-                else:
-                    st.warning(f"File {f.name} tidak punya sheet '{sheet_name}', dilewati.")
+                digest = digests[i] if digests is not None else file_hash(f)
             except Exception as e:
-                st.warning(f"Gagal baca sheet '{sheet_name}' di file {f.name}: {e}")
-        if not dfs:
+                part_ids.append(None)
+                self.warn(f"Gagal baca sheet '{sheet_name}' di file {f.name}: {e}")
+                continue
+            n = seen.get((digest, f.name), 0)
+            seen[(digest, f.name)] = n + 1
+            part_ids.append((digest, f.name, n))
+
+        current = set(pid for pid in part_ids if pid is not None)
+        changed = False
+        for pid in list(self._parts):
+            if pid not in current:
+                self._remove_part(pid)
+                changed = True
+        for pid in list(self._skipped):
+            if pid not in current:
+                del self._skipped[pid]
+
+        new_files = [
+            (f, pid) for f, pid in zip(files, part_ids)
+            if pid is not None and pid not in self._parts and pid not in self._skipped
+        ]
+        # Parse paralel file yang belum pernah dibaca
+        with profiled(self.profiler, 'parse', files=len(new_files)):
+            if workers > 1 and len(new_files) > 1:
+                self.cache.prefetch(
+                    [(f, pid[0]) for f, pid in new_files],
+                    sheet_name, columns=columns, workers=workers,
+                    use_processes=self.use_processes
+                )
+            for f, pid in new_files:
+                try:
+                    if sheet_name in self.cache.sheet_names(f, digest=pid[0]):
+                        df = self.cache.read_sheet(f, sheet_name, digest=pid[0], columns=columns)
+                        df['filename'] = f.name  # Tambahkan kolom nama file
+                        self._add_part(pid, df)
+                        changed = True
+                    else:
+                        self._skipped[pid] = f"File {f.name} tidak punya sheet '{sheet_name}', dilewati."
+                except Exception as e:
+                    self._skipped[pid] = f"Gagal baca sheet '{sheet_name}' di file {f.name}: {e}"
+
+        # Peringatan per file tetap tampil di setiap rerun, sesuai urutan upload
+        for pid in part_ids:
+            if pid in self._skipped:
+                self.warn(self._skipped[pid])
+
+        if not self._parts:
+            self._combined = None
             return None
-        combined_df = pd.concat(dfs, ignore_index=True, sort=True)
-        return combined_df
+        if changed or self._combined is None:
+            present = tuple(pid for pid in part_ids if pid in self._parts)
+
+            def build():
+                dfs = [self._parts[pid] for pid in present]
+                with profiled(self.profiler, 'concat', parts=len(dfs)):
+                    combined_df = pd.concat(dfs, ignore_index=True, sort=True)
+                if not compact:
+                    return combined_df, None
+                with profiled(self.profiler, 'compact_dtypes'):
+                    return compact_dtypes(combined_df, category_cols=self.compact_cols())
+
+            # Dataset gabungan dipakai bersama oleh session lain dengan upload yang sama
+            self._use_shared(dataset_registry.get_or_create(('sheets', load_state, present), build))
+        return self._combined
+
+    @timed('load_snapshot')
+    def load_snapshot(self, f, digest=None):
+        """
+        Buka bundle snapshot (lihat utils.snapshotBundle) sebagai dataset aktif:
+        tidak ada parsing Excel maupun agregasi ulang. Agregat confusion, opsi filter
+        dan count cube dari bundle langsung dipakai sebagai turunan dataset.
+        ValueError bila file bukan snapshot yang valid.
+        """
+        loaded = {}
+
+        def build():
+            with profiled(self.profiler, 'parse', snapshot=True):
+                loaded['bundle'] = bundle = SnapshotBundle.from_bytes(f.getvalue())
+            return bundle.df, bundle.memory_report
+
+        shared = dataset_registry.get_or_create(('snapshot', digest or file_hash(f)), build)
+        bundle = loaded.get('bundle')
+        if bundle is not None:
+            shared.derived('confusion_counts', lambda: bundle.counts)
+            shared.derived('filter_options', lambda: bundle.options)
+            for col, cube in bundle.cubes.items():
+                shared.derived(('cube', col), lambda cube=cube: cube)
+            shared.derived('snapshot_meta', lambda: bundle.meta)
+
+        self.reset_loaded()
+        self._load_state = None
+        self._stream_key = None
+        self._use_shared(shared)
+        self._counts = shared.derived('confusion_counts', lambda: self.confusion_counts(shared.df))
+        self.snapshot_meta = shared.derived('snapshot_meta', dict)
+        return shared.df
+
+    def export_snapshot(self, meta=None):
+        """
+        Bytes bundle snapshot untuk dataset aktif: dataset compact, agregat confusion
+        per (Key, filename), opsi filter dan count cube tiap kolom Y-Bar. Dibuat sekali
+        per dataset.
+        """
+        # Turunan (cube, opsi) diambil di luar build: SharedDataset.derived tidak reentrant
+        cubes = {
+            col: self.count_cube(col)
+            for col in self.allowed_cat_cols if col in self.df.columns
+        }
+        counts, options = self.confusion_counts(), self.filter_options()
+
+        def build():
+            return SnapshotBundle(
+                self.df, counts, options, cubes, meta=meta, memory_report=self.memory_report
+            ).to_bytes()
+        return self._derived(('snapshot_bytes', json.dumps(meta, sort_keys=True, default=str)), build)
+
+    def _use_shared(self, shared):
+        self._shared = shared
+        self._combined = shared.df
+        self.memory_report = shared.memory_report
+
+    def _add_part(self, pid, df):
+        self._parts[pid] = df
+        # Kolom yang tidak ada di file ini bernilai NaN, sama seperti hasil concat,
+        # supaya file tanpa Key/verifikasi tetap masuk agregat per file
+        missing = [c for c in (self.key_col, self.verif_col) if c not in df.columns]
+        part = df.assign(**{c: np.nan for c in missing}) if missing else df
+        self._partials[pid] = self.confusion_counts(part)
+        self._counts = merge_counts(self._counts, self._partials[pid])
+
+    def _remove_part(self, pid):
+        del self._parts[pid]
+        partial = self._partials.pop(pid, None)
+        if partial is not None:
+            self._counts = merge_counts(self._counts, partial, sign=-1)
+
+    def reset_loaded(self):
+        """
+        Lupakan semua file yang sudah dimuat (cache parsing tidak ikut dihapus).
+        """
+        self._parts = {}
+        self._partials = {}
+        self._skipped = {}
+        self._counts = None
+        self._combined = None
+        self._shared = None
+        # Metadata bundle snapshot yang sedang dibuka (None bila data dari workbook)
+        self.snapshot_meta = None
+
+    def should_stream(self, files):
+        total = 0
+        for f in files:
+            total += getattr(f, 'size', None) or len(f.getvalue())
+        return total > self.stream_threshold_bytes
+
+    def cell_dims(self):
+        """
+        Dimensi tabel sel hasil streaming: semua kolom yang dibutuhkan tab Statistik
+        dan Analytics, tanpa `filename` (ditambahkan per upload).
+        """
+        dims = [self.verif_col, self.key_col, self.type_col]
+        dims += [c for c in self.allowed_cat_cols if c not in dims]
+        return dims + ['Refinement Parameter']
+
+    @timed('load_streaming')
+    def load_streaming(self, files, sheet_name, chunk_rows=50_000, digests=None):
+        """
+        Jalur untuk workbook sangat besar: sheet dibaca per chunk baris (openpyxl
+        read-only) dan langsung diringkas menjadi tabel sel berbobot (kolom
+        WEIGHT_COL = jumlah baris). Hasilnya dipakai sebagai `self.df` oleh
+        calculate_confusion_stats dan filter_and_group; memori tidak bergantung
+        pada jumlah baris file.
+        """
+        dims = self.cell_dims()
+        digests = self.file_digests(files) if digests is None else list(digests)
+        stream_key = (tuple(digests), tuple(f.name for f in files), sheet_name, chunk_rows)
+        if stream_key == self._stream_key:
+            combined_df, warnings = self._stream_load
+            for msg in warnings:
+                self.warn(msg)
+            return combined_df
+
+        # Lepas state load inkremental/snapshot: agregatnya milik dataset lain
+        self.reset_loaded()
+        self._load_state = None
+        self._stream_key = None
+        parts = []
+        warnings = []
+        cache_sheet = ('cells', sheet_name)
+        for f, digest in zip(files, digests):
+            cells = self.cache.get(digest, cache_sheet, columns=tuple(dims))
+            if cells is None:
+                try:
+                    with profiled(self.profiler, 'parse', files=1, streaming=True):
+                        cells = aggregate_sheet_stream(f, sheet_name, dims, chunk_rows=chunk_rows)
+                except KeyError:
+                    warnings.append(f"File {f.name} tidak punya sheet '{sheet_name}', dilewati.")
+                    self.warn(warnings[-1])
+                    continue
+                except Exception as e:
+                    warnings.append(f"Gagal baca sheet '{sheet_name}' di file {f.name}: {e}")
+                    self.warn(warnings[-1])
+                    continue
+                self.cache.put(digest, cache_sheet, cells, columns=tuple(dims))
+            cells['filename'] = f.name
+            parts.append(cells)
+        if not parts:
+            return None
+
+        def build():
+            combined_df = pd.concat(parts, ignore_index=True, sort=True)
+            combined_df, report = compact_dtypes(combined_df, category_cols=self.compact_cols())
+            # Bobot tetap int64 agar penjumlahan di cube tidak overflow
+            combined_df[WEIGHT_COL] = combined_df[WEIGHT_COL].astype('int64')
+            return combined_df, report
+
+        shared = dataset_registry.get_or_create(('cells', stream_key), build)
+        self._use_shared(shared)
+        self._stream_key = stream_key
+        self._stream_load = (shared.df, warnings)
+        return shared.df
+
+    def _weight(self):
+        return WEIGHT_COL if self.df is not None and WEIGHT_COL in self.df.columns else None
 
+    def compact_cols(self):
+        """
+        Kolom yang selalu dijadikan `category` saat ingest (selain deteksi otomatis).
+        """
+        cols = [self.verif_col, self.key_col, self.type_col, 'Refinement Parameter', 'filename']
+        return cols + [c for c in self.allowed_cat_cols if c not in cols]
+
+    def invalidate_cache(self, files=None):
+        """
+        Buang hasil parsing dari cache. Tanpa argumen: semua entri dihapus,
+        selain itu hanya file (berdasarkan isi) yang diberikan.
+        """
+        if files is None:
+            self.cache.invalidate(include_store=True)
+            return
+        for f in files:
+            self.cache.invalidate(file_hash(f), include_store=True)
 
     def get_columns(self):
         if self.df is None:
             return [], []
-        num_cols = self.df.select_dtypes(include='number').columns.tolist()
-        cat_cols = self.df.select_dtypes(include='object').columns.tolist()
+        num_cols = [c for c in self.df.select_dtypes(include='number').columns if c != WEIGHT_COL]
+        cat_cols = self.df.select_dtypes(include=['object', 'category']).columns.tolist()
         return num_cols, cat_cols
 
+    @timed('count_cube')
+    def count_cube(self, category_col):
+        """
+        Cube jumlah verifikasi x Key x Type x `category_col` x Refinement Parameter.
+        Dibangun sekali per dataset untuk tiap kolom kategori, lalu dipakai ulang
+        oleh setiap kombinasi widget.
+        """
+        def build():
+            return CountCube(
+                self.df,
+                [self.verif_col, self.key_col, self.type_col, category_col, 'Refinement Parameter'],
+                weight=self._weight()
+            )
+
+        return self._derived(('cube', category_col), build)
+
+    def _derived(self, name, build_fn):
+        # Dataset bersama: turunan cukup dibangun sekali untuk semua session
+        if self._shared is not None and self._shared.df is self.df:
+            return self._shared.derived(name, build_fn)
+        if self._local_df is not self.df:
+            self._local_df = self.df
+            self._local_derived = {}
+        if name not in self._local_derived:
+            self._local_derived[name] = build_fn()
+        return self._local_derived[name]
+
+    def filter_options(self):
+        """
+        Nilai unik (tanpa NaN, urut kemunculan) kolom verifikasi, Key dan Type untuk
+        widget filter; dihitung sekali per dataset.
+        """
+        def build():
+            return {
+                col: self.df[col].dropna().unique().tolist() if col in self.df.columns else []
+                for col in (self.verif_col, self.key_col, self.type_col)
+            }
+        return self._derived('filter_options', build)
+
+    @timed('filter_and_group')
     def filter_and_group(self):
         if self.df is None or self.category_col is None or not self.selected_verif:
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
         if self.verif_col not in self.df.columns:
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
-        # Filter berdasarkan verifikasi
-        filtered = self.df[self.df[self.verif_col].isin(self.selected_verif)]
+        # Pastikan kolom 'Refinement Parameter' ada
+        if 'Refinement Parameter' not in self.df.columns:
+            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
-        # Filter berdasarkan key jika tidak memilih 'All'
-        if hasattr(self, 'selected_key') and self.selected_key:
-            if 'Key' in filtered.columns and self.selected_key != 'All':
-                filtered = filtered[filtered['Key'].isin(self.selected_key)]
+        # Filter berdasarkan verifikasi, lalu key/type jika tidak memilih 'All'
+        filters = {self.verif_col: self.selected_verif}
+        if self.selected_key and self.selected_key != 'All':
+            filters[self.key_col] = self.selected_key
+        if self.selected_type and self.selected_type != 'All':
+            filters[self.type_col] = self.selected_type
 
-        # Filter berdasarkan type jika tidak memilih 'All'
-        if hasattr(self, 'selected_type') and self.selected_type:
-            if 'Type' in filtered.columns and self.selected_type != 'All':
-                filtered = filtered[filtered['Type'].isin(self.selected_type)]
+        # Ranking lengkap dimemo per (dataset, filter ternormalisasi); top_n cukup slicing
+        view_key = ('filter_and_group', self.category_col) + tuple(
+            (col, frozenset(values)) for col, values in filters.items()
+        )
+        views = self._derived('views', lambda: ViewCache(self.view_cache_size))
+        ranking, grouped_with_criteria = views.get_or_create(view_key, lambda: self._group_views(filters))
 
-        # Pastikan kolom 'Refinement Parameter' ada
-        if 'Refinement Parameter' not in filtered.columns:
-            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        grouped = ranking.head(self.top_n).copy()
+        return grouped, ranking.copy(), grouped_with_criteria.copy()
+
+    def _group_views(self, filters):
+        cube = self.count_cube(self.category_col)
+        cells = cube.slice(filters)
 
         # Grouping by category
-        grouped = filtered[self.category_col].value_counts().reset_index()
-        grouped.columns = [self.category_col, 'Jumlah']
-        grouped['Jumlah'] = grouped['Jumlah'].astype(int)
-        grouped_detail = grouped.copy()
-        grouped = grouped.head(self.top_n)
+        ranking = cube.rollup(self.category_col, cells=cells)
+        ranking[self.category_col] = ranking[self.category_col].astype(object)
+        ranking['Jumlah'] = ranking['Jumlah'].astype(int)
 
         # Group by category_col dan Kriteria
         grouped_with_criteria = (
-            filtered
-            .groupby([self.category_col, 'Refinement Parameter'])
-            .size()
-            .reset_index(name='Jumlah')
-            .sort_values('Jumlah', ascending=False)
-            .reset_index(drop=True)
+            cube.rollup([self.category_col, 'Refinement Parameter'], cells=cells)
+            .astype({self.category_col: object, 'Refinement Parameter': object})
         )
+        return ranking, grouped_with_criteria
 
-        return grouped, grouped_detail, grouped_with_criteria
-
+    @timed('plot_bar')
     def plot_bar(self, grouped):
-        plt.figure(figsize=(10, 6))
-        barplot = sns.barplot(data=grouped, x='Jumlah', y=self.category_col, palette='mako')
         selected_str = ", ".join(map(str, self.selected_verif))
-        plt.title(f"Top {self.top_n} untuk kondisi [{selected_str}] berdasarkan '{self.category_col}'")
-        plt.xlabel("Jumlah")
-        plt.ylabel(self.category_col)
-
-        plt.gca().xaxis.get_major_formatter().set_scientific(False)
-        plt.gca().xaxis.get_major_formatter().set_useOffset(False)
-        plt.gca().xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}'))
-
-        for i, value in enumerate(grouped['Jumlah']):
-            barplot.text(value + 0.5, i, str(value), color='black', va='center')
-
-        plt.tight_layout()
-        st.pyplot(plt.gcf())
-        plt.close()
-
-    def calculate_confusion_stats(self):
-        """
-        Hitung statistik verifikasi per file (TP, TN, FP, FN, Total, Accuracy, dll).
-        Return: df_counts_with_filename, df_metrics_with_filename
-        """
-        if self.df is None or self.verif_col not in self.df.columns or 'filename' not in self.df.columns:
-            return None, None
-
-        count_rows_perfile = []
-        metric_rows_perfile = []
-        count_rows_total = []
-        metric_rows_total = []
-
-        for filename, group in self.df.groupby("Key"):
-            counts = group[self.verif_col].value_counts()
-            TP = counts.get('True Positive', 0)
-            TN = counts.get('True Negative', 0)
-            FP = counts.get('False Positive', 0)
-            FN = counts.get('False Negative', 0)
-            total = TP + TN + FP + FN
-
-            accuracy = (TP + TN) / total if total else None
-            recall = TP / (TP + FN) if (TP + FN) else None
-            precision = TP / (TP + FP) if (TP + FP) else None
-            specificity = TN / (TN + FP) if (TN + FP) else None
-            f1_score = (2 * precision * recall) / (precision + recall) if (precision and recall and (precision + recall)) else None
-
-            # Pisahkan komponen berdasarkan underscore
-            key_part, year_part, type_part = filename.split('_')
-
-            # Gunakan hasil pemisahan untuk membuat dict
-            count_rows_perfile.append({
-                'filename': key_part,
-                'year': year_part,
-                'type': type_part,
-                'TP': TP, 'TN': TN, 'FP': FP, 'FN': FN, 'Total': total
-            })
-
-            metric_rows_perfile.append({
-                'filename': key_part,
-                'year': year_part,
-                'type': type_part,
-                'Accuracy': accuracy,
-                'Specificity': specificity,
-                'Recall': recall,
-                'Precision': precision,
-                'F1 Score': f1_score
-            })
-
-        for filename, group in self.df.groupby("filename"):
-            counts = group[self.verif_col].value_counts()
-            TP = counts.get('True Positive', 0)
-            TN = counts.get('True Negative', 0)
-            FP = counts.get('False Positive', 0)
-            FN = counts.get('False Negative', 0)
-            total = TP + TN + FP + FN
-
-            accuracy = (TP + TN) / total if total else None
-            recall = TP / (TP + FN) if (TP + FN) else None
-            precision = TP / (TP + FP) if (TP + FP) else None
-            specificity = TN / (TN + FP) if (TN + FP) else None
-            f1_score = (2 * precision * recall) / (precision + recall) if (precision and recall and (precision + recall)) else None
-
-            count_rows_total.append({
-                '' : 'Total',    
-                'TP': TP, 'TN': TN, 'FP': FP, 'FN': FN, 'Total': total
-            })
-            metric_rows_total.append({
-                '': 'Total',
-                'Accuracy': accuracy,
-                'Specificity' : specificity,
-                'Recall': recall,
-                'Precision': precision,
-                'F1 Score': f1_score
-            })
-
-        df_counts = pd.DataFrame(count_rows_perfile)
-        df_metrics = pd.DataFrame(metric_rows_perfile)
-        df_counts_total = pd.DataFrame(count_rows_total)
-        df_metrics_total = pd.DataFrame(metric_rows_total)
-        return df_counts, df_metrics, df_counts_total, df_metrics_total
-
-class UIComponents:
-    @staticmethod
-    def render_welcome():
-        st.markdown("""
-            <style>
-            .typewriter h2 {
-                overflow: hidden;
-                border-right: .15em solid red;
-                white-space: nowrap;
-                letter-spacing: .05em;
-                animation: typing 3s steps(42, end), blink-caret .75s step-end infinite;
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                font-size: 1.5rem;
-                text-align: left;
-                margin: 0;
-            }
+        title = f"Top {self.top_n} untuk kondisi [{selected_str}] berdasarkan '{self.category_col}'"
+        self.charts.render(grouped, self.category_col, title, self.top_n)
 
-            /* Responsive styles for smaller screens */
-            @media only screen and (max-width: 600px) {
-                .typewriter h2 {
-                    font-size: 1rem;
-                    white-space: normal; /* wrap text */
-                    animation: none; /* disable typewriter effect */
-                    border-right: none;
-                }
-            }
+    def confusion_counts(self, df=None):
+        """
+        Satu agregat TP/TN/FP/FN per (Key, filename) — dasar semua tabel statistik.
+        Baris dengan nilai verifikasi lain/NaN tetap membentuk grup (semua nol),
+        sama seperti groupby per grup sebelumnya.
+        Kolom `Rows` (jumlah baris grup) dipakai saat agregat digabung/dikurangi.
+        """
+        if df is None:
+            # Agregat hasil load inkremental masih berlaku selama df tidak diganti
+            if self._counts is not None and self._combined is self.df:
+                return self._counts
+            df = self.df
+        groups = df.groupby([self.key_col, 'filename', self.verif_col], dropna=False, observed=True)
+        # Tabel sel hasil streaming: tiap baris mewakili WEIGHT_COL baris mentah
+        sizes = groups[WEIGHT_COL].sum() if WEIGHT_COL in df.columns else groups.size()
+        grouped = sizes.unstack(self.verif_col, fill_value=0)
+        counts = pd.DataFrame(index=grouped.index)
+        for short, label in CONFUSION_LABELS.items():
+            counts[short] = grouped[label] if label in grouped.columns else 0
+        counts['Rows'] = grouped.sum(axis=1)
+        return counts.astype('int64')
+
+    @timed('calculate_confusion_stats')
+    def calculate_confusion_stats(self, intervals=None):
+        """
+        Hitung statistik verifikasi per Key dan per file (TP, TN, FP, FN, Total, Accuracy, dll).
+        `intervals` (opsional): dict argumen confusion_intervals, mis.
+        {'method': 'wilson', 'n_boot': 1000} -> tabel metrik diberi kolom Low/High.
+        Return: df_counts, df_metrics, df_counts_total, df_metrics_total
+        """
+        if (
+            self.df is None
+            or self.verif_col not in self.df.columns
+            or 'filename' not in self.df.columns
+            or self.key_col not in self.df.columns
+        ):
+            return None, None, None, None
 
-            @keyframes typing {
-                from { width: 0 }
-                to { width: 42ch }
-            }
+        counts = self.confusion_counts()
+        return confusion_tables(counts, intervals=intervals)
 
-            @keyframes blink-caret {
-                from, to { border-color: transparent }
-                50% { border-color: grey }
-            }
-            </style>
-
-            <div class="typewriter">
-                <h2>📊 Welcome to AI Model Evaluation Dashboard</h2>
-            </div>
-        """, unsafe_allow_html=True)
-        st.divider()
-
-    @staticmethod 
-    def render_doc():
-        st.subheader("📘 Documentation")
-        st.markdown("""
-        ### 🚀 Getting Started
-
-        Welcome to the AI Evaluation Dashboard! Here's how to use it:
-
-        1. **Upload** an Excel (.xlsx) file using the sidebar.
-        2. **Choose** the category column (e.g., verification result).
-        3. Head over to the **Statistics** tab to see counts and evaluation metrics (Accuracy, F1 Score, etc.).
-        4. Use the **Data Analysis** tab to explore visualizations and filter data by multiple verification types.
-        5. This **Documentation** tab is here to guide you whenever you need help.
-
-        ---
-
-        ### 🧠 App Architecture
-
-        - **Backend**: Data processing with `Pandas`.
-        - **Visualization**: Powered by `Matplotlib` and `Seaborn`.
-        - **User Interface**: Built with `Streamlit` and organized via tab navigation.
-
-        ---
-
-        ### 🙌 Credits & Acknowledgements
-
-        - Created by **Naufal Nashif**
-        - Built with: `Pandas`, `Streamlit`, `Matplotlib`, `Seaborn`
-        - Special thanks to the open-source community and official documentation for continuous inspiration ✨
-
-        ---
-
-        ### 🔗 Source Code & Docs
-
-        Full source code and technical documentation available on GitHub:
-
-        ```
-        https://github.com/naufalnashif/rfojk-sreamlit-ai-eval
-        ```
-
-        Feel free to ⭐ the repo, fork it, or contribute!
-
-        ---
-        """)
-    
-    @staticmethod
-    def render_footer():
-        year_now = datetime.now().year
-        st.markdown(f"""
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined');
-
-        .material-symbols-outlined {{
-            font-family: 'Material Symbols Outlined';
-            font-variation-settings:
-                'FILL' 0,
-                'wght' 400,
-                'GRAD' 0,
-                'opsz' 24;
-            font-size: 24px;
-            vertical-align: middle;
-            margin: 0 1rem;
-            color: #aaa;
-        }}
-
-        .wrapper {{
-            width: 100%;
-            overflow: hidden;
-            position: relative;
-            height: 40px;
-            margin-top: 10px;
-            margin-bottom: 30px;
-        }}
-
-        .scrolling-container {{
-            display: flex;
-            align-items: center;
-            white-space: nowrap;
-            animation: scroll-left 20s linear infinite;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            color: #aaa;
-            filter: grayscale(100%);
-        }}
-
-        @keyframes scroll-left {{
-            0% {{
-                transform: translateX(100%);
-            }}
-            100% {{
-                transform: translateX(-120%);
-            }}
-        }}
-
-        .logo {{
-            height: 24px;
-            vertical-align: middle;
-            margin: 0 1rem;
-            opacity: 0.7;
-        }}
-
-        .scroll-text {{
-            font-size: 1.1rem;
-            display: inline;
-        }}
-
-        @media only screen and (max-width: 600px) {{
-            .wrapper {{
-                height: 50px;
-            }}
-
-            .logo {{
-                height: 18px;
-                margin: 0 0.5rem;
-            }}
-
-            .scroll-text {{
-                font-size: 0.85rem;
-            }}
-
-            .material-symbols-outlined {{
-                font-size: 20px;
-                margin: 0 0.5rem;
-            }}
-
-            .scrolling-container {{
-                animation-duration: 20s;
-            }}
-        }}
-        </style>
-
-        <div class="wrapper">
-            <div class="scrolling-container">
-                <span class="material-symbols-outlined">mindfulness</span>
-                <span class="scroll-text">Self Daily &nbsp;&nbsp;&nbsp;</span>
-                <span class="material-symbols-outlined">planner_review</span>
-                <span class="scroll-text">Interval &nbsp;&nbsp;&nbsp;</span>
-                <span class="material-symbols-outlined">qr_code </span>
-                <span class="scroll-text">Data Science &nbsp;&nbsp;&nbsp;</span>
-                <span class="material-symbols-outlined">palette </span>
-                <span class="scroll-text">Streamlit v1.45.1 &nbsp;&nbsp;&nbsp;</span>
-                <span class="material-symbols-outlined">code </span>
-                <span class="scroll-text">Powered by Python</span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        st.divider()
-
-        st.markdown(f"""
-        <div style="text-align: center;">
-            <p style="color: grey; font-size: 0.875rem;">
-                Made with ❤️ by <span style="color: #1f77b4;">Naufal Nashif</span> ©️ {year_now}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+
+    def run_options(self, run_col='filename'):
+        """
+        Nilai `run_col` (default: tiap file = satu run) yang bisa dibandingkan, urut kemunculan.
+        """
+        if self.df is None or run_col not in self.df.columns:
+            return []
+        return self._derived(('run_options', run_col), lambda: self.df[run_col].dropna().unique().tolist())
+
+    @timed('compare_runs')
+    def compare_runs(self, base, others, run_col='filename', groups=None):
+        """
+        Bandingkan run `others` terhadap run `base` pada item yang sama. Baris di-join
+        (hash join kode integer) lewat Key, Refinement Parameter dan urutan kemunculan
+        di dalam run; perpindahan TP/TN/FP/FN dihitung per Key sekaligus.
+        Run = nilai `run_col`, atau bila `groups` diberikan ({nama set: [nilai run_col]},
+        mis. beberapa file per versi model) = set evaluasi; baris di luar set diabaikan.
+        Return: df_summary, df_delta, df_flips; None bila tidak bisa dibandingkan
+        (mis. dataset streaming yang hanya menyimpan agregat).
+        """
+        if (
+            self.df is None
+            or WEIGHT_COL in self.df.columns
+            or any(col not in self.df.columns for col in (run_col, self.key_col, self.verif_col))
+        ):
+            return None, None, None
+
+        # Kunci memo: definisi set apa adanya, termasuk urutan anggota
+        sets = None
+        if groups is not None:
+            sets = tuple((name, tuple(members)) for name, members in groups.items())
+
+        def build_rows():
+            df = self.df
+            if groups is not None:
+                membership = {value: name for name, members in groups.items() for value in members}
+                cols = [c for c in (self.key_col, self.verif_col, 'Refinement Parameter') if c in df.columns]
+                runs = df[run_col].astype(object).map(membership)
+                df = df.loc[runs.notna().to_numpy(), cols].assign(**{run_col: runs.dropna()})
+            return RunRows(df, run_col, self.key_col, self.verif_col, CONFUSION_LABELS)
+
+        rows = self._derived(('run_rows', run_col, sets), build_rows)
+        if base not in rows.runs:
+            return None, None, None
+        parts = []
+        for other in others:
+            if other == base or other not in rows.runs:
+                continue
+
+            def build(other=other):
+                key_codes, before, after, only_base, only_other = rows.pair(base, other)
+                return flip_counts(key_codes, before, after, len(rows.keys)), only_base, only_other
+
+            flips, only_base, only_other = self._derived(('run_pair', run_col, sets, base, other), build)
+            parts.append((other, flips, only_base, only_other))
+        if not parts:
+            return None, None, None
+        return comparison_tables(rows.keys, parts, key_label=self.key_col)
+
+
+def compact_dtypes(df, category_cols=(), max_unique_ratio=0.5):
+    """
+    Kecilkan memori DataFrame hasil ingest:
+    - kolom teks di `category_cols`, atau yang rasio nilai uniknya <= `max_unique_ratio`,
+      dijadikan `category` (filter `isin` dan groupby lalu jalan di kode integer);
+    - kolom integer di-downcast, kolom float hanya bila float32 tidak mengubah nilainya.
+    Return: (df_baru, report) dengan report berisi byte sebelum/sesudah.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    out = df.copy()
+    n_rows = max(len(out), 1)
+    for col in out.columns:
+        values = out[col]
+        if values.dtype == object:
+            if col in category_cols or values.nunique(dropna=True) / n_rows <= max_unique_ratio:
+                out[col] = values.astype('category')
+        elif pd.api.types.is_integer_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            out[col] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values):
+            narrow = values.astype('float32')
+            if np.array_equal(narrow.to_numpy(dtype='float64'), values.to_numpy(), equal_nan=True):
+                out[col] = narrow
+    after = int(out.memory_usage(deep=True).sum())
+    report = {'bytes_before': before, 'bytes_after': after, 'bytes_saved': before - after}
+    return out, report
+
+
+def merge_counts(total, part, sign=1):
+    """
+    Gabungkan (sign=1) atau kurangkan (sign=-1) agregat parsial hasil confusion_counts.
+    Grup yang tidak lagi punya baris dibuang.
+    """
+    if total is None:
+        return part.copy() if sign > 0 else None
+    merged = (
+        pd.concat([total, part * sign])
+        .groupby(level=list(range(total.index.nlevels)), dropna=False, sort=False)
+        .sum()
+        .astype('int64')
+    )
+    return merged[merged['Rows'] > 0]
+
+
+def confusion_metrics(counts):
+    """
+    Hitung Accuracy, Specificity, Recall, Precision dan F1 secara vektor dari
+    DataFrame berkolom TP/TN/FP/FN. Pembagi nol menghasilkan NaN; F1 NaN bila
+    precision atau recall bernilai 0.
+    """
+    tp = counts['TP'].to_numpy(dtype='float64')
+    tn = counts['TN'].to_numpy(dtype='float64')
+    fp = counts['FP'].to_numpy(dtype='float64')
+    fn = counts['FN'].to_numpy(dtype='float64')
+    total = tp + tn + fp + fn
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accuracy = np.where(total > 0, (tp + tn) / total, np.nan)
+        specificity = np.where(tn + fp > 0, tn / (tn + fp), np.nan)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), np.nan)
+        precision = np.where(tp + fp > 0, tp / (tp + fp), np.nan)
+        valid_f1 = (precision > 0) & (recall > 0)
+        f1_score = np.where(valid_f1, 2 * precision * recall / (precision + recall), np.nan)
+
+    return pd.DataFrame({
+        'Accuracy': accuracy,
+        'Specificity': specificity,
+        'Recall': recall,
+        'Precision': precision,
+        'F1 Score': f1_score,
+    }, index=counts.index)
+
+
+def with_intervals(metrics, counts, intervals):
+    """
+    Sisipkan kolom `<Metrik> Low`/`<Metrik> High` tepat setelah kolom metriknya.
+    """
+    if not intervals:
+        return metrics
+    bounds = confusion_intervals(counts, **intervals).set_axis(metrics.index)
+    out = metrics.copy()
+    for col in metrics.columns:
+        for side in ('Low', 'High'):
+            name = f'{col} {side}'
+            if name in bounds.columns:
+                out[name] = bounds[name]
+    order = []
+    for col in metrics.columns:
+        order += [col] + [c for c in (f'{col} Low', f'{col} High') if c in out.columns]
+    return out[order]
+
+
+def confusion_tables(counts, file_label=False, intervals=None):
+    """
+    Dari agregat per (Key, filename) bentuk tabel per Key dan tabel total per file.
+    Dengan `file_label=True` tabel total diberi kolom `filename` berisi nama file
+    (untuk output batch), bukan label 'Total' seperti di dashboard.
+    `intervals`: lihat ExcelAnalyzer.calculate_confusion_stats.
+    """
+    key_level, file_level = counts.index.names[0], counts.index.names[1]
+
+    # Per Key (Key NaN tidak ikut, sama seperti groupby default)
+    counts = counts[list(CONFUSION_LABELS)]
+    per_key = counts.groupby(level=key_level, sort=True, observed=True).sum()
+    per_key['Total'] = per_key[list(CONFUSION_LABELS)].sum(axis=1)
+    key_parts = (
+        per_key.index.to_series().astype(str)
+        .str.split('_', n=2, expand=True)
+        .reindex(columns=range(3))
+    )
+    key_parts.columns = ['filename', 'year', 'type']
+    key_parts = key_parts.reset_index(drop=True)
+
+    df_counts = pd.concat([key_parts, per_key.reset_index(drop=True)], axis=1)
+    df_metrics = pd.concat(
+        [key_parts, with_intervals(confusion_metrics(per_key), per_key, intervals).reset_index(drop=True)], axis=1
+    )
+
+    # Total per file diturunkan dari agregat yang sama, tanpa scan ulang data mentah
+    per_file = counts.groupby(level=file_level, sort=True, dropna=False, observed=True).sum()
+    per_file['Total'] = per_file[list(CONFUSION_LABELS)].sum(axis=1)
+    if file_label:
+        label = pd.DataFrame({'filename': per_file.index.astype(str)})
+    else:
+        label = pd.DataFrame({'': ['Total'] * len(per_file)})
+    per_file = per_file.reset_index(drop=True)
+    df_counts_total = pd.concat([label, per_file], axis=1)
+    df_metrics_total = pd.concat([label, with_intervals(confusion_metrics(per_file), per_file, intervals)], axis=1)
+    return df_counts, df_metrics, df_counts_total, df_metrics_total
+
+
+def _pair_stats(flips, index):
+    # Metrik run pembanding dikurangi metrik run dasar, dihitung dari matriks flip yang sama
+    base = pd.DataFrame(flips.sum(axis=-1), columns=list(OUTCOMES), index=index)
+    other = pd.DataFrame(flips.sum(axis=-2), columns=list(OUTCOMES), index=index)
+    delta = confusion_metrics(other) - confusion_metrics(base)
+    delta.columns = [f'{col} Δ' for col in delta.columns]
+    worse, better = correctness_flips(flips)
+    stat, p_value = mcnemar(worse, better)
+    out = pd.concat([pd.DataFrame({'Matched': flips.sum(axis=(-2, -1))}, index=index), delta], axis=1)
+    out['Correct→Wrong'] = worse
+    out['Wrong→Correct'] = better
+    out['McNemar χ²'] = stat
+    out['p-value'] = p_value
+    return out
+
+
+def comparison_tables(keys, parts, key_label='Key'):
+    """
+    Tabel perbandingan run dari hasil ExcelAnalyzer.compare_runs.
+    `parts`: list (nama run, matriks flip (n_keys, 4, 4), hanya di base, hanya di run).
+    Return:
+    - df_summary: satu baris per run (total semua Key, termasuk baris yang tidak ter-join);
+    - df_delta: per (Run, Key) selisih metrik, flip benar/salah dan uji McNemar;
+    - df_flips: per (Run, Key) jumlah tiap perpindahan outcome (mis. TP→FN).
+    """
+    keys = np.asarray(keys, dtype=object)
+    changed = [col for col in FLIP_COLUMNS if col.split('→')[0] != col.split('→')[1]]
+    summaries, deltas, flip_tables = [], [], []
+    for run, flips, only_base, only_other in parts:
+        total = _pair_stats(flips.sum(axis=0)[None], pd.Index([run], name='Run'))
+        total.insert(1, 'Only in baseline', only_base)
+        total.insert(2, 'Only in run', only_other)
+        summaries.append(total)
+
+        present = flips.sum(axis=(1, 2)) > 0
+        index = pd.MultiIndex.from_arrays(
+            [np.full(present.sum(), run, dtype=object), keys[present]], names=['Run', key_label]
+        )
+        # Urutan run mengikuti pilihan, Key diurutkan di dalam tiap run
+        deltas.append(_pair_stats(flips[present], index).sort_index(level=1, sort_remaining=False))
+        table = pd.DataFrame(flips[present].reshape(-1, 16), columns=FLIP_COLUMNS, index=index)
+        table['Unchanged'] = np.trace(flips[present], axis1=1, axis2=2)
+        flip_tables.append(table[changed + ['Unchanged']].sort_index(level=1, sort_remaining=False))
+
+    df_summary = pd.concat(summaries).reset_index()
+    df_delta = pd.concat(deltas).reset_index()
+    df_flips = pd.concat(flip_tables).reset_index()
+    return df_summary, df_delta, df_flips
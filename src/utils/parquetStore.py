@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def default_store_dir():
+    return os.environ.get(
+        'EVAL_STORE_DIR',
+        os.path.join(tempfile.gettempdir(), 'eval-genai-store')
+    )
+
+
+def _env_limit(name, default, scale):
+    # 0 (atau kosong) = tanpa batas
+    value = float(os.environ.get(name, default) or 0)
+    return int(value * scale) if value > 0 else None
+
+
+def _to_arrow_safe(df):
+    """
+    Kolom object hasil read_excel bisa campur tipe (angka + teks) dan ditolak Arrow.
+    Nilai non-null di kolom seperti itu diubah ke string, NaN tetap NaN.
+    """
+    df = df.copy()
+    for col in df.select_dtypes(include='object').columns:
+        values = df[col]
+        df[col] = values.where(values.isna(), values.astype(str))
+    return df
+
+
+class ParquetStore:
+    """
+    Simpanan kolumnar di disk untuk sheet yang sudah pernah di-parse, per hash isi file:
+
+        <root>/<file_hash>/manifest.json   -> daftar nama sheet
+        <root>/<file_hash>/<sheet_id>.parquet
+
+    Run berikutnya cukup membaca Parquet (dengan proyeksi kolom) tanpa openpyxl.
+    Ukuran total dibatasi `max_bytes` dan umur entri `max_age_s` (default dari env,
+    0 = tanpa batas): setiap selesai menulis, entri yang kedaluwarsa lalu yang paling
+    lama tidak dipakai (mtime manifest, diperbarui saat dibaca) dihapus.
+    """
+
+    def __init__(self, root=None, max_bytes=None, max_age_s=None):
+        self.root = root or default_store_dir()
+        os.makedirs(self.root, exist_ok=True)
+        if max_bytes is None:
+            max_bytes = _env_limit('EVAL_STORE_MAX_MB', '2048', 1024 * 1024)
+        if max_age_s is None:
+            max_age_s = _env_limit('EVAL_STORE_MAX_AGE_DAYS', '30', 86400)
+        self.max_bytes = max_bytes or None
+        self.max_age_s = max_age_s or None
+
+    def _dir(self, digest):
+        return os.path.join(self.root, digest)
+
+    def _manifest_path(self, digest):
+        return os.path.join(self._dir(digest), 'manifest.json')
+
+    def _touch(self, digest):
+        # mtime manifest = terakhir dipakai, dasar urutan LRU saat prune
+        try:
+            os.utime(self._manifest_path(digest))
+        except OSError:
+            pass
+
+    def _sheet_path(self, digest, sheet_name):
+        sheet_id = hashlib.blake2b(str(sheet_name).encode('utf-8'), digest_size=8).hexdigest()
+        return os.path.join(self._dir(digest), f"{sheet_id}.parquet")
+
+    def _atomic_write(self, path, write_fn):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            write_fn(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def sheet_names(self, digest):
+        try:
+            with open(self._manifest_path(digest), encoding='utf-8') as fh:
+                names = json.load(fh)['sheet_names']
+        except (OSError, ValueError, KeyError):
+            return None
+        self._touch(digest)
+        return names
+
+    def write_sheet_names(self, digest, names):
+        self._write_manifest(digest, list(names))
+
+    def _write_manifest(self, digest, names):
+        def write(tmp_path):
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                json.dump({'sheet_names': names}, fh)
+
+        self._atomic_write(self._manifest_path(digest), write)
+
+    def has(self, digest, sheet_name):
+        return os.path.exists(self._sheet_path(digest, sheet_name))
+
+    def write(self, digest, sheet_name, df):
+        """
+        Simpan sheet ke Parquet. Return False bila sheet tidak bisa dikonversi apa
+        adanya (mis. header bukan string, atau kolom campur angka + teks); pemanggil
+        cukup lanjut tanpa spill. Sheet seperti itu sengaja tidak dikonversi ke string
+        supaya hasil baca dari store selalu identik dengan hasil parse ulang.
+        """
+        if not all(isinstance(c, str) for c in df.columns):
+            return False
+        path = self._sheet_path(digest, sheet_name)
+        try:
+            self._atomic_write(path, lambda p: df.to_parquet(p, index=False))
+        except (TypeError, ValueError):
+            return False
+        # Setiap folder store punya manifest (daftar sheet boleh belum diketahui),
+        # jadi prune/invalidate hanya menyentuh folder milik store
+        if not os.path.exists(self._manifest_path(digest)):
+            self._write_manifest(digest, None)
+        self._touch(digest)
+        self.prune(keep=digest)
+        return True
+
+    def read(self, digest, sheet_name, columns=None):
+        path = self._sheet_path(digest, sheet_name)
+        if columns is not None:
+            import pyarrow.parquet as pq
+
+            available = pq.read_schema(path).names
+            columns = [c for c in available if c in set(columns)]
+        df = pd.read_parquet(path, columns=columns)
+        # Arrow mengembalikan None untuk null di kolom teks; read_excel memberi NaN
+        for col in df.select_dtypes(include='object').columns:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        self._touch(digest)
+        return df
+
+    def entries(self):
+        """
+        Folder store yang valid (berisi manifest.json): list (digest, byte, terakhir dipakai).
+        """
+        out = []
+        try:
+            folders = list(os.scandir(self.root))
+        except OSError:
+            return out
+        for folder in folders:
+            manifest = os.path.join(folder.path, 'manifest.json')
+            if not folder.is_dir() or not os.path.isfile(manifest):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(folder.path) if f.is_file())
+                out.append((folder.name, size, os.stat(manifest).st_mtime))
+            except OSError:
+                continue  # Sedang dihapus proses lain
+        return out
+
+    def prune(self, keep=None):
+        """
+        Hapus entri yang lebih tua dari `max_age_s`, lalu entri yang paling lama tidak
+        dipakai sampai total ukuran <= `max_bytes`. Entri `keep` (baru ditulis) dibiarkan.
+        Return daftar digest yang dihapus.
+        """
+        if self.max_bytes is None and self.max_age_s is None:
+            return []
+        entries = sorted(self.entries(), key=lambda e: e[2])
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for digest, size, used in entries:
+            if digest == keep:
+                continue
+            expired = self.max_age_s is not None and now - used > self.max_age_s
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or too_big):
+                continue
+            self.invalidate(digest)
+            total -= size
+            removed.append(digest)
+        return removed
+
+    def invalidate(self, digest=None):
+        """
+        Hapus spill satu file, atau tanpa argumen semua entri store. Tanpa argumen
+        hanya folder berisi manifest.json yang dihapus: isi lain di `root` (mis. bila
+        EVAL_STORE_DIR menunjuk folder bersama) tidak pernah disentuh.
+        """
+        targets = [digest] if digest is not None else [d for d, _, _ in self.entries()]
+        for d in targets:
+            folder = self._dir(d)
+            if os.path.isdir(folder):
+                shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,154 @@
+import functools
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger('eval_genai.perf')
+
+TRUTHY = ('1', 'true', 'yes', 'on')
+
+
+def profiling_enabled(query_params=None):
+    """
+    Aktif bila EVAL_PROFILE=1 atau URL memuat `?profile=1`.
+    """
+    if os.environ.get('EVAL_PROFILE', '').lower() in TRUTHY:
+        return True
+    value = (query_params or {}).get('profile', '')
+    return str(value).lower() in TRUTHY
+
+
+def configure_json_logging(level=logging.INFO):
+    """
+    Kirim record `eval_genai.perf` ke stderr sebagai satu JSON per baris
+    (tanpa prefix), supaya mudah di-scrape oleh log collector.
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+
+def peak_rss_bytes():
+    """
+    RSS puncak proses dalam byte; 0 bila tidak tersedia (modul `resource` tidak ada di Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS melaporkan byte, Linux/BSD kilobyte
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def rss_bytes():
+    # RSS saat ini dari /proc (Linux); selain itu pakai RSS puncak
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss_bytes()
+
+
+class RunProfiler:
+    """
+    Catat durasi dan perubahan RSS tiap tahap dalam satu rerun dashboard.
+    Tiap tahap langsung dikirim sebagai log JSON; ringkasan (total waktu dan
+    selisih hit/miss cache) dikirim oleh `finish()`.
+    """
+
+    def __init__(self, session_id=None, cache=None):
+        self.session_id = session_id
+        self.run_id = uuid.uuid4().hex[:12]
+        self.cache = cache
+        self.records = []
+        self.summary = None
+        self._depth = 0
+        self._start = time.perf_counter()
+        self._cache_start = cache.stats() if cache is not None else None
+
+    def _emit(self, record):
+        record = {'session': self.session_id, 'run': self.run_id, **record}
+        logger.info(json.dumps(record, default=str))
+
+    @contextmanager
+    def stage(self, name, **fields):
+        start = time.perf_counter()
+        record = {'event': 'stage', 'stage': name, 'depth': self._depth,
+                  'start_ms': round((start - self._start) * 1000, 3), **fields}
+        rss_before = rss_bytes()
+        self._depth += 1
+        try:
+            yield record
+        except Exception as e:
+            record['error'] = type(e).__name__
+            raise
+        finally:
+            self._depth -= 1
+            rss_after = rss_bytes()
+            record['ms'] = round((time.perf_counter() - start) * 1000, 3)
+            record['rss_mb'] = round(rss_after / 1e6, 1)
+            record['rss_delta_mb'] = round((rss_after - rss_before) / 1e6, 1)
+            self.records.append(record)
+            self._emit(record)
+
+    def note(self, name, **fields):
+        """
+        Catat nilai tanpa durasi (mis. ukuran DataFrame).
+        """
+        record = {'event': 'note', 'stage': name, 'depth': self._depth,
+                  'start_ms': round((time.perf_counter() - self._start) * 1000, 3), **fields}
+        self.records.append(record)
+        self._emit(record)
+
+    def finish(self):
+        summary = {'event': 'run', 'total_ms': round((time.perf_counter() - self._start) * 1000, 3),
+                   'rss_mb': round(rss_bytes() / 1e6, 1), 'stages': sum(r['event'] == 'stage' for r in self.records)}
+        if self.cache is not None:
+            stats = self.cache.stats()
+            summary['cache_hits'] = stats['hits'] - self._cache_start['hits']
+            summary['cache_misses'] = stats['misses'] - self._cache_start['misses']
+            summary['cache_entries'] = stats['entries']
+            summary['cache_mb'] = round(stats['bytes'] / 1e6, 1)
+        self.summary = summary
+        self._emit(summary)
+        return summary
+
+    def timeline(self):
+        """
+        Record diurutkan menurut waktu mulai (tahap induk sebelum anaknya).
+        """
+        return sorted(self.records, key=lambda r: (r['start_ms'], r['depth']))
+
+
+def profiled(profiler, name, **fields):
+    """
+    `profiler.stage(...)` bila profiler aktif, selain itu context kosong.
+    """
+    if profiler is None:
+        return nullcontext({})
+    return profiler.stage(name, **fields)
+
+
+def timed(name):
+    """
+    Dekorator method: catat pemanggilan sebagai tahap di `self.profiler`
+    bila profiler aktif; tanpa profiler method dipanggil langsung.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, 'profiler', None)
+            if profiler is None:
+                return fn(self, *args, **kwargs)
+            with profiler.stage(name):
+                return fn(self, *args, **kwargs)
+        return wrapper
+    return decorator
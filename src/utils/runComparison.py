@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Urutan kode outcome per baris (0..3); -1 = nilai verifikasi lain / NaN
+OUTCOMES = ('TP', 'TN', 'FP', 'FN')
+CORRECT = np.array([True, True, False, False])
+FLIP_COLUMNS = [f'{a}→{b}' for a in OUTCOMES for b in OUTCOMES]
+
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+def _codes(values):
+    # NaN ikut jadi satu kode sendiri, supaya baris tanpa Key/parameter tetap bisa di-join
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return codes.astype('int64'), uniques
+
+
+def combine_codes(*codes):
+    """
+    Gabungkan beberapa array kode integer (panjang sama) jadi satu kode int64 padat
+    per kombinasi. Tiap langkah mixed radix langsung di-factorize ulang, jadi nilai
+    antara tidak pernah melebihi jumlah baris kuadrat (tidak overflow).
+    """
+    combined = codes[0]
+    for c in codes[1:]:
+        size = int(c.max()) + 1 if len(c) else 1
+        combined, _ = pd.factorize(combined * size + c)
+    return combined.astype('int64')
+
+
+class RunRows:
+    """
+    Semua baris dataset dalam bentuk kode integer, siap di-join antar run:
+    run (nilai `run_col`, mis. per file), Key, outcome (indeks OUTCOMES) dan identitas
+    baris = (Key, `match_cols`, urutan kemunculan di dalam run). Dua run yang
+    mengevaluasi item yang sama dengan urutan sama menghasilkan identitas yang sama.
+
+    Dibangun sekali per dataset; tiap pasangan run cukup dibandingkan lewat `pair`.
+    """
+
+    def __init__(self, df, run_col, key_col, verif_col, labels, match_cols=('Refinement Parameter',)):
+        run_codes, runs = _codes(df[run_col])
+        key_codes, keys = _codes(df[key_col])
+        match = [key_codes] + [_codes(df[col])[0] for col in match_cols if col in df.columns]
+        # Baris ke-n dengan (Key, parameter) yang sama di tiap run
+        group = combine_codes(run_codes, *match)
+        occurrence = pd.Series(group).groupby(group, sort=False).cumcount().to_numpy(dtype='int64')
+
+        self.runs = list(runs)
+        self.keys = keys
+        self.run_codes = run_codes
+        self.key_codes = key_codes
+        self.row_ids = combine_codes(*match, occurrence)
+        self.outcomes = pd.Categorical(
+            df[verif_col], categories=[labels[o] for o in OUTCOMES]
+        ).codes.astype('int8')
+        self._positions = {}
+
+    def positions(self, run):
+        idx = self.runs.index(run)
+        if idx not in self._positions:
+            self._positions[idx] = np.flatnonzero(self.run_codes == idx)
+        return self._positions[idx]
+
+    def pair(self, base, other):
+        """
+        Hash join baris run `other` ke baris run `base` lewat identitas baris.
+        Return (kode Key, outcome base, outcome other) untuk baris yang cocok,
+        plus jumlah baris yang hanya ada di base / hanya di other.
+        """
+        base_pos = self.positions(base)
+        other_pos = self.positions(other)
+        found = pd.Index(self.row_ids[other_pos]).get_indexer(self.row_ids[base_pos])
+        matched = found >= 0
+        left = base_pos[matched]
+        right = other_pos[found[matched]]
+        n_matched = len(left)
+        return (
+            self.key_codes[left], self.outcomes[left], self.outcomes[right],
+            len(base_pos) - n_matched, len(other_pos) - n_matched,
+        )
+
+
+def flip_counts(key_codes, before, after, n_keys):
+    """
+    Matriks perpindahan outcome per Key: array (n_keys, 4, 4) dengan [k, i, j] =
+    jumlah baris Key k yang OUTCOMES[i] di run dasar dan OUTCOMES[j] di run pembanding.
+    Baris dengan outcome di luar TP/TN/FP/FN tidak dihitung.
+    """
+    valid = (before >= 0) & (after >= 0)
+    flat = key_codes[valid] * 16 + before[valid].astype('int64') * 4 + after[valid]
+    return np.bincount(flat, minlength=n_keys * 16).reshape(n_keys, 4, 4)
+
+
+def correctness_flips(flips):
+    """
+    Return (b, c) dari matriks flip (..., 4, 4): b = benar -> salah, c = salah -> benar.
+    """
+    b = flips[..., CORRECT, :][..., ~CORRECT].sum(axis=(-2, -1))
+    c = flips[..., ~CORRECT, :][..., CORRECT].sum(axis=(-2, -1))
+    return b, c
+
+
+def mcnemar(b, c):
+    """
+    Uji McNemar dengan koreksi kontinuitas (vektor): statistik chi-kuadrat 1 df
+    dan p-value = erfc(sqrt(stat / 2)). b + c = 0 -> NaN.
+    """
+    b = np.asarray(b, dtype='float64')
+    c = np.asarray(c, dtype='float64')
+    n = b + c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stat = np.where(n > 0, np.clip(np.abs(b - c) - 1, 0, None) ** 2 / n, np.nan)
+    p_value = np.where(n > 0, _erfc(np.sqrt(np.nan_to_num(stat) / 2)), np.nan)
+    return stat, p_value
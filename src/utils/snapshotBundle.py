@@ -0,0 +1,137 @@
+import json
+import time
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+
+from utils.countCube import CountCube
+from utils.parquetStore import _to_arrow_safe
+
+SNAPSHOT_FORMAT = 'eval-genai-snapshot'
+SNAPSHOT_VERSION = 1
+
+
+def _json_default(value):
+    # Skalar NumPy (mis. dari opsi filter) -> tipe Python biasa
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Nilai {value!r} tidak bisa disimpan di manifest snapshot")
+
+
+def _arrow_frame(df):
+    """
+    Versi `df` yang bisa ditulis ke Parquet: kolom object campur tipe dijadikan
+    string (lihat parquetStore), begitu juga kategori dengan nilai non-string.
+    Return (df, kolom yang nilainya dijadikan string).
+    """
+    mixed = {
+        col for col in df.select_dtypes(include='object').columns
+        if df[col].dropna().map(type).nunique() > 1
+    }
+    out = _to_arrow_safe(df)
+    for col in out.select_dtypes(include='category').columns:
+        categories = out[col].cat.categories
+        if categories.dtype == object and not all(isinstance(c, str) for c in categories):
+            out[col] = out[col].cat.rename_categories([str(c) for c in categories])
+            mixed.add(col)
+    return out, mixed
+
+
+def _parquet_bytes(df):
+    buf = BytesIO()
+    df.to_parquet(buf, index=False, compression='zstd')
+    return buf.getvalue()
+
+
+class SnapshotBundle:
+    """
+    Satu evaluasi yang sudah dihitung, disimpan sebagai satu file zip:
+
+        manifest.json          format/versi, metadata load, opsi filter, daftar tabel
+        dataset.parquet        dataset gabungan (dtype compact/category tetap)
+        counts.parquet         agregat TP/TN/FP/FN per (Key, filename)
+        cubes/<n>.parquet      sel count cube per kolom Y-Bar
+
+    Parquet sudah terkompresi zstd, jadi anggota zip disimpan apa adanya (STORED).
+    Membuka bundle tidak menyentuh Excel maupun groupby: tabel langsung dipakai
+    oleh ExcelAnalyzer (lihat ExcelAnalyzer.load_snapshot).
+    """
+
+    def __init__(self, df, counts, options, cubes, meta=None, memory_report=None):
+        self.df = df
+        self.counts = counts
+        self.options = options
+        self.cubes = cubes  # kolom kategori -> CountCube
+        self.meta = meta or {}
+        self.memory_report = memory_report
+
+    def to_bytes(self):
+        df, mixed = _arrow_frame(self.df)
+        counts, _ = _arrow_frame(self.counts.reset_index())
+        options = {
+            col: [str(v) for v in values] if col in mixed else values
+            for col, values in self.options.items()
+        }
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'version': SNAPSHOT_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'meta': self.meta,
+            'memory_report': self.memory_report,
+            'rows': len(df),
+            'counts_index': list(self.counts.index.names),
+            'options': options,
+            'cubes': [],
+        }
+        members = {'dataset.parquet': _parquet_bytes(df), 'counts.parquet': _parquet_bytes(counts)}
+        for i, (col, cube) in enumerate(self.cubes.items()):
+            path = f'cubes/{i}.parquet'
+            members[path] = _parquet_bytes(_arrow_frame(cube.cells)[0])
+            manifest['cubes'].append({'column': col, 'dims': cube.dims, 'measure': cube.measure, 'path': path})
+
+        buf = BytesIO()
+        with zipfile.ZipFile(buf, 'w') as zf:
+            zf.writestr('manifest.json', json.dumps(manifest, default=_json_default, indent=2),
+                        compress_type=zipfile.ZIP_DEFLATED)
+            for path, data in members.items():
+                zf.writestr(path, data, compress_type=zipfile.ZIP_STORED)
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Baca bundle; ValueError bila file bukan snapshot, versinya tidak dikenal,
+        atau isinya rusak/tidak lengkap.
+        """
+        try:
+            zf = zipfile.ZipFile(BytesIO(data))
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Bukan file snapshot evaluasi: {e}") from e
+
+        with zf:
+            try:
+                manifest = json.loads(zf.read('manifest.json'))
+            except (KeyError, ValueError, zipfile.BadZipFile) as e:
+                raise ValueError(f"Bukan file snapshot evaluasi: {e}") from e
+            if not isinstance(manifest, dict) or manifest.get('format') != SNAPSHOT_FORMAT:
+                raise ValueError("Bukan file snapshot evaluasi (format tidak dikenal).")
+            if manifest.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f"Versi snapshot {manifest.get('version')} tidak didukung (butuh {SNAPSHOT_VERSION}).")
+
+            # Anggota hilang, Parquet rusak, atau manifest tanpa kunci wajib -> ValueError
+            try:
+                df = pd.read_parquet(BytesIO(zf.read('dataset.parquet')))
+                counts = pd.read_parquet(BytesIO(zf.read('counts.parquet'))).set_index(manifest['counts_index'])
+                cubes = {}
+                for entry in manifest['cubes']:
+                    cells = pd.read_parquet(BytesIO(zf.read(entry['path'])))
+                    cubes[entry['column']] = CountCube.from_cells(cells, entry['dims'], entry['measure'])
+                options = manifest['options']
+            except Exception as e:
+                raise ValueError(f"File snapshot rusak atau tidak lengkap: {e!r}") from e
+        return cls(
+            df, counts, options, cubes,
+            meta=dict(manifest.get('meta') or {}, created=manifest.get('created')),
+            memory_report=manifest.get('memory_report')
+        )
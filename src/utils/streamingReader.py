@@ -0,0 +1,92 @@
+from io import BytesIO
+
+import pandas as pd
+
+from utils.workbookCache import read_file_bytes
+
+# Kolom bobot pada tabel sel hasil streaming: jumlah baris mentah yang diwakili satu sel
+WEIGHT_COL = '__rows__'
+
+
+def iter_sheet_chunks(f, sheet_name, columns=None, chunk_rows=50_000):
+    """
+    Baca sheet baris demi baris (openpyxl read-only) dan hasilkan DataFrame per
+    `chunk_rows` baris, hanya berisi kolom di `columns` (None = semua kolom).
+    Raise KeyError bila sheet tidak ada.
+    """
+    from openpyxl import load_workbook
+
+    source = f if isinstance(f, str) else BytesIO(read_file_bytes(f))
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        if sheet_name not in wb.sheetnames:
+            raise KeyError(sheet_name)
+        ws = wb[sheet_name]
+        # <dimension> dari sebagian writer basi (mis. 'A1'); tanpa reset, read-only
+        # openpyxl hanya membaca baris/kolom sebatas dimensi itu
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        wanted = [
+            (i, name) for i, name in enumerate(header)
+            if name is not None and (columns is None or name in columns)
+        ]
+        names = [name for _, name in wanted]
+        buffer = []
+        for row in rows:
+            values = tuple(row[i] if i < len(row) else None for i, _ in wanted)
+            # Baris kosong (umum di ujung sheet read-only) tidak ikut dihitung
+            if all(v is None for v in values):
+                continue
+            buffer.append(values)
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame.from_records(buffer, columns=names)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=names)
+    finally:
+        wb.close()
+
+
+class StreamingAggregator:
+    """
+    Akumulasi jumlah baris per kombinasi `dims` dari chunk-chunk DataFrame.
+    Memori sebanding dengan jumlah kombinasi unik, bukan jumlah baris.
+    """
+
+    def __init__(self, dims, reduce_every=8):
+        self.dims = list(dims)
+        self.reduce_every = reduce_every
+        self._partials = []
+
+    def add_chunk(self, chunk):
+        dims = [d for d in self.dims if d in chunk.columns]
+        if not dims or chunk.empty:
+            return
+        self._partials.append(
+            chunk.groupby(dims, dropna=False).size().rename(WEIGHT_COL).reset_index()
+        )
+        if len(self._partials) >= self.reduce_every:
+            self._partials = [self._reduce()]
+
+    def _reduce(self):
+        cells = pd.concat(self._partials, ignore_index=True, sort=False)
+        dims = [d for d in self.dims if d in cells.columns]
+        return cells.groupby(dims, dropna=False)[WEIGHT_COL].sum().reset_index()
+
+    def result(self):
+        if not self._partials:
+            return pd.DataFrame(columns=self.dims + [WEIGHT_COL])
+        return self._reduce()
+
+
+def aggregate_sheet_stream(f, sheet_name, dims, chunk_rows=50_000):
+    """
+    Streaming satu sheet menjadi tabel sel berbobot (kolom `dims` + WEIGHT_COL).
+    """
+    aggregator = StreamingAggregator(dims)
+    for chunk in iter_sheet_chunks(f, sheet_name, columns=dims, chunk_rows=chunk_rows):
+        aggregator.add_chunk(chunk)
+    return aggregator.result()
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+HIGHLIGHT_MAX_CSS = 'background-color: #ffdd57; color: black;'
+LOW_METRIC_CSS = 'background-color: #e97451; color: white;'
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+def max_mask(df, subset):
+    """
+    Sel yang bernilai maksimum di kolomnya (setara Styler.highlight_max(axis=0)).
+    """
+    values = df[subset]
+    return values.eq(values.max())
+
+
+def below_mask(df, subset, threshold):
+    """
+    Sel di bawah `threshold`; NaN tidak ikut ditandai.
+    """
+    return df[subset].lt(threshold)
+
+
+def page_bounds(n_rows, page, page_size):
+    """
+    Return (start, stop, n_pages) untuk halaman `page` (mulai dari 1), dijepit ke rentang valid.
+    """
+    n_pages = max(1, -(-n_rows // page_size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, n_rows), n_pages
+
+
+class TableView:
+    """
+    Tampilan tabel besar: highlight dihitung sekali untuk seluruh tabel sebagai
+    mask boolean (vektor, bukan CSS per sel lewat applymap), sort/filter dijalankan
+    di server, dan hanya halaman aktif yang di-style lalu dikirim ke browser.
+
+    highlights: list (mask DataFrame, css) — mask berindeks sama dengan `df`.
+    formats: dict kolom -> format string/callable untuk Styler.format (halaman saja).
+    """
+
+    def __init__(self, df, highlights=(), formats=None):
+        if not df.index.is_unique:
+            df = df.reset_index(drop=True)
+        self.df = df
+        self.highlights = list(highlights)
+        self.formats = formats or {}
+
+    def sorted(self, sort_by=None, ascending=True):
+        if sort_by is None or sort_by not in self.df.columns:
+            return self.df
+        return self.df.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')
+
+    def page(self, page=1, page_size=PAGE_SIZES[1], sort_by=None, ascending=True):
+        """
+        Return (DataFrame halaman, n_pages, start) setelah sort.
+        """
+        df = self.sorted(sort_by, ascending)
+        start, stop, n_pages = page_bounds(len(df), page, page_size)
+        return df.iloc[start:stop], n_pages, start
+
+    def page_css(self, page_df):
+        """
+        CSS per sel untuk baris halaman saja, diambil dari mask seluruh tabel.
+        """
+        css = np.full(page_df.shape, '', dtype=object)
+        columns = page_df.columns
+        for mask, style in self.highlights:
+            mask = mask.reindex(index=page_df.index, columns=columns, fill_value=False)
+            css = np.where(mask.to_numpy(dtype=bool), css + style, css)
+        return pd.DataFrame(css, index=page_df.index, columns=columns)
+
+    def style(self, page_df):
+        styler = page_df.style
+        if self.formats:
+            styler = styler.format({c: f for c, f in self.formats.items() if c in page_df.columns})
+        if self.highlights:
+            styler = styler.apply(lambda _: self.page_css(page_df), axis=None)
+        return styler
+
+    def render(self, key, page_size=PAGE_SIZES[1], **dataframe_kwargs):
+        """
+        Tampilkan tabel di Streamlit. Tabel yang muat satu halaman ditampilkan
+        langsung; selebihnya diberi kontrol sort dan halaman.
+        """
+        import streamlit as st
+
+        if len(self.df) <= page_size:
+            st.dataframe(self.style(self.df), **dataframe_kwargs)
+            return
+
+        c1, c2, c3, c4 = st.columns([3, 2, 2, 2])
+        sort_by = c1.selectbox("Sort by", ['—'] + list(map(str, self.df.columns)), key=f"{key}_sort")
+        order = c2.selectbox("Order", ["Descending", "Ascending"], key=f"{key}_order")
+        page_size = c3.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(page_size)
+                                 if page_size in PAGE_SIZES else 1, key=f"{key}_size")
+        _, _, n_pages = page_bounds(len(self.df), 1, page_size)
+        # Jumlah halaman bisa mengecil setelah filter berubah
+        if st.session_state.get(f"{key}_page", 1) > n_pages:
+            st.session_state[f"{key}_page"] = n_pages
+        page = c4.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+
+        columns = {str(c): c for c in self.df.columns}
+        page_df, _, start = self.page(
+            int(page), page_size, sort_by=columns.get(sort_by), ascending=order == "Ascending"
+        )
+        st.dataframe(self.style(page_df), **dataframe_kwargs)
+        st.caption(f"Rows {start + 1:,}–{start + len(page_df):,} of {len(self.df):,}")
@@ -0,0 +1,226 @@
+import streamlit as st
+from datetime import datetime
+
+class UIComponents:
+    @staticmethod
+    def render_welcome():
+        st.markdown("""
+            <style>
+            .typewriter h2 {
+                overflow: hidden;
+                border-right: .15em solid red;
+                white-space: nowrap;
+                letter-spacing: .05em;
+                animation: typing 3s steps(42, end), blink-caret .75s step-end infinite;
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                font-size: 1.5rem;
+                text-align: left;
+                margin: 0;
+            }
+
+            /* Responsive styles for smaller screens */
+            @media only screen and (max-width: 600px) {
+                .typewriter h2 {
+                    font-size: 1rem;
+                    white-space: normal; /* wrap text */
+                    animation: none; /* disable typewriter effect */
+                    border-right: none;
+                }
+            }
+
+            @keyframes typing {
+                from { width: 0 }
+                to { width: 42ch }
+            }
+
+            @keyframes blink-caret {
+                from, to { border-color: transparent }
+                50% { border-color: grey }
+            }
+            </style>
+
+            <div class="typewriter">
+                <h2>📊 Welcome to AI Model Evaluation Dashboard</h2>
+            </div>
+        """, unsafe_allow_html=True)
+        st.divider()
+
+    @staticmethod 
+    def render_doc():
+        st.subheader("📘 Documentation")
+        st.markdown("""
+        ### 🚀 Getting Started
+
+        Welcome to the AI Evaluation Dashboard! Here's how to use it:
+
+        1. **Upload** an Excel (.xlsx) file using the sidebar.
+        2. **Choose** the category column (e.g., verification result).
+        3. Head over to the **Statistics** tab to see counts and evaluation metrics (Accuracy, F1 Score, etc.).
+        4. Use the **Data Analysis** tab to explore visualizations and filter data by multiple verification types.
+        5. This **Documentation** tab is here to guide you whenever you need help.
+
+        ---
+
+        ### 🧠 App Architecture
+
+        - **Backend**: Data processing with `Pandas`.
+        - **Visualization**: Powered by `Altair` (Vega-Lite), with `Matplotlib`/`Seaborn` as the legacy backend.
+        - **User Interface**: Built with `Streamlit` and organized via tab navigation.
+
+        ---
+
+        ### 🙌 Credits & Acknowledgements
+
+        - Created by **Naufal Nashif**
+        - Built with: `Pandas`, `Streamlit`, `Altair`, `Matplotlib`, `Seaborn`
+        - Special thanks to the open-source community and official documentation for continuous inspiration ✨
+
+        ---
+
+        ### 🔗 Source Code & Docs
+
+        Full source code and technical documentation available on GitHub:
+
+        ```
+        https://github.com/naufalnashif/rfojk-sreamlit-ai-eval
+        ```
+
+        Feel free to ⭐ the repo, fork it, or contribute!
+
+        ---
+        """)
+    
+    @staticmethod
+    def render_diagnostics(profiler):
+        summary = profiler.summary or profiler.finish()
+        with st.expander("🩺 Diagnostics", expanded=False):
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("Rerun", f"{summary['total_ms']:,.0f} ms")
+            c2.metric("RSS", f"{summary['rss_mb']:,.0f} MB")
+            c3.metric("Cache hit/miss", f"{summary.get('cache_hits', 0)}/{summary.get('cache_misses', 0)}")
+            c4.metric("Cache size", f"{summary.get('cache_mb', 0):,.1f} MB")
+            rows = []
+            for r in profiler.timeline():
+                extra = {k: v for k, v in r.items()
+                         if k not in ('event', 'stage', 'depth', 'start_ms', 'ms', 'rss_mb', 'rss_delta_mb')}
+                rows.append({
+                    'Stage': '\u00a0\u00a0' * r['depth'] + r['stage'],
+                    'Start (ms)': r['start_ms'],
+                    'Duration (ms)': r.get('ms'),
+                    'RSS Δ (MB)': r.get('rss_delta_mb'),
+                    'Detail': ', '.join(f"{k}={v}" for k, v in extra.items()),
+                })
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+            st.caption(f"Run `{profiler.run_id}` · session `{profiler.session_id}` · "
+                       "one JSON line per stage is logged to `eval_genai.perf`.")
+
+    @staticmethod
+    def render_footer():
+        year_now = datetime.now().year
+        st.markdown(f"""
+        <style>
+        @import url('https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined');
+
+        .material-symbols-outlined {{
+            font-family: 'Material Symbols Outlined';
+            font-variation-settings:
+                'FILL' 0,
+                'wght' 400,
+                'GRAD' 0,
+                'opsz' 24;
+            font-size: 24px;
+            vertical-align: middle;
+            margin: 0 1rem;
+            color: #aaa;
+        }}
+
+        .wrapper {{
+            width: 100%;
+            overflow: hidden;
+            position: relative;
+            height: 40px;
+            margin-top: 10px;
+            margin-bottom: 30px;
+        }}
+
+        .scrolling-container {{
+            display: flex;
+            align-items: center;
+            white-space: nowrap;
+            animation: scroll-left 20s linear infinite;
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            color: #aaa;
+            filter: grayscale(100%);
+        }}
+
+        @keyframes scroll-left {{
+            0% {{
+                transform: translateX(100%);
+            }}
+            100% {{
+                transform: translateX(-120%);
+            }}
+        }}
+
+        .logo {{
+            height: 24px;
+            vertical-align: middle;
+            margin: 0 1rem;
+            opacity: 0.7;
+        }}
+
+        .scroll-text {{
+            font-size: 1.1rem;
+            display: inline;
+        }}
+
+        @media only screen and (max-width: 600px) {{
+            .wrapper {{
+                height: 50px;
+            }}
+
+            .logo {{
+                height: 18px;
+                margin: 0 0.5rem;
+            }}
+
+            .scroll-text {{
+                font-size: 0.85rem;
+            }}
+
+            .material-symbols-outlined {{
+                font-size: 20px;
+                margin: 0 0.5rem;
+            }}
+
+            .scrolling-container {{
+                animation-duration: 20s;
+            }}
+        }}
+        </style>
+
+        <div class="wrapper">
+            <div class="scrolling-container">
+                <span class="material-symbols-outlined">mindfulness</span>
+                <span class="scroll-text">Self Daily &nbsp;&nbsp;&nbsp;</span>
+                <span class="material-symbols-outlined">planner_review</span>
+                <span class="scroll-text">Interval &nbsp;&nbsp;&nbsp;</span>
+                <span class="material-symbols-outlined">qr_code </span>
+                <span class="scroll-text">Data Science &nbsp;&nbsp;&nbsp;</span>
+                <span class="material-symbols-outlined">palette </span>
+                <span class="scroll-text">Streamlit v1.45.1 &nbsp;&nbsp;&nbsp;</span>
+                <span class="material-symbols-outlined">code </span>
+                <span class="scroll-text">Powered by Python</span>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.divider()
+
+        st.markdown(f"""
+        <div style="text-align: center;">
+            <p style="color: grey; font-size: 0.875rem;">
+                Made with ❤️ by <span style="color: #1f77b4;">Naufal Nashif</span> ©️ {year_now}
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
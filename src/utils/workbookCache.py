@@ -0,0 +1,388 @@
+import hashlib
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from io import BytesIO
+
+import pandas as pd
+
+from utils.workbookInspector import WorkbookInspector
+
+
+def read_file_bytes(f):
+    """
+    Ambil isi mentah file upload (UploadedFile / BytesIO / path) sebagai bytes.
+    """
+    if isinstance(f, (str, os.PathLike)):
+        with open(f, 'rb') as fh:
+            return fh.read()
+    if hasattr(f, 'getvalue'):
+        return f.getvalue()
+    pos = f.tell()
+    f.seek(0)
+    data = f.read()
+    f.seek(pos)
+    return data
+
+
+# Digest per UploadedFile.file_id (isi upload Streamlit tetap selama file_id sama),
+# supaya upload besar tidak di-hash ulang di setiap rerun
+_upload_digests = OrderedDict()
+_upload_digests_lock = threading.Lock()
+MAX_UPLOAD_DIGESTS = 1024
+
+
+def file_hash(f):
+    """
+    Hash isi file (bukan nama file), jadi upload ulang file yang sama tetap kena cache.
+    Untuk UploadedFile hasilnya diingat per `file_id`.
+    """
+    file_id = getattr(f, 'file_id', None)
+    if file_id is not None:
+        with _upload_digests_lock:
+            digest = _upload_digests.get(file_id)
+            if digest is not None:
+                _upload_digests.move_to_end(file_id)
+                return digest
+    digest = hashlib.blake2b(read_file_bytes(f), digest_size=16).hexdigest()
+    if file_id is not None:
+        with _upload_digests_lock:
+            _upload_digests[file_id] = digest
+            while len(_upload_digests) > MAX_UPLOAD_DIGESTS:
+                _upload_digests.popitem(last=False)
+    return digest
+
+
+def default_workers():
+    env = os.environ.get('EVAL_INGEST_WORKERS')
+    if env:
+        return max(1, int(env))
+    return min(4, os.cpu_count() or 1)
+
+
+def process_pool(max_workers):
+    """
+    ProcessPoolExecutor dengan start method 'forkserver' ('spawn' bila tidak tersedia,
+    mis. Windows). Pool dibuat dari server Streamlit / thread background yang multithread;
+    dengan 'fork' child bisa mewarisi lock yang sedang dipegang thread lain lalu macet.
+    """
+    import multiprocessing
+
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
+
+
+def open_inspector(data):
+    """
+    WorkbookInspector untuk bytes .xlsx; None bila bukan arsip xlsx yang valid
+    (pemanggil lalu kembali ke pandas/openpyxl biasa).
+    """
+    try:
+        return WorkbookInspector(data)
+    except (zipfile.BadZipFile, KeyError):
+        return None
+
+
+def _parse_workbook_sheet(data, sheet_name):
+    """
+    Dijalankan di worker pool: parse satu workbook dari bytes.
+    Return (nama_sheet, df) dengan df None bila sheet tidak ada.
+    Nama sheet dibaca dari metadata zip; workbook hanya dimuat bila sheet ada.
+    """
+    inspector = open_inspector(data)
+    if inspector is None:
+        xls = pd.ExcelFile(BytesIO(data))
+        names = xls.sheet_names
+        if sheet_name not in names:
+            return names, None
+        return names, pd.read_excel(xls, sheet_name=sheet_name)
+    try:
+        names = inspector.sheet_names
+        if sheet_name not in names:
+            return names, None
+        return names, inspector.read_sheet(sheet_name)
+    finally:
+        inspector.close()
+
+
+class WorkbookCache:
+    """
+    Cache DataFrame hasil parsing per (hash isi file, nama sheet) dengan eviksi LRU
+    berbasis ukuran memori. Satu instance dipakai bersama oleh semua rerun dan session.
+    Bila `store` (ParquetStore) diberikan, sheet yang baru di-parse juga di-spill ke disk
+    sehingga proses/run berikutnya tidak perlu membuka .xlsx lagi.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, store=None):
+        self.max_bytes = max_bytes
+        self.store = store
+        self._frames = OrderedDict()  # (file_hash, sheet_name, kolom) -> (df, nbytes)
+        self._sheet_names = {}        # file_hash -> list nama sheet
+        self._sheet_info = {}         # file_hash -> metadata sheet (baris, kolom, header)
+        # Inspector yang sudah membuka zip saat daftar sheet dibaca, dipakai ulang oleh read_sheet
+        self._inspectors = OrderedDict()
+        self.max_open_inspectors = 4
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def sheet_names(self, f, digest=None):
+        digest = digest or file_hash(f)
+        with self._lock:
+            names = self._sheet_names.get(digest)
+        if names is not None:
+            return names
+        if self.store is not None:
+            names = self.store.sheet_names(digest)
+        if names is None:
+            # Cukup baca xl/workbook.xml dari zip, bukan memuat seluruh workbook
+            inspector = self._inspector(f, digest)
+            names = inspector.sheet_names if inspector is not None else pd.ExcelFile(f).sheet_names
+            if self.store is not None:
+                self.store.write_sheet_names(digest, names)
+        with self._lock:
+            self._sheet_names[digest] = names
+        return names
+
+    def sheet_info(self, f, digest=None):
+        """
+        Metadata tiap sheet tanpa parsing isi: [{name, rows, cols, header}]
+        (`rows` termasuk header). List kosong bila file bukan .xlsx.
+        """
+        digest = digest or file_hash(f)
+        with self._lock:
+            info = self._sheet_info.get(digest)
+        if info is None:
+            inspector = self._inspector(f, digest)
+            info = inspector.sheets() if inspector is not None else []
+            with self._lock:
+                self._sheet_info[digest] = info
+        return info
+
+    def _inspector(self, f, digest):
+        with self._lock:
+            inspector = self._inspectors.get(digest)
+            if inspector is not None:
+                self._inspectors.move_to_end(digest)
+                return inspector
+        inspector = open_inspector(read_file_bytes(f))
+        if inspector is None:
+            return None
+        with self._lock:
+            self._inspectors[digest] = inspector
+            while len(self._inspectors) > self.max_open_inspectors:
+                self._inspectors.popitem(last=False)[1].close()
+        return inspector
+
+    def _take_inspector(self, digest):
+        with self._lock:
+            return self._inspectors.pop(digest, None)
+
+    def read_sheet(self, f, sheet_name, digest=None, columns=None):
+        """
+        Return DataFrame untuk sheet tertentu. Hasil yang dikembalikan adalah salinan
+        dangkal, jadi penambahan kolom oleh pemanggil tidak mengubah isi cache.
+        `columns` membatasi kolom yang dibaca; kolom yang tidak ada di sheet diabaikan.
+        """
+        digest = digest or file_hash(f)
+        cols_key = tuple(columns) if columns is not None else None
+        key = (digest, sheet_name, cols_key)
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return entry[0].copy(deep=False)
+            self.misses += 1
+
+        df = None
+        if self.store is not None and self.store.has(digest, sheet_name):
+            try:
+                df = self.store.read(digest, sheet_name, columns=columns)
+            except OSError:
+                df = None  # Entri baru saja di-prune proses lain: parse ulang
+        if df is None:
+            # Zip yang sudah dibuka saat membaca daftar sheet dipakai ulang
+            inspector = self._take_inspector(digest) or open_inspector(read_file_bytes(f))
+            if inspector is None:
+                df = pd.read_excel(f, sheet_name=sheet_name)
+            else:
+                try:
+                    # Tanpa store cukup konversi kolom yang diminta; store butuh sheet lengkap
+                    df = inspector.read_sheet(sheet_name, columns=columns if self.store is None else None)
+                finally:
+                    inspector.close()
+            if self.store is not None:
+                self.store.write(digest, sheet_name, df)
+            if columns is not None:
+                df = df[[c for c in df.columns if c in set(columns)]]
+        self.put(digest, sheet_name, df, columns=cols_key)
+        return df.copy(deep=False)
+
+    def get(self, digest, sheet_name, columns=None):
+        """
+        Ambil entri yang sudah ada tanpa parsing; None bila belum ada.
+        """
+        key = (digest, sheet_name, columns)
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return entry[0].copy(deep=False)
+
+    def is_ready(self, digest, sheet_name, cols_key=None):
+        """
+        True bila sheet bisa diambil tanpa parsing .xlsx (ada di memori/store, atau
+        sudah diketahui tidak ada di workbook).
+        """
+        with self._lock:
+            if (digest, sheet_name, cols_key) in self._frames:
+                return True
+            names = self._sheet_names.get(digest)
+        if names is not None and sheet_name not in names:
+            return True
+        if self.store is not None:
+            names = self.store.sheet_names(digest)
+            if names is not None and (sheet_name not in names or self.store.has(digest, sheet_name)):
+                return True
+        return False
+
+    def prefetch(self, items, sheet_name, columns=None, workers=2, use_processes=True):
+        """
+        Parse paralel semua file yang belum ada di cache/store, lalu simpan hasilnya.
+        `items` berisi pasangan (file, digest). Error per file diabaikan di sini;
+        pembacaan serial setelahnya yang akan melaporkan error tsb ke UI.
+        """
+        cols_key = tuple(columns) if columns is not None else None
+        pending = {}
+        for f, digest in items:
+            if digest not in pending and not self.is_ready(digest, sheet_name, cols_key):
+                pending[digest] = read_file_bytes(f)
+        if len(pending) < 2 or workers < 2:
+            return 0
+
+        executor_cls = process_pool if use_processes else ThreadPoolExecutor
+        parsed = 0
+        try:
+            with executor_cls(max_workers=min(workers, len(pending))) as ex:
+                futures = {
+                    ex.submit(_parse_workbook_sheet, data, sheet_name): digest
+                    for digest, data in pending.items()
+                }
+                for fut in as_completed(futures):
+                    digest = futures[fut]
+                    try:
+                        names, df = fut.result()
+                    except Exception:
+                        continue
+                    if self.store_parsed(digest, sheet_name, names, df, columns):
+                        parsed += 1
+        except Exception:
+            # Pool gagal (mis. proses worker mati): biarkan jalur serial yang menangani
+            pass
+        return parsed
+
+    def store_parsed(self, digest, sheet_name, names, df, columns=None):
+        """
+        Simpan hasil _parse_workbook_sheet dari worker: daftar sheet, spill Parquet,
+        lalu frame (terproyeksi ke `columns`) di memori. Return False bila sheet tidak ada.
+        """
+        cols_key = tuple(columns) if columns is not None else None
+        with self._lock:
+            self._sheet_names[digest] = names
+            self.misses += 1
+        if self.store is not None:
+            self.store.write_sheet_names(digest, names)
+        if df is None:
+            return False
+        if self.store is not None:
+            self.store.write(digest, sheet_name, df)
+        if columns is not None:
+            df = df[[c for c in df.columns if c in set(columns)]]
+        self.put(digest, sheet_name, df, columns=cols_key)
+        return True
+
+    def put(self, digest, sheet_name, df, columns=None):
+        nbytes = int(df.memory_usage(deep=True).sum())
+        key = (digest, sheet_name, columns)
+        with self._lock:
+            old = self._frames.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            # Frame yang lebih besar dari batas total tidak disimpan sama sekali
+            if nbytes > self.max_bytes:
+                return
+            self._frames[key] = (df, nbytes)
+            self._total_bytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._frames:
+            _, (_, nbytes) = self._frames.popitem(last=False)
+            self._total_bytes -= nbytes
+
+    def invalidate(self, digest=None, sheet_name=None, include_store=False):
+        """
+        Hapus entri cache. Tanpa argumen: kosongkan semuanya. Dengan `digest` saja:
+        hapus semua sheet dari file tsb. Dengan keduanya: hapus satu sheet saja.
+        `include_store=True` ikut menghapus spill Parquet file tsb di disk.
+        """
+        if include_store and self.store is not None and sheet_name is None:
+            self.store.invalidate(digest)
+        with self._lock:
+            if digest is None:
+                self._frames.clear()
+                self._sheet_names.clear()
+                self._sheet_info.clear()
+                for inspector in self._inspectors.values():
+                    inspector.close()
+                self._inspectors.clear()
+                self._total_bytes = 0
+                return
+            keys = [
+                k for k in self._frames
+                if k[0] == digest and (sheet_name is None or k[1] == sheet_name)
+            ]
+            for k in keys:
+                _, nbytes = self._frames.pop(k)
+                self._total_bytes -= nbytes
+            if sheet_name is None:
+                self._sheet_names.pop(digest, None)
+                self._sheet_info.pop(digest, None)
+                inspector = self._inspectors.pop(digest, None)
+                if inspector is not None:
+                    inspector.close()
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._frames),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+def default_store():
+    # Spill Parquet bisa dimatikan dengan EVAL_STORE_DIR="" (mis. di filesystem read-only)
+    if os.environ.get('EVAL_STORE_DIR') == '':
+        return None
+    try:
+        from utils.parquetStore import ParquetStore
+        return ParquetStore()
+    except (ImportError, OSError):
+        return None
+
+
+# Instance global per proses: dipakai lintas rerun dan lintas session Streamlit
+workbook_cache = WorkbookCache(store=default_store())
@@ -0,0 +1,220 @@
+import posixpath
+import re
+import threading
+import zipfile
+from io import BytesIO
+from xml.etree.ElementTree import iterparse
+
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+_ROW_NUM = re.compile(rb'<(?:\w+:)?row[^>]*?\sr="(\d+)"')
+
+
+def _col_index(letters):
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def _parse_ref(ref):
+    """
+    'A1:F1501' -> (rows, cols); None bila ref tidak lengkap.
+    """
+    parts = ref.split(':')
+    if len(parts) != 2:
+        return None
+    first, last = _CELL_REF.fullmatch(parts[0]), _CELL_REF.fullmatch(parts[1])
+    if not first or not last:
+        return None
+    rows = int(last.group(2)) - int(first.group(2)) + 1
+    cols = _col_index(last.group(1)) - _col_index(first.group(1)) + 1
+    return rows, cols
+
+
+class WorkbookInspector:
+    """
+    Baca metadata .xlsx langsung dari arsip zip tanpa memuat workbook:
+    nama sheet dari `xl/workbook.xml`, jumlah baris/kolom dari elemen
+    `<dimension>` (atau nomor `<row>` terakhir bila tidak ada / basi) dan baris header.
+    Bytes yang sama dipakai ulang untuk `read_sheet`, jadi upload cukup dibaca sekali.
+
+    Aman dipakai bersama antar thread: akses ke arsip dan state sharedStrings
+    diserialkan oleh satu lock. `close()` hanya melepas handle zip; pemakaian
+    berikutnya membuka ulang arsip dari bytes yang sama, jadi inspector yang ditutup
+    cache (LRU) saat thread lain masih memakainya tetap berfungsi.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._lock = threading.RLock()
+        self._zip = zipfile.ZipFile(BytesIO(self.data))
+        self._sheets = None
+        self._info = {}
+        self._shared_strings = None
+        self._shared_fh = None
+        self._shared_iter = None
+
+    @property
+    def zip(self):
+        with self._lock:
+            if self._zip is None:
+                self._zip = zipfile.ZipFile(BytesIO(self.data))
+            return self._zip
+
+    @property
+    def sheet_names(self):
+        with self._lock:
+            return list(self._sheet_paths())
+
+    def _sheet_paths(self):
+        if self._sheets is None:
+            targets = {}
+            with self.zip.open('xl/_rels/workbook.xml.rels') as fh:
+                for _, el in iterparse(fh):
+                    if el.tag == f'{PKG_REL_NS}Relationship':
+                        targets[el.get('Id')] = el.get('Target')
+            sheets = {}
+            with self.zip.open('xl/workbook.xml') as fh:
+                for _, el in iterparse(fh):
+                    if el.tag == f'{MAIN_NS}sheet':
+                        target = targets.get(el.get(f'{REL_NS}id'), '')
+                        path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+                        sheets[el.get('name')] = path
+                    elif el.tag == f'{MAIN_NS}sheets':
+                        break
+            self._sheets = sheets
+        return self._sheets
+
+    def _shared_string(self, index):
+        # sharedStrings hanya dibaca sampai indeks yang dibutuhkan header
+        if self._shared_strings is None:
+            self._shared_strings = []
+            self._shared_iter = None
+            if 'xl/sharedStrings.xml' in self.zip.namelist():
+                self._shared_fh = self.zip.open('xl/sharedStrings.xml')
+                self._shared_iter = iterparse(self._shared_fh)
+        while len(self._shared_strings) <= index and self._shared_iter is not None:
+            try:
+                _, el = next(self._shared_iter)
+            except StopIteration:
+                self._close_shared()
+                break
+            if el.tag == f'{MAIN_NS}si':
+                self._shared_strings.append(''.join(t.text or '' for t in el.iter(f'{MAIN_NS}t')))
+                el.clear()
+        return self._shared_strings[index] if index < len(self._shared_strings) else None
+
+    def sheet_info(self, sheet_name):
+        """
+        Return dict {name, rows, cols, header}; `rows` termasuk baris header.
+        """
+        with self._lock:
+            if sheet_name not in self._info:
+                self._info[sheet_name] = self._read_info(sheet_name)
+            return self._info[sheet_name]
+
+    def _read_info(self, sheet_name):
+        path = self._sheet_paths()[sheet_name]
+        info = {'name': sheet_name, 'rows': None, 'cols': None, 'header': []}
+        header = {}
+        in_first_row = False
+        with self.zip.open(path) as fh:
+            for event, el in iterparse(fh, events=('start', 'end')):
+                tag = el.tag
+                if event == 'start':
+                    if tag == f'{MAIN_NS}dimension':
+                        size = _parse_ref(el.get('ref', ''))
+                        if size:
+                            info['rows'], info['cols'] = size
+                    elif tag == f'{MAIN_NS}row' and not in_first_row:
+                        in_first_row = True
+                    continue
+                if tag == f'{MAIN_NS}c' and in_first_row:
+                    ref = _CELL_REF.fullmatch(el.get('r', ''))
+                    col = _col_index(ref.group(1)) if ref else len(header) + 1
+                    header[col] = self._cell_text(el)
+                elif tag == f'{MAIN_NS}row':
+                    break
+        if header:
+            info['header'] = [header.get(i) for i in range(1, max(header) + 1)]
+        # <dimension> bisa basi (writer yang hanya menulis 'A1' / 'A1:A1'): dimensi satu
+        # baris atau lebih sempit dari header tidak dipercaya, baris dihitung ulang
+        stale = info['rows'] is not None and (info['rows'] <= 1 or info['cols'] < len(info['header']))
+        if info['rows'] is None or stale:
+            info['rows'] = self._scan_rows(path)
+            info['cols'] = max(info['cols'] or 0, len(info['header'])) or None
+        return info
+
+    def _cell_text(self, el):
+        kind = el.get('t')
+        if kind == 'inlineStr':
+            return ''.join(t.text or '' for t in el.iter(f'{MAIN_NS}t'))
+        value = el.find(f'{MAIN_NS}v')
+        if value is None or value.text is None:
+            return None
+        if kind == 's':
+            return self._shared_string(int(value.text))
+        return value.text
+
+    def _scan_rows(self, path, chunk_size=1 << 20):
+        # Tanpa <dimension> yang bisa dipercaya: cari nomor <row r="..."> terakhir (dekompresi saja, tanpa parsing XML)
+        last = None
+        tail = b''
+        with self.zip.open(path) as fh:
+            while True:
+                chunk = fh.read(chunk_size)
+                if not chunk:
+                    break
+                block = tail + chunk
+                for match in _ROW_NUM.finditer(block):
+                    last = match.group(1)
+                tail = block[-64:]
+        return int(last) if last is not None else 0
+
+    def sheets(self):
+        with self._lock:
+            return [self.sheet_info(name) for name in self.sheet_names]
+
+    def read_sheet(self, sheet_name, columns=None):
+        """
+        Baca satu sheet lengkap dengan pandas dari bytes yang sama. Dengan `columns`,
+        hanya kolom header yang diminta yang dikonversi (usecols).
+        """
+        import pandas as pd
+
+        usecols = None
+        if columns is not None:
+            wanted = set(columns)
+            usecols = [c for c in self.sheet_info(sheet_name)['header'] if c in wanted] or None
+        return pd.read_excel(BytesIO(self.data), sheet_name=sheet_name, usecols=usecols)
+
+    def _close_shared(self):
+        if self._shared_fh is not None:
+            self._shared_fh.close()
+        self._shared_fh = None
+        self._shared_iter = None
+
+    def close(self):
+        with self._lock:
+            # Iterator sharedStrings terikat ke handle zip: dibaca ulang dari awal bila perlu
+            if self._shared_iter is not None:
+                self._shared_strings = None
+            self._close_shared()
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+
+
+def inspect_workbook(data):
+    """
+    Ringkasan semua sheet (dari bytes .xlsx) tanpa memuat workbook: [{name, rows, cols, header}].
+    """
+    inspector = WorkbookInspector(data)
+    try:
+        return inspector.sheets()
+    finally:
+        inspector.close()
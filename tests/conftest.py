@@ -0,0 +1,85 @@
+import os
+import sys
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from utils.myFunc import ExcelAnalyzer  # noqa: E402
+from utils.workbookCache import WorkbookCache  # noqa: E402
+
+VERIF_COL = 'Verivikasi Pengawas'
+# Label di luar TP/TN/FP/FN dan NaN sengaja ikut, seperti export asli
+VERIF_VALUES = ['True Positive', 'True Negative', 'False Positive', 'False Negative', 'Belum Diverifikasi', None]
+
+
+def make_frame(rows=600, seed=0, n_emiten=6, nan_keys=True):
+    """
+    Data evaluasi kecil: Key berformat <emiten>_<tahun>_<tipe>, sebagian Key NaN.
+    """
+    rng = np.random.default_rng(seed)
+    emiten = np.array([f'E{i:02d}' for i in range(n_emiten)])[rng.integers(0, n_emiten, rows)]
+    year = rng.choice(['2023', '2024'], rows)
+    kind = rng.choice(['AR', 'SR'], rows)
+    key = pd.Series(emiten).str.cat([pd.Series(year), pd.Series(kind)], sep='_').astype(object)
+    if nan_keys:
+        key[rng.random(rows) < 0.05] = np.nan
+    verif = np.array(VERIF_VALUES, dtype=object)[rng.choice(len(VERIF_VALUES), rows, p=[.3, .3, .15, .15, .05, .05])]
+    return pd.DataFrame({
+        'Key': key,
+        'Type': kind,
+        'Bab': rng.choice(['Bab 1', 'Bab 2', 'Bab 3'], rows),
+        'Emiten': emiten,
+        'Refinement Parameter': rng.choice([f'P{i}' for i in range(8)], rows),
+        VERIF_COL: verif,
+    })
+
+
+def upload(df, name, sheet_name='Sheet1'):
+    """
+    Workbook .xlsx dari `df` sebagai file-like bernama (seperti UploadedFile).
+    """
+    buf = BytesIO()
+    df.to_excel(buf, index=False, sheet_name=sheet_name)
+    f = BytesIO(buf.getvalue())
+    f.name = name
+    f.size = len(f.getvalue())
+    return f
+
+
+@pytest.fixture
+def analyzer():
+    warnings = []
+    an = ExcelAnalyzer(cache=WorkbookCache(store=None), workers=1, warn=warnings.append)
+    an.warnings = warnings
+    return an
+
+
+@pytest.fixture
+def new_analyzer():
+    def build():
+        return ExcelAnalyzer(cache=WorkbookCache(store=None), workers=1, warn=lambda msg: None)
+    return build
+
+
+def stale_dimension(f, ref='A1'):
+    """
+    Salinan workbook dengan `<dimension>` basi, seperti hasil sebagian writer non-Excel.
+    """
+    import re
+    import zipfile
+
+    src, buf = zipfile.ZipFile(BytesIO(f.getvalue())), BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as out:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename.startswith('xl/worksheets/'):
+                data = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="' + ref.encode() + b'"', data)
+            out.writestr(item, data)
+    stale = BytesIO(buf.getvalue())
+    stale.name = f.name
+    stale.size = len(stale.getvalue())
+    return stale
@@ -0,0 +1,37 @@
+from conftest import make_frame, upload
+from utils import backgroundIngest
+from utils.backgroundIngest import CANCELLED, DONE, ERROR, IngestJob
+from utils.workbookCache import WorkbookCache
+
+
+def _files(n=3):
+    return [upload(make_frame(rows=60, seed=80 + i), f'run_{i}.xlsx') for i in range(n)]
+
+
+def test_cancel_between_submits_reports_cancelled(monkeypatch):
+    files = _files()
+    job = IngestJob(files, 'Sheet1', cache=WorkbookCache(store=None), workers=2, use_processes=False)
+    read_file_bytes = backgroundIngest.read_file_bytes
+
+    def read_then_cancel(f):
+        # cancel() mendarat tepat sebelum submit file kedua (setelah shutdown pool)
+        if f is files[1]:
+            job.cancel()
+        return read_file_bytes(f)
+
+    monkeypatch.setattr(backgroundIngest, 'read_file_bytes', read_then_cancel)
+    assert job.start().wait(timeout=60)
+    statuses = {name: status for name, status, _ in job.statuses()}
+    assert ERROR not in statuses.values()
+    assert statuses['run_1.xlsx'] == statuses['run_2.xlsx'] == CANCELLED
+    assert job.cancelled
+
+
+def test_process_pool_job_parses_every_file():
+    files = _files()
+    cache = WorkbookCache(store=None)
+    job = IngestJob(files, 'Sheet1', cache=cache, workers=2, use_processes=True).start()
+    assert job.wait(timeout=120)
+    assert [status for _, status, _ in job.statuses()] == [DONE] * len(files)
+    assert job.ready_files() == files
+    assert all(cache.is_ready(digest, 'Sheet1') for digest in job.digests)
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import batch_eval
+from conftest import make_frame
+
+
+def test_same_file_name_in_subfolders_stays_separate(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_eval, 'default_store', lambda: None)
+    for i, sub in enumerate(['model_a', 'model_b']):
+        os.makedirs(tmp_path / sub)
+        make_frame(rows=120, seed=30 + i).to_excel(tmp_path / sub / 'eval.xlsx', index=False)
+
+    paths = batch_eval.resolve_inputs([str(tmp_path)])
+    counts, warnings = batch_eval.run(paths)
+
+    assert warnings == []
+    files = counts.index.get_level_values('filename').unique().tolist()
+    assert sorted(files) == ['model_a/eval.xlsx', 'model_b/eval.xlsx']
+    assert int(counts['Rows'].sum()) == 240
+
+
+def test_single_file_keeps_its_name(tmp_path):
+    path = str(tmp_path / 'eval.xlsx')
+    assert batch_eval.file_labels([path]) == {path: 'eval.xlsx'}
+
+
+def test_analytics_import_does_not_load_streamlit():
+    code = (
+        "import sys; sys.path.insert(0, 'src'); import utils.myFunc as m; "
+        "assert 'streamlit' not in sys.modules; "
+        "from utils.myFunc import UIComponents; "
+        "assert UIComponents is sys.modules['utils.uiComponents'].UIComponents"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
+
+
+def test_bootstrap_requires_ci(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        batch_eval.main([str(tmp_path), '--bootstrap', '100'])
+    assert exc.value.code == 2
+    assert '--bootstrap butuh --ci' in capsys.readouterr().err
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import confidence
+from utils.confidence import (
+    bootstrap_f1_interval, clopper_pearson_interval, confusion_intervals, wilson_interval,
+)
+
+
+def _pair(interval, k, n, confidence_level=0.95):
+    low, high = interval(np.array([k]), np.array([n]), confidence_level)
+    return low[0], high[0]
+
+
+@pytest.mark.parametrize('k, n, expected', [
+    (0, 10, (0.0, 0.2775)),
+    (5, 10, (0.2366, 0.7634)),
+    (10, 10, (0.7225, 1.0)),
+    (81, 263, (0.2553, 0.3662)),
+])
+def test_wilson_known_values(k, n, expected):
+    np.testing.assert_allclose(_pair(wilson_interval, k, n), expected, atol=1e-4)
+
+
+# Nilai acuan: inversi langsung jumlah peluang binomial (aritmetika eksak)
+@pytest.mark.parametrize('k, n, expected', [
+    (5, 10, (0.18709, 0.81291)),
+    (1, 10, (0.00253, 0.44502)),
+    (0, 10, (0.0, 0.30850)),
+    (10, 10, (0.69150, 1.0)),
+    (81, 263, (0.252737, 0.367622)),
+    (1, 1, (0.025, 1.0)),
+])
+def test_clopper_pearson_known_values(k, n, expected):
+    np.testing.assert_allclose(_pair(clopper_pearson_interval, k, n), expected, atol=1e-5)
+
+
+def test_clopper_pearson_other_confidence_levels():
+    # CP(0, n) punya bentuk tertutup: batas atas = 1 - (alpha/2)^(1/n)
+    for level in (0.90, 0.99):
+        _, high = _pair(clopper_pearson_interval, 0, 20, level)
+        assert high == pytest.approx(1 - ((1 - level) / 2) ** (1 / 20), abs=1e-10)
+
+
+@pytest.mark.parametrize('interval', [wilson_interval, clopper_pearson_interval])
+def test_empty_denominator_is_nan(interval):
+    low, high = interval(np.array([0, 3]), np.array([0, 6]))
+    assert np.isnan(low[0]) and np.isnan(high[0])
+    assert 0 < low[1] < 0.5 < high[1] < 1
+
+
+def test_bootstrap_f1_follows_point_estimate_convention():
+    tp = np.array([40, 0, 0, 5])
+    fp = np.array([10, 7, 0, 0])
+    fn = np.array([5, 3, 0, 0])
+    tn = np.array([45, 10, 0, 1])
+    low, high = bootstrap_f1_interval(tp, fp, fn, tn, n_boot=400)
+    f1 = 2 * 40 / (2 * 40 + 10 + 5)
+    assert low[0] < f1 < high[0]
+    # TP = 0 -> F1 tidak terdefinisi, sama seperti tabel metrik; n = 0 juga
+    assert np.isnan(low[1]) and np.isnan(high[1])
+    assert np.isnan(low[2]) and np.isnan(high[2])
+    # Tanpa FP/FN semua resample punya F1 = 1
+    assert low[3] == high[3] == 1.0
+
+
+def test_bootstrap_is_deterministic_per_seed():
+    counts = np.random.default_rng(3).integers(1, 50, (200, 4)).T
+    a = bootstrap_f1_interval(*counts, n_boot=200, seed=7)
+    b = bootstrap_f1_interval(*counts, n_boot=200, seed=7, max_block_bytes=1)
+    c = bootstrap_f1_interval(*counts, n_boot=200, seed=8)
+    np.testing.assert_array_equal(a[0], bootstrap_f1_interval(*counts, n_boot=200, seed=7)[0])
+    assert np.all(np.isfinite(b[0])) and not np.array_equal(a[0], c[0])
+
+
+def test_confusion_intervals_columns_and_memo(monkeypatch):
+    confidence._memo.clear()
+    counts = pd.DataFrame(
+        {'TP': [5, 0], 'TN': [3, 0], 'FP': [1, 0], 'FN': [1, 0]},
+        index=pd.Index(['A', 'B'], name='Key'),
+    )
+    first = confusion_intervals(counts, method='clopper-pearson', n_boot=100)
+    assert list(first.columns) == [
+        'Accuracy Low', 'Accuracy High', 'Specificity Low', 'Specificity High',
+        'Recall Low', 'Recall High', 'Precision Low', 'Precision High',
+        'F1 Score Low', 'F1 Score High',
+    ]
+    assert first.loc['B'].isna().all()
+    np.testing.assert_allclose(first.loc['A', ['Accuracy Low', 'Accuracy High']],
+                               _pair(clopper_pearson_interval, 8, 10), atol=1e-12)
+
+    # Isi counts yang sama (index lain) -> dari memo, tanpa hitung ulang
+    monkeypatch.setattr(confidence, 'clopper_pearson_interval', lambda *a: pytest.fail("tidak dimemo"))
+    monkeypatch.setattr(confidence, 'bootstrap_f1_interval', lambda *a, **kw: pytest.fail("tidak dimemo"))
+    again = confusion_intervals(counts.set_axis(['X', 'Y']), method='clopper-pearson', n_boot=100)
+    assert list(again.index) == ['X', 'Y']
+    np.testing.assert_array_equal(again.to_numpy(), first.to_numpy())
+
+    # Hasil memo tidak ikut berubah bila pemanggil mengubah salinannya
+    again.iloc[0, 0] = -1
+    assert confusion_intervals(counts, method='clopper-pearson', n_boot=100).iloc[0, 0] != -1
+    with pytest.raises(ValueError):
+        confusion_intervals(counts, method='agresti')
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import VERIF_COL, make_frame
+from utils.myFunc import compact_dtypes
+
+METRICS = ['Accuracy', 'Specificity', 'Recall', 'Precision', 'F1 Score']
+
+
+def _stats(counts):
+    tp, tn = counts.get('True Positive', 0), counts.get('True Negative', 0)
+    fp, fn = counts.get('False Positive', 0), counts.get('False Negative', 0)
+    total = tp + tn + fp + fn
+    recall = tp / (tp + fn) if (tp + fn) else None
+    precision = tp / (tp + fp) if (tp + fp) else None
+    return {
+        'TP': tp, 'TN': tn, 'FP': fp, 'FN': fn, 'Total': total,
+        'Accuracy': (tp + tn) / total if total else None,
+        'Specificity': tn / (tn + fp) if (tn + fp) else None,
+        'Recall': recall,
+        'Precision': precision,
+        'F1 Score': (2 * precision * recall) / (precision + recall)
+        if (precision and recall and (precision + recall)) else None,
+    }
+
+
+def baseline_confusion_stats(df):
+    # Loop per grup dari versi awal calculate_confusion_stats
+    per_key, per_file = [], []
+    for key, group in df.groupby('Key'):
+        emiten, year, kind = key.split('_')
+        per_key.append({'filename': emiten, 'year': year, 'type': kind, **_stats(group[VERIF_COL].value_counts())})
+    for _, group in df.groupby('filename'):
+        per_file.append(_stats(group[VERIF_COL].value_counts()))
+    return pd.DataFrame(per_key), pd.DataFrame(per_file)
+
+
+def baseline_filter_and_group(df, category_col, verif, keys, types, top_n):
+    filtered = df[df[VERIF_COL].isin(verif)]
+    if keys:
+        filtered = filtered[filtered['Key'].isin(keys)]
+    if types:
+        filtered = filtered[filtered['Type'].isin(types)]
+    grouped = filtered[category_col].value_counts().reset_index()
+    grouped.columns = [category_col, 'Jumlah']
+    criteria = filtered.groupby([category_col, 'Refinement Parameter']).size().reset_index(name='Jumlah')
+    return grouped.head(top_n), grouped, criteria
+
+
+def _numeric(df, cols):
+    return df[cols].astype('float64').to_numpy()
+
+
+@pytest.fixture(params=[False, True], ids=['object', 'compact'])
+def dataset(request):
+    df = make_frame(rows=800, seed=3)
+    df['filename'] = np.where(np.arange(len(df)) % 3, 'a.xlsx', 'b.xlsx')
+    if request.param:
+        df, _ = compact_dtypes(df, category_cols=['Key', 'Type', 'Bab', 'Emiten', 'Refinement Parameter',
+                                                  VERIF_COL, 'filename'])
+    return df
+
+
+def test_confusion_stats_match_baseline_loop(analyzer, dataset):
+    analyzer.df = dataset
+    df_counts, df_metrics, df_counts_total, df_metrics_total = analyzer.calculate_confusion_stats()
+    ref_key, ref_file = baseline_confusion_stats(pd.DataFrame({c: dataset[c].astype(object) for c in dataset}))
+
+    assert df_counts[['filename', 'year', 'type']].values.tolist() == ref_key[['filename', 'year', 'type']].values.tolist()
+    counts = ['TP', 'TN', 'FP', 'FN', 'Total']
+    np.testing.assert_array_equal(_numeric(df_counts, counts), _numeric(ref_key, counts))
+    np.testing.assert_allclose(_numeric(df_metrics, METRICS), _numeric(ref_key, METRICS), equal_nan=True)
+    np.testing.assert_array_equal(_numeric(df_counts_total, counts), _numeric(ref_file, counts))
+    np.testing.assert_allclose(_numeric(df_metrics_total, METRICS), _numeric(ref_file, METRICS), equal_nan=True)
+    assert (df_counts_total[''] == 'Total').all()
+
+
+@pytest.mark.parametrize('category_col', ['Key', 'Bab', 'Emiten'])
+@pytest.mark.parametrize('verif, n_keys, types', [
+    (['True Positive'], 0, []),
+    (['True Positive', 'False Negative', 'Belum Diverifikasi'], 3, []),
+    (['False Positive'], 0, ['AR']),
+])
+def test_filter_and_group_match_baseline(analyzer, dataset, category_col, verif, n_keys, types):
+    keys = sorted(dataset['Key'].dropna().unique().tolist())[:n_keys]
+    analyzer.df = dataset
+    analyzer.category_col = category_col
+    analyzer.selected_verif = verif
+    analyzer.selected_key = keys
+    analyzer.selected_type = types
+    analyzer.top_n = 4
+    grouped, detail, criteria = analyzer.filter_and_group()
+    ref_grouped, ref_detail, ref_criteria = baseline_filter_and_group(
+        pd.DataFrame({c: dataset[c].astype(object) for c in dataset}), category_col, verif, keys, types, 4
+    )
+
+    def by_value(df, cols):
+        return df.astype({c: object for c in cols}).sort_values(cols).reset_index(drop=True).astype({'Jumlah': 'int64'})
+
+    pd.testing.assert_frame_equal(by_value(detail, [category_col]), by_value(ref_detail, [category_col]))
+    cols = [category_col, 'Refinement Parameter']
+    pd.testing.assert_frame_equal(by_value(criteria, cols), by_value(ref_criteria, cols))
+    # Urutan nilai yang seri boleh beda; jumlah top N harus sama
+    assert grouped['Jumlah'].tolist() == ref_grouped['Jumlah'].tolist()
+    assert detail['Jumlah'].is_monotonic_decreasing and criteria['Jumlah'].is_monotonic_decreasing
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+import requests
+
+from utils.demoAssets import DemoAssetManager
+
+
+class FakeSession:
+    """
+    Pengganti requests.Session: balas dari antrean respons, atau gagal seperti offline.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if not self.responses:
+            raise requests.ConnectionError("offline")
+        return self.responses.pop(0)
+
+
+def _response(status, content=b'', etag=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    if etag:
+        response.headers['ETag'] = etag
+    return response
+
+
+def _manager(cache_dir, session):
+    # max_age=0: setiap fetch merevalidasi ke server
+    return DemoAssetManager(source='https://example.test/demo.xlsx', cache_dir=str(cache_dir),
+                            max_age=0, session=session)
+
+
+def test_etag_not_modified_uses_cached_copy(tmp_path):
+    first = FakeSession(_response(200, b'versi-1', etag='"v1"'))
+    assert _manager(tmp_path, first).fetch_bytes() == (b'versi-1', 'network')
+    assert first.requests == [{}]
+
+    again = FakeSession(_response(304))
+    assert _manager(tmp_path, again).fetch_bytes() == (b'versi-1', 'cache (not modified)')
+    assert again.requests[0]['If-None-Match'] == '"v1"'
+
+
+def test_offline_falls_back_to_cached_copy(tmp_path):
+    _manager(tmp_path, FakeSession(_response(200, b'versi-1', etag='"v1"'))).fetch_bytes()
+    offline = _manager(tmp_path, FakeSession())
+    assert offline.fetch_bytes() == (b'versi-1', 'cache (offline)')
+    demo_file, label = offline.fetch()
+    assert demo_file.getvalue() == b'versi-1' and demo_file.name == offline.filename
+
+
+def test_cold_cache_without_network_raises(tmp_path):
+    with pytest.raises(requests.ConnectionError):
+        _manager(tmp_path, FakeSession()).fetch_bytes()
+
+
+def test_cache_write_failure_still_returns_download(tmp_path):
+    blocked = tmp_path / 'bukan-folder'
+    blocked.write_text('file biasa, bukan folder')
+    manager = _manager(blocked, FakeSession(_response(200, b'versi-1')))
+    assert manager.fetch_bytes() == (b'versi-1', 'network')
+
+
+def test_cache_write_leaves_no_temp_files(tmp_path):
+    manager = _manager(tmp_path, FakeSession(_response(200, b'versi-1'), _response(200, b'versi-2')))
+    manager.fetch_bytes()
+    assert manager.fetch_bytes() == (b'versi-2', 'network')
+    assert sorted(os.listdir(tmp_path)) == sorted([manager.filename, manager.filename + '.meta.json'])
+
+
+def test_local_source_from_env(tmp_path, monkeypatch):
+    source = tmp_path / 'demo.xlsx'
+    source.write_bytes(b'lokal')
+    monkeypatch.setenv('EVAL_DEMO_SOURCE', str(source))
+    manager = DemoAssetManager(cache_dir=str(tmp_path / 'cache'), session=FakeSession())
+    assert manager.fetch_bytes() == (b'lokal', 'local')
+    assert manager.fetch_bytes() == (b'lokal', 'memory')
@@ -0,0 +1,39 @@
+from io import BytesIO
+
+from conftest import make_frame, upload
+from utils import backgroundIngest, myFunc, workbookCache
+
+
+def _no_hashing(*args, **kwargs):
+    raise AssertionError("file di-hash ulang")
+
+
+def test_uploaded_file_is_hashed_once_per_file_id(monkeypatch):
+    reads = []
+    read_file_bytes = workbookCache.read_file_bytes
+    monkeypatch.setattr(workbookCache, 'read_file_bytes', lambda f: reads.append(f) or read_file_bytes(f))
+    f = BytesIO(b'isi upload')
+    f.file_id = 'upload-1'
+    assert workbookCache.file_hash(f) == workbookCache.file_hash(f)
+    assert len(reads) == 1
+
+    plain = BytesIO(b'isi upload')
+    assert workbookCache.file_hash(plain) == workbookCache.file_hash(f)
+    assert len(reads) == 2
+
+
+def test_digests_are_passed_through_every_call(analyzer, monkeypatch):
+    files = [upload(make_frame(rows=80, seed=70 + i), f'run_{i}.xlsx') for i in range(2)]
+    digests = analyzer.file_digests(files)
+    monkeypatch.setattr(myFunc, 'file_hash', _no_hashing)
+    monkeypatch.setattr(workbookCache, 'file_hash', _no_hashing)
+    monkeypatch.setattr(backgroundIngest, 'file_hash', _no_hashing)
+
+    assert analyzer.get_all_sheet_names(files, digests) == ['Sheet1']
+    assert analyzer.sheet_rows(files, 'Sheet1', digests) == {'run_0.xlsx': 80, 'run_1.xlsx': 80}
+    token = backgroundIngest.job_token(files, 'Sheet1', digests=digests)
+    assert [d for d, _ in token[0]] == digests
+    df = analyzer.load_and_concat_sheets(files, 'Sheet1', digests=digests)
+    assert len(df) == 160
+    assert len(analyzer.load_streaming(files, 'Sheet1', digests=digests)) > 0
+    assert analyzer.warnings == []
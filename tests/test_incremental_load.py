@@ -0,0 +1,87 @@
+import threading
+
+import pandas as pd
+
+from conftest import VERIF_COL, make_frame, upload
+from utils.myFunc import ExcelAnalyzer, confusion_tables
+from utils.workbookCache import WorkbookCache
+
+
+def _files():
+    return [upload(make_frame(rows=300, seed=i), f'run_{i}.xlsx') for i in range(4)]
+
+
+def _load(analyzer, files):
+    analyzer.df = analyzer.load_and_concat_sheets(files, 'Sheet1')
+    return analyzer.df
+
+
+def _assert_same_stats(an, fresh):
+    for ours, ref in zip(an.calculate_confusion_stats(), fresh.calculate_confusion_stats()):
+        pd.testing.assert_frame_equal(ours, ref)
+
+
+def test_add_and_remove_files_match_fresh_load(analyzer, new_analyzer):
+    files = _files()
+    _load(analyzer, files[:2])
+    steps = [files[:3], files, files[1:], [files[3], files[0]], files[2:3]]
+    for subset in steps:
+        df = _load(analyzer, subset)
+        fresh = new_analyzer()
+        ref = _load(fresh, subset)
+        pd.testing.assert_frame_equal(df, ref)
+        _assert_same_stats(analyzer, fresh)
+
+
+def test_only_new_files_are_parsed(analyzer):
+    files = _files()
+    _load(analyzer, files[:2])
+    parsed = []
+    read_sheet = analyzer.cache.read_sheet
+    analyzer.cache.read_sheet = lambda f, *a, **kw: parsed.append(f.name) or read_sheet(f, *a, **kw)
+    _load(analyzer, files)
+    assert parsed == ['run_2.xlsx', 'run_3.xlsx']
+
+
+def test_missing_sheet_is_skipped_with_warning(analyzer):
+    files = _files()[:2]
+    other = upload(make_frame(rows=10), 'other.xlsx', sheet_name='Lain')
+    df = analyzer.load_and_concat_sheets(files + [other], 'Sheet1')
+    assert set(df['filename'].unique()) == {'run_0.xlsx', 'run_1.xlsx'}
+    assert analyzer.warnings == ["File other.xlsx tidak punya sheet 'Sheet1', dilewati."]
+
+
+def _assert_matches_full_recount(an):
+    # Agregat inkremental vs hitung ulang penuh dari dataset gabungan
+    full = confusion_tables(an.confusion_counts(an.df))
+    for ours, ref in zip(an.calculate_confusion_stats(), full):
+        pd.testing.assert_frame_equal(ours, ref)
+
+
+def test_parts_without_key_or_verif_column_are_counted(analyzer):
+    files = _files()[:2]
+    no_key = upload(make_frame(rows=95, seed=7).drop(columns=['Key']), 'b.xlsx')
+    no_verif = upload(make_frame(rows=40, seed=8).drop(columns=[VERIF_COL]), 'c.xlsx')
+
+    _load(analyzer, files + [no_key])
+    _, _, df_counts_total, _ = analyzer.calculate_confusion_stats()
+    assert len(df_counts_total) == 3
+    _assert_matches_full_recount(analyzer)
+
+    _load(analyzer, files + [no_key, no_verif])
+    _assert_matches_full_recount(analyzer)
+    _load(analyzer, [no_key, files[1]])
+    _assert_matches_full_recount(analyzer)
+
+
+def test_process_pool_load_from_thread_matches_serial(new_analyzer):
+    # Seperti di server Streamlit: pool proses dibuat dari thread selain main thread
+    files = _files()
+    parallel = ExcelAnalyzer(cache=WorkbookCache(store=None), workers=2, use_processes=True, warn=lambda msg: None)
+    prefetch, parsed, result = parallel.cache.prefetch, [], {}
+    parallel.cache.prefetch = lambda *a, **kw: parsed.append(prefetch(*a, **kw))
+    worker = threading.Thread(target=lambda: result.update(df=_load(parallel, files)))
+    worker.start()
+    worker.join(timeout=120)
+    assert parsed == [len(files)]
+    pd.testing.assert_frame_equal(result['df'], _load(new_analyzer(), files))
@@ -0,0 +1,92 @@
+import os
+import time
+
+import pandas as pd
+
+from utils.parquetStore import ParquetStore
+
+
+def _frame(rows):
+    return pd.DataFrame({'Key': [f'K{i}' for i in range(rows)], 'n': range(rows)})
+
+
+def _age(store, digest, seconds):
+    manifest = os.path.join(store.root, digest, 'manifest.json')
+    used = time.time() - seconds
+    os.utime(manifest, (used, used))
+
+
+def test_prune_removes_least_recently_used_entries(tmp_path):
+    store = ParquetStore(str(tmp_path), max_bytes=0, max_age_s=0)
+    for i, digest in enumerate(['a' * 32, 'b' * 32, 'c' * 32]):
+        store.write(digest, 'Sheet1', _frame(2000))
+        _age(store, digest, 300 - i * 100)
+    sizes = {d: size for d, size, _ in store.entries()}
+    store.max_bytes = sizes['b' * 32] + sizes['c' * 32]
+
+    # Membaca 'a' menjadikannya yang terbaru dipakai; 'b' yang paling lama
+    store.read('a' * 32, 'Sheet1')
+    store.write('d' * 32, 'Sheet1', _frame(10))
+    remaining = {d for d, _, _ in store.entries()}
+    assert 'b' * 32 not in remaining
+    assert {'a' * 32, 'd' * 32} <= remaining
+    assert sum(size for _, size, _ in store.entries()) <= store.max_bytes
+
+
+def test_prune_removes_expired_entries(tmp_path):
+    store = ParquetStore(str(tmp_path), max_bytes=0, max_age_s=3600)
+    store.write('a' * 32, 'Sheet1', _frame(10))
+    _age(store, 'a' * 32, 7200)
+    store.write('b' * 32, 'Sheet1', _frame(10))
+    assert [d for d, _, _ in store.entries()] == ['b' * 32]
+
+
+def test_every_entry_has_a_manifest(tmp_path):
+    store = ParquetStore(str(tmp_path))
+    store.write('a' * 32, 'Sheet1', _frame(10))
+    assert store.sheet_names('a' * 32) is None
+    store.write_sheet_names('a' * 32, ['Sheet1'])
+    store.write('a' * 32, 'Sheet2', _frame(10))
+    assert store.sheet_names('a' * 32) == ['Sheet1']
+
+
+def test_invalidate_all_only_deletes_store_entries(tmp_path):
+    store = ParquetStore(str(tmp_path))
+    store.write('a' * 32, 'Sheet1', _frame(10))
+    other = tmp_path / 'bukan-store'
+    other.mkdir()
+    (other / 'data.txt').write_text('jangan dihapus')
+    (tmp_path / 'catatan.txt').write_text('jangan dihapus')
+
+    store.invalidate()
+    assert sorted(os.listdir(tmp_path)) == ['bukan-store', 'catatan.txt']
+    assert (other / 'data.txt').read_text() == 'jangan dihapus'
+
+
+def _read(cache):
+    from conftest import upload
+
+    df = pd.DataFrame({
+        'Key': ['A_2024_AR', None, 'B_2023_SR'],
+        'Campur': [7, 'teks', None],
+        'Nilai': [1.5, None, 2.0],
+    })
+    return cache.read_sheet(upload(df, 'campur.xlsx'), 'Sheet1')
+
+
+def test_store_round_trip_matches_fresh_parse(tmp_path):
+    from utils.workbookCache import WorkbookCache
+
+    fresh = _read(WorkbookCache(store=None))
+    first = _read(WorkbookCache(store=ParquetStore(str(tmp_path))))
+    again = _read(WorkbookCache(store=ParquetStore(str(tmp_path))))
+    for df in (first, again):
+        pd.testing.assert_frame_equal(df, fresh)
+    assert fresh['Campur'].tolist()[0] == 7
+
+    # Sheet tanpa kolom campur tetap di-spill dan dibaca ulang identik
+    store = ParquetStore(str(tmp_path / 'rapi'))
+    clean = fresh.drop(columns=['Campur'])
+    assert store.write('a' * 32, 'Sheet1', clean)
+    assert not store.write('b' * 32, 'Sheet1', fresh)
+    pd.testing.assert_frame_equal(store.read('a' * 32, 'Sheet1'), clean)
@@ -0,0 +1,35 @@
+import builtins
+import sys
+
+from utils import profiler
+
+
+def test_rss_without_resource_module(monkeypatch):
+    # Windows: tidak ada /proc maupun modul `resource`
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == 'resource':
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    def no_proc(*args, **kwargs):
+        raise OSError('tidak ada /proc')
+
+    monkeypatch.setattr(builtins, '__import__', fake_import)
+    monkeypatch.setattr(profiler, 'open', no_proc, raising=False)
+    assert profiler.peak_rss_bytes() == 0
+    assert profiler.rss_bytes() == 0
+
+
+def test_peak_rss_units(monkeypatch):
+    import resource
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    monkeypatch.setattr(sys, 'platform', 'darwin')
+    darwin = profiler.peak_rss_bytes()
+    monkeypatch.setattr(sys, 'platform', 'linux')
+    linux = profiler.peak_rss_bytes()
+    assert darwin >= usage.ru_maxrss
+    assert linux >= 1024 * usage.ru_maxrss
+    assert linux > darwin
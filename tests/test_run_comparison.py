@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from conftest import VERIF_COL, make_frame, upload
+
+OUTCOME_LABELS = ['True Positive', 'True Negative', 'False Positive', 'False Negative']
+
+
+def _changed(df, seed):
+    # Versi model lain: sebagian outcome berubah, item sama
+    out = df.copy()
+    rng = np.random.default_rng(seed)
+    flip = rng.random(len(out)) < 0.2
+    out.loc[flip, VERIF_COL] = out.loc[flip, VERIF_COL].replace({
+        'True Positive': 'False Negative', 'False Negative': 'True Positive',
+        'True Negative': 'False Positive', 'False Positive': 'True Negative',
+    })
+    return out
+
+
+def test_evaluation_sets_pair_files_of_each_set(analyzer, new_analyzer):
+    parts = [make_frame(rows=150, seed=40 + i, nan_keys=False) for i in range(2)]
+    changed = [_changed(df, 50 + i) for i, df in enumerate(parts)]
+    files = [upload(parts[0], 'v1_a.xlsx'), upload(changed[0], 'v2_a.xlsx'),
+             upload(parts[1], 'v1_b.xlsx'), upload(changed[1], 'v2_b.xlsx')]
+    analyzer.df = analyzer.load_and_concat_sheets(files, 'Sheet1')
+
+    groups = {'v1': ['v1_a.xlsx', 'v1_b.xlsx'], 'v2': ['v2_a.xlsx', 'v2_b.xlsx']}
+    summary, delta, flips = analyzer.compare_runs('v1', ['v2'], groups=groups)
+
+    # Pembanding: tiap pasangan file dibandingkan sendiri-sendiri lalu dijumlah
+    per_file = [
+        analyzer.compare_runs(f'v1_{s}.xlsx', [f'v2_{s}.xlsx'])[0].iloc[0] for s in 'ab'
+    ]
+    assert summary['Run'].tolist() == ['v2']
+    for col in ('Matched', 'Correct→Wrong', 'Wrong→Correct', 'Only in baseline', 'Only in run'):
+        assert summary[col].iloc[0] == sum(row[col] for row in per_file)
+    # Baris dengan label di luar TP/TN/FP/FN tidak dihitung sebagai pasangan
+    assert summary['Matched'].iloc[0] == sum(df[VERIF_COL].isin(OUTCOME_LABELS).sum() for df in parts)
+    assert summary['Correct→Wrong'].iloc[0] + summary['Wrong→Correct'].iloc[0] > 0
+    assert set(delta['Run']) == {'v2'} and set(flips['Run']) == {'v2'}
+
+
+def test_rows_outside_sets_are_ignored(analyzer):
+    df = make_frame(rows=100, seed=60, nan_keys=False)
+    files = [upload(df, 'a.xlsx'), upload(df, 'b.xlsx'), upload(_changed(df, 61), 'c.xlsx')]
+    analyzer.df = analyzer.load_and_concat_sheets(files, 'Sheet1')
+
+    summary, _, _ = analyzer.compare_runs('A', ['B'], groups={'A': ['a.xlsx'], 'B': ['b.xlsx']})
+    assert summary['Matched'].iloc[0] == df[VERIF_COL].isin(OUTCOME_LABELS).sum()
+    assert summary['Correct→Wrong'].iloc[0] == summary['Wrong→Correct'].iloc[0] == 0
+    assert analyzer.compare_runs('A', ['C'], groups={'A': ['a.xlsx'], 'B': ['b.xlsx']})[0] is None
+
+
+def test_run_column_outside_default_projection(analyzer):
+    df = make_frame(rows=120, seed=70, nan_keys=False)
+    both = [df.assign(Model='v1'), _changed(df, 71).assign(Model='v2')]
+    files = [upload(pd.concat(both, ignore_index=True), 'models.xlsx')]
+    digests = analyzer.file_digests(files)
+    assert 'Model' in analyzer.sheet_columns(files, 'Sheet1', digests)
+
+    analyzer.df = analyzer.load_and_concat_sheets(files, 'Sheet1', columns=analyzer.analysis_columns(), digests=digests)
+    assert analyzer.run_options('Model') == []
+
+    columns = analyzer.analysis_columns(extra=['Model'])
+    analyzer.df = analyzer.load_and_concat_sheets(files, 'Sheet1', columns=columns, digests=digests)
+    assert analyzer.run_options('Model') == ['v1', 'v2']
+    summary, _, _ = analyzer.compare_runs('v1', ['v2'], run_col='Model')
+    assert summary['Matched'].iloc[0] == df[VERIF_COL].isin(OUTCOME_LABELS).sum()
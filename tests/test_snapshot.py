@@ -0,0 +1,102 @@
+import json
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from conftest import make_frame, upload
+from utils.snapshotBundle import SnapshotBundle
+
+
+def _bundle_file(data, name='eval.zip'):
+    f = BytesIO(data)
+    f.name = name
+    return f
+
+
+@pytest.fixture
+def loaded(new_analyzer):
+    an = new_analyzer()
+    files = [upload(make_frame(rows=300, seed=20 + i), f'run_{i}.xlsx') for i in range(2)]
+    an.df = an.load_and_concat_sheets(files, 'Sheet1')
+    return an
+
+
+def _set_view(an, category_col):
+    an.category_col = category_col
+    an.selected_verif = ['True Positive', 'False Negative']
+    an.selected_key = []
+    an.selected_type = ['SR']
+    an.top_n = 5
+
+
+def test_snapshot_round_trip(loaded, new_analyzer):
+    data = loaded.export_snapshot({'sheet': 'Sheet1'})
+    opened = new_analyzer()
+    opened.df = opened.load_snapshot(_bundle_file(data))
+
+    pd.testing.assert_frame_equal(opened.df, loaded.df)
+    assert opened.snapshot_meta['sheet'] == 'Sheet1'
+    assert opened.filter_options() == loaded.filter_options()
+    for ours, ref in zip(opened.calculate_confusion_stats(), loaded.calculate_confusion_stats()):
+        pd.testing.assert_frame_equal(ours, ref)
+    for col in ('Key', 'Bab'):
+        _set_view(loaded, col)
+        _set_view(opened, col)
+        for ours, ref in zip(opened.filter_and_group(), loaded.filter_and_group()):
+            pd.testing.assert_frame_equal(ours, ref)
+
+
+def test_snapshot_rejects_other_files():
+    with pytest.raises(ValueError):
+        SnapshotBundle.from_bytes(b'bukan zip')
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('manifest.json', '{"format": "lain"}')
+    with pytest.raises(ValueError):
+        SnapshotBundle.from_bytes(buf.getvalue())
+
+
+def _rewrite(data, drop=(), manifest=None):
+    buf = BytesIO()
+    with zipfile.ZipFile(BytesIO(data)) as src, zipfile.ZipFile(buf, 'w') as dst:
+        for item in src.infolist():
+            if item.filename in drop:
+                continue
+            content = src.read(item.filename)
+            if item.filename == 'manifest.json' and manifest is not None:
+                content = json.dumps(manifest(json.loads(content)))
+            dst.writestr(item, content)
+    return buf.getvalue()
+
+
+def _without(key):
+    def edit(manifest):
+        del manifest[key]
+        return manifest
+    return edit
+
+
+@pytest.mark.parametrize('drop, manifest', [
+    (('dataset.parquet',), None),
+    (('cubes/0.parquet',), None),
+    ((), _without('counts_index')),
+    ((), _without('options')),
+    ((), lambda m: dict(m, cubes=[{'column': 'Key'}])),
+])
+def test_incomplete_snapshot_raises_value_error(loaded, drop, manifest):
+    data = _rewrite(loaded.export_snapshot(), drop=drop, manifest=manifest)
+    with pytest.raises(ValueError):
+        SnapshotBundle.from_bytes(data)
+
+
+def test_corrupt_member_raises_value_error(loaded):
+    data = loaded.export_snapshot()
+    buf = BytesIO()
+    with zipfile.ZipFile(BytesIO(data)) as src, zipfile.ZipFile(buf, 'w') as dst:
+        for item in src.infolist():
+            content = src.read(item.filename)
+            dst.writestr(item, b'rusak' if item.filename == 'counts.parquet' else content)
+    with pytest.raises(ValueError):
+        SnapshotBundle.from_bytes(buf.getvalue())
@@ -0,0 +1,97 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from conftest import VERIF_COL, make_frame, stale_dimension, upload
+
+
+@pytest.fixture
+def files():
+    return [upload(make_frame(rows=400, seed=10 + i), f'run_{i}.xlsx') for i in range(3)]
+
+
+def _pair(new_analyzer, files):
+    memory, streamed = new_analyzer(), new_analyzer()
+    memory.df = memory.load_and_concat_sheets(files, 'Sheet1')
+    streamed.df = streamed.load_streaming(files, 'Sheet1', chunk_rows=97)
+    return memory, streamed
+
+
+def test_streaming_confusion_stats_match_in_memory(new_analyzer, files):
+    memory, streamed = _pair(new_analyzer, files)
+    assert len(streamed.df) < len(memory.df)
+    for ours, ref in zip(streamed.calculate_confusion_stats(), memory.calculate_confusion_stats()):
+        pd.testing.assert_frame_equal(ours, ref)
+
+
+@pytest.mark.parametrize('category_col', ['Key', 'Bab', 'Emiten'])
+def test_streaming_filter_and_group_match_in_memory(new_analyzer, files, category_col):
+    memory, streamed = _pair(new_analyzer, files)
+    keys = sorted(memory.df['Key'].dropna().unique().tolist())[:4]
+    for an in (memory, streamed):
+        an.category_col = category_col
+        an.selected_verif = ['True Positive', 'False Positive', 'Belum Diverifikasi']
+        an.selected_key = keys
+        an.selected_type = ['AR']
+        an.top_n = 3
+
+    def by_value(df, cols):
+        return df.sort_values(cols).reset_index(drop=True)
+
+    for ours, ref in zip(streamed.filter_and_group(), memory.filter_and_group()):
+        cols = [c for c in ours.columns if c != 'Jumlah']
+        assert ours['Jumlah'].tolist() == ref['Jumlah'].tolist()
+        pd.testing.assert_frame_equal(by_value(ours, cols), by_value(ref, cols))
+
+
+def test_streaming_options_ignore_weights(new_analyzer, files):
+    memory, streamed = _pair(new_analyzer, files)
+    for col in (VERIF_COL, 'Key', 'Type'):
+        assert set(streamed.filter_options()[col]) == set(memory.filter_options()[col])
+
+
+def test_switching_between_streaming_and_in_memory_keeps_stats_fresh(analyzer, new_analyzer, files):
+    # Satu analyzer bergantian memakai jalur streaming dan in-memory (mis. ambang diubah)
+    steps = [
+        ('memory', files[:2]), ('stream', files), ('memory', files[:2]),
+        ('stream', files), ('memory', files[1:]), ('stream', files[:1]),
+    ]
+    for mode, subset in steps:
+        if mode == 'stream':
+            analyzer.df = analyzer.load_streaming(subset, 'Sheet1', chunk_rows=97)
+        else:
+            analyzer.df = analyzer.load_and_concat_sheets(subset, 'Sheet1')
+        fresh = new_analyzer()
+        fresh.df = fresh.load_and_concat_sheets(subset, 'Sheet1')
+        for ours, ref in zip(analyzer.calculate_confusion_stats(), fresh.calculate_confusion_stats()):
+            pd.testing.assert_frame_equal(ours, ref)
+
+
+def test_switching_between_snapshot_and_streaming(analyzer, new_analyzer, files):
+    source = new_analyzer()
+    source.df = source.load_and_concat_sheets(files[:1], 'Sheet1')
+    bundle = BytesIO(source.export_snapshot())
+    bundle.name = 'eval.zip'
+
+    for _ in range(2):
+        analyzer.df = analyzer.load_snapshot(bundle)
+        assert analyzer.snapshot_meta is not None
+        for ours, ref in zip(analyzer.calculate_confusion_stats(), source.calculate_confusion_stats()):
+            pd.testing.assert_frame_equal(ours, ref)
+
+        analyzer.df = analyzer.load_streaming(files[1:], 'Sheet1', chunk_rows=97)
+        assert analyzer.snapshot_meta is None
+        fresh = new_analyzer()
+        fresh.df = fresh.load_and_concat_sheets(files[1:], 'Sheet1')
+        for ours, ref in zip(analyzer.calculate_confusion_stats(), fresh.calculate_confusion_stats()):
+            pd.testing.assert_frame_equal(ours, ref)
+
+
+@pytest.mark.parametrize('ref', ['A1', 'A1:B1'])
+def test_streaming_ignores_stale_dimension(new_analyzer, files, ref):
+    stale = [stale_dimension(f, ref) for f in files]
+    memory, streamed = _pair(new_analyzer, files)
+    streamed.df = streamed.load_streaming(stale, 'Sheet1', chunk_rows=97)
+    for ours, ref_table in zip(streamed.calculate_confusion_stats(), memory.calculate_confusion_stats()):
+        pd.testing.assert_frame_equal(ours, ref_table)
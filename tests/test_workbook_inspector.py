@@ -0,0 +1,74 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from conftest import make_frame, stale_dimension, upload
+from utils.workbookCache import WorkbookCache
+from utils.workbookInspector import WorkbookInspector
+
+
+def _workbook():
+    buf = upload(make_frame(rows=50), 'a.xlsx')
+    with pd.ExcelWriter(buf, mode='a', engine='openpyxl') as writer:
+        make_frame(rows=20, seed=1).to_excel(writer, sheet_name='Lain', index=False)
+    return buf.getvalue()
+
+
+def _run_threads(target, n=8):
+    errors = []
+
+    def guarded(i):
+        try:
+            target(i)
+        except Exception as e:  # dikumpulkan supaya kegagalan thread ikut terlihat
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+def test_inspector_survives_concurrent_close():
+    data = _workbook()
+    expected = WorkbookInspector(data).sheets()
+    shared = WorkbookInspector(data)
+    results = []
+
+    def work(i):
+        for _ in range(30):
+            if i % 2:
+                shared.close()
+            else:
+                results.append(shared.sheets() == expected)
+                results.append(list(shared.read_sheet('Lain', columns=['Key']).columns) == ['Key'])
+
+    assert _run_threads(work) == []
+    assert results and all(results)
+
+
+def test_cache_inspectors_shared_between_threads():
+    uploads = [upload(make_frame(rows=30, seed=i), f'f{i}.xlsx') for i in range(6)]
+    cache = WorkbookCache(store=None)
+    cache.max_open_inspectors = 1  # LRU menutup inspector yang mungkin sedang dipakai
+    names = {}
+
+    def work(i):
+        for f in uploads[i % 2::2]:
+            names[(i, f.name)] = (tuple(cache.sheet_names(f)), tuple(s['rows'] for s in cache.sheet_info(f)))
+            cache.read_sheet(f, 'Sheet1', columns=['Key'])
+
+    assert _run_threads(work) == []
+    assert set(names.values()) == {(('Sheet1',), (31,))}
+
+
+@pytest.mark.parametrize('ref', ['A1', 'A1:A1', 'A1:B51'])
+def test_stale_dimension_falls_back_to_row_scan(ref):
+    f = upload(make_frame(rows=50), 'a.xlsx')
+    expected = WorkbookInspector(f.getvalue()).sheet_info('Sheet1')
+    info = WorkbookInspector(stale_dimension(f, ref).getvalue()).sheet_info('Sheet1')
+    assert (info['rows'], info['cols'], info['header']) == (51, 6, expected['header'])
+    assert expected['rows'] == 51